@@ -0,0 +1,89 @@
+from .space import SubgraphSpace
+from .structure import induced_structure, adjacent_pairs
+
+
+def connected_sets(graph, k, u, v):
+    """
+    Enumerate the connected k-node sets that contain the new edge (u, v).
+
+    The sets are grown ESU-style from the seed {u, v}: a node joins the set
+    only if it is in the exclusive neighborhood of the node that brought it
+    in, i.e. not adjacent to any node already in the set or its extension.
+    Every connected set that contains u and v is produced exactly once.
+    """
+    closed = graph.neighbors(u) | graph.neighbors(v) | set([u, v])
+    extension = list(closed - set([u, v]))
+
+    yield from _extend(graph, k, [u, v], extension, closed)
+
+
+def _extend(graph, k, nodes, extension, closed):
+    if len(nodes) == k - 1:
+        # the last node can be any node of the extension
+        for w in extension:
+            yield frozenset(nodes + [w])
+        return
+
+    extension = list(extension)
+
+    while extension:
+        w = extension.pop()
+
+        exclusive = graph.neighbors(w) - closed
+
+        nodes.append(w)
+        yield from _extend(graph, k, nodes, extension + list(exclusive), closed | exclusive)
+        nodes.pop()
+
+
+def is_addition(graph, nodes, u, v):
+    """Check if u and v are disconnected in the subgraph induced by nodes."""
+    seen = set([u])
+    stack = [u]
+
+    while stack:
+        w = stack.pop()
+        for x in graph.neighbors(w) & nodes:
+            if x == v:
+                return False
+            if x not in seen:
+                seen.add(x)
+                stack.append(x)
+
+    return True
+
+
+def get_new_subgraphs(graph, k, u, v, structures=False):
+    if k < 3:
+        raise ValueError("this exploration algorithm only works for k >= 3")
+
+    if structures:
+        additions = get_new_subgraphs(graph, k, u, v)
+        return [induced_structure(graph, nodes, adjacent_pairs(graph, nodes)) for nodes in additions]
+
+    return set(nodes for nodes in connected_sets(graph, k, u, v) if is_addition(graph, nodes, u, v))
+
+
+def get_all_subgraphs(graph, k, u, v, structures=False):
+    if k < 3:
+        raise ValueError("this exploration algorithm only works for k >= 3")
+
+    if structures:
+        additions, replacements = get_all_subgraphs(graph, k, u, v)
+        return ([induced_structure(graph, nodes, adjacent_pairs(graph, nodes)) for nodes in additions],
+                [induced_structure(graph, nodes, adjacent_pairs(graph, nodes)) for nodes in replacements])
+
+    additions = set()
+    replacements = set()
+
+    for nodes in connected_sets(graph, k, u, v):
+        if is_addition(graph, nodes, u, v):
+            additions.add(nodes)
+        else:
+            replacements.add(nodes)
+
+    return additions, replacements
+
+
+def get_new_subgraph_space(graph, k, u, v):
+    return SubgraphSpace([list(get_new_subgraphs(graph, k, u, v))])
@@ -1,9 +1,22 @@
 from itertools import combinations, product
 
-def get_new_subgraphs(graph, k, u, v):
+from .space import (
+    SubgraphSpace,
+    SequenceBlock,
+    CombinationBlock,
+    GroupedBlock,
+    ProductBlock)
+from .structure import induced_structure
+
+from graph.bitset_graph import BitSet
+
+def get_new_subgraphs(graph, k, u, v, structures=False):
     if k != 4:
         raise ValueError("this exploration algorithm only works for k = 4")
 
+    if structures:
+        return get_structures(graph, u, v, replacements=False)[0]
+
     u_neighbors = graph.neighbors(u)
     v_neighbors = graph.neighbors(v)
 
@@ -46,10 +59,13 @@ def get_new_subgraphs(graph, k, u, v):
 
 
 
-def get_all_subgraphs(graph, k, u, v):
+def get_all_subgraphs(graph, k, u, v, structures=False):
     if k != 4:
         raise ValueError("this exploration algorithm only works for k = 4")
 
+    if structures:
+        return get_structures(graph, u, v)
+
     adds = set()
     reps = set()
 
@@ -122,3 +138,152 @@ def get_all_subgraphs(graph, k, u, v):
         reps.update(frozenset([u,v,n1,n2]) for n1,n2 in combinations(one_hop_common, 2))
 
     return adds, reps
+
+
+
+def get_new_subgraph_space(graph, k, u, v):
+    if k != 4:
+        raise ValueError("this exploration algorithm only works for k = 4")
+
+    u_neighbors = graph.neighbors(u)
+    v_neighbors = graph.neighbors(v)
+
+    if isinstance(u_neighbors, BitSet):
+        return _bitset_space(graph, u, v, u_neighbors, v_neighbors)
+
+    one_hop_common = u_neighbors & v_neighbors
+
+    u_own = tuple(u_neighbors - one_hop_common)
+    v_own = tuple(v_neighbors - one_hop_common)
+
+    u_own_two_hop_dict = graph.two_hop_neighborhood(u, set(u_own))
+    v_own_two_hop_dict = graph.two_hop_neighborhood(v, set(v_own))
+
+    v_own_set = set(v_own)
+    u_own_set = set(u_own)
+
+    # the types of new subgraphs are disjoint, so each block
+    # is counted in closed form and no node set is built twice
+    blocks = [
+        # type A1 new subgraphs
+        CombinationBlock((u, v), u_own),
+        CombinationBlock((u, v), v_own),
+
+        # type A2 new subgraphs
+        GroupedBlock((u, v), ((n1, n2s) for n1, n2s in u_own_two_hop_dict.items() if n1 not in v_own_set)),
+        GroupedBlock((u, v), ((n1, n2s) for n1, n2s in v_own_two_hop_dict.items() if n1 not in u_own_set)),
+    ]
+
+    # type A3 new subgraphs, leaving out the pairs that are adjacent
+    u_index = {n_u: i for i, n_u in enumerate(u_own)}
+    excluded = [u_index[n_u] * len(v_own) + j
+                for j, n_v in enumerate(v_own) if n_v in u_own_two_hop_dict
+                for n_u in u_own_two_hop_dict[n_v]]
+
+    blocks.append(ProductBlock((u, v), u_own, v_own, excluded))
+
+    return SubgraphSpace(blocks)
+
+
+
+def _bitset_space(graph, u, v, u_neighbors, v_neighbors):
+    # with bitset neighborhoods the type A2 and A3 subgraphs are grouped by
+    # an own neighbor of u or v, so that the size of each group is the
+    # popcount of a bitwise expression and no two-hop dicts are built
+    one_hop_common = u_neighbors & v_neighbors
+
+    u_own = u_neighbors - one_hop_common
+    v_own = v_neighbors - one_hop_common
+
+    u_excluded = u_neighbors | v_own | set([u])
+    v_excluded = v_neighbors | u_own | set([v])
+
+    blocks = [
+        # type A1 new subgraphs
+        CombinationBlock((u, v), tuple(u_own)),
+        CombinationBlock((u, v), tuple(v_own)),
+
+        # type A2 new subgraphs, by the own neighbor on the path
+        GroupedBlock((u, v), ((n2, graph.neighbors(n2) - u_excluded) for n2 in u_own)),
+        GroupedBlock((u, v), ((n2, graph.neighbors(n2) - v_excluded) for n2 in v_own)),
+
+        # type A3 new subgraphs, by the own neighbor of u
+        GroupedBlock((u, v), ((n_u, v_own - graph.neighbors(n_u)) for n_u in u_own)),
+    ]
+
+    return SubgraphSpace(blocks)
+
+
+def get_structures(graph, u, v, replacements=True):
+    """
+    Structures of the new (and replaced) subgraphs of edge (u, v).
+
+    Each type of subgraph fixes which node pairs are adjacent, so the induced
+    edges come from the neighbor sets walked during exploration. The types
+    are disjoint, and type R1 subgraphs are only collected from the side of
+    u, so every subgraph is listed once.
+    """
+    u_neighbors = graph.neighbors(u)
+    v_neighbors = graph.neighbors(v)
+
+    one_hop_common = u_neighbors & v_neighbors
+
+    u_own = u_neighbors - one_hop_common
+    v_own = v_neighbors - one_hop_common
+
+    adds = []
+    reps = []
+
+    # type A1: wedge to star and triangle to kite
+    for x, own in [(u, u_own), (v, v_own)]:
+        for n1, n2 in combinations(own, 2):
+            pairs = [(x, n1), (x, n2)]
+            if n2 in graph.neighbors(n1):
+                pairs.append((n1, n2))
+            adds.append(induced_structure(graph, (u, v, n1, n2), pairs))
+
+    u_own_two_hop_dict = graph.two_hop_neighborhood(u, u_own)
+    v_own_two_hop_dict = graph.two_hop_neighborhood(v, v_own)
+
+    # type A2: wedge to path
+    for x, two_hop_dict, other_own in [(u, u_own_two_hop_dict, v_own), (v, v_own_two_hop_dict, u_own)]:
+        for n1 in two_hop_dict.keys() - other_own:
+            for n2 in two_hop_dict[n1]:
+                adds.append(induced_structure(graph, (u, v, n1, n2), [(x, n2), (n2, n1)]))
+
+    # type A3: two pairs to path
+    for n_u, n_v in product(u_own, v_own):
+        if (n_v not in u_own_two_hop_dict) or (n_u not in u_own_two_hop_dict[n_v]):
+            adds.append(induced_structure(graph, (u, v, n_u, n_v), [(u, n_u), (v, n_v)]))
+
+    if not replacements:
+        return adds, reps
+
+    # type R1: path to square
+    for n1 in u_own_two_hop_dict.keys() & v_own:
+        for n2 in u_own_two_hop_dict[n1]:
+            reps.append(induced_structure(graph, (u, v, n1, n2), [(u, n2), (n2, n1), (v, n1)]))
+
+    # type R2: path to kite and kite to diamond
+    for x, own in [(u, u_own), (v, v_own)]:
+        for n1, n2 in product(own, one_hop_common):
+            pairs = [(x, n1), (u, n2), (v, n2)]
+            if n2 in graph.neighbors(n1):
+                pairs.append((n1, n2))
+            reps.append(induced_structure(graph, (u, v, n1, n2), pairs))
+
+    # type R3: star to kite
+    two_hop_common_dict = graph.two_hop_neighborhood(u, one_hop_common, set([v]) | v_own)
+
+    for n1, common in two_hop_common_dict.items():
+        for n2 in common:
+            reps.append(induced_structure(graph, (u, v, n1, n2), [(u, n2), (v, n2), (n2, n1)]))
+
+    # type R4: square to diamond and diamond to clique
+    for n1, n2 in combinations(one_hop_common, 2):
+        pairs = [(u, n1), (u, n2), (v, n1), (v, n2)]
+        if n2 in graph.neighbors(n1):
+            pairs.append((n1, n2))
+        reps.append(induced_structure(graph, (u, v, n1, n2), pairs))
+
+    return adds, reps
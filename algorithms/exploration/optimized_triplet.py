@@ -1,21 +1,44 @@
-def get_new_subgraphs(graph, k, u, v):
+from .space import SubgraphSpace, SequenceBlock
+from .structure import induced_structure
+
+def get_new_subgraphs(graph, k, u, v, structures=False):
     if k != 3:
         raise ValueError("this exploration algorithm only works for k = 3")
 
     N_u = graph.neighbors(u)
     N_v = graph.neighbors(v)
 
+    if structures:
+        # w is adjacent to exactly one of u and v
+        return [induced_structure(graph, (u, v, w), [(u, w) if w in N_u else (v, w)]) for w in (N_u ^ N_v)]
+
     return set(frozenset([u, v, w]) for w in (N_u ^ N_v))
 
 
-def get_all_subgraphs(graph, k, u, v):
+def get_all_subgraphs(graph, k, u, v, structures=False):
     if k != 3:
         raise ValueError("this exploration algorithm only works for k = 3")
 
     N_u = graph.neighbors(u)
     N_v = graph.neighbors(v)
 
+    if structures:
+        additions = get_new_subgraphs(graph, k, u, v, structures=True)
+        replacements = [induced_structure(graph, (u, v, w), [(u, w), (v, w)]) for w in (N_u & N_v)]
+
+        return additions, replacements
+
     additions = set(frozenset([u, v, w]) for w in (N_u ^ N_v))
     replacements = set(frozenset([u, v, w]) for w in (N_u & N_v))
 
     return additions, replacements
+
+
+def get_new_subgraph_space(graph, k, u, v):
+    if k != 3:
+        raise ValueError("this exploration algorithm only works for k = 3")
+
+    N_u = graph.neighbors(u)
+    N_v = graph.neighbors(v)
+
+    return SubgraphSpace([SequenceBlock((u, v), tuple(N_u ^ N_v))])
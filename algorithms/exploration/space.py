@@ -0,0 +1,147 @@
+from math import isqrt
+from bisect import bisect_right
+
+
+class SubgraphSpace:
+    """
+    Index-addressable space of candidate subgraphs.
+
+    The space is a concatenation of blocks that each describe a family of
+    node sets in a closed form. Its size is known without enumerating the
+    node sets, and the i-th node set or a uniform sample of them is built
+    on demand.
+    """
+
+    def __init__(self, blocks):
+        self.blocks = [block for block in blocks if len(block) > 0]
+        self.offsets = []
+
+        size = 0
+        for block in self.blocks:
+            self.offsets.append(size)
+            size += len(block)
+
+        self.size = size
+
+
+    def __len__(self):
+        return self.size
+
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.size:
+            raise IndexError("subgraph index out of range")
+
+        b = bisect_right(self.offsets, i) - 1
+        return self.blocks[b][i - self.offsets[b]]
+
+
+    def __iter__(self):
+        for block in self.blocks:
+            for i in range(len(block)):
+                yield block[i]
+
+
+    def sample(self, I, rng):
+        """Uniform sample of I node sets without replacement."""
+        return [self[i] for i in rng.sample(range(self.size), I)]
+
+
+class SequenceBlock:
+    """The anchor nodes extended by each node of a sequence."""
+
+    def __init__(self, anchor, nodes):
+        self.anchor = anchor
+        self.nodes = nodes
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, i):
+        return frozenset(self.anchor + (self.nodes[i],))
+
+
+class CombinationBlock:
+    """The anchor nodes extended by each pair of nodes of a sequence."""
+
+    def __init__(self, anchor, nodes):
+        self.anchor = anchor
+        self.nodes = nodes
+
+    def __len__(self):
+        n = len(self.nodes)
+        return n * (n - 1) // 2
+
+    def __getitem__(self, i):
+        # unrank the pair counting from the last pair (n-2, n-1)
+        n = len(self.nodes)
+        j = len(self) - 1 - i
+        r = (isqrt(8 * j + 1) - 1) // 2
+        a = n - 2 - r
+        b = n - 1 - (j - r * (r + 1) // 2)
+        return frozenset(self.anchor + (self.nodes[a], self.nodes[b]))
+
+
+class GroupedBlock:
+    """
+    The anchor nodes extended by a node and each node of its group.
+
+    Only the sizes of the groups are needed up front, a group is listed
+    the first time one of its node sets is built.
+    """
+
+    def __init__(self, anchor, groups):
+        self.anchor = anchor
+        self.heads = []
+        self.members = []
+        self.offsets = []
+
+        size = 0
+        for head, members in groups:
+            n = len(members)
+            if n:
+                self.heads.append(head)
+                self.members.append(members)
+                self.offsets.append(size)
+                size += n
+
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        g = bisect_right(self.offsets, i) - 1
+
+        members = self.members[g]
+        if not isinstance(members, tuple):
+            members = self.members[g] = tuple(members)
+
+        return frozenset(self.anchor + (self.heads[g], members[i - self.offsets[g]]))
+
+
+class ProductBlock:
+    """
+    The anchor nodes extended by each pair in the product of two sequences,
+    excluding the pairs whose positions in the product grid are listed.
+    """
+
+    def __init__(self, anchor, left, right, excluded=()):
+        self.anchor = anchor
+        self.left = left
+        self.right = right
+        self.excluded = sorted(excluded)
+
+        # the j-th excluded position has j excluded positions before it,
+        # so it would be at index excluded[j] - j without the exclusions
+        self.shifts = [e - j for j, e in enumerate(self.excluded)]
+
+    def __len__(self):
+        return len(self.left) * len(self.right) - len(self.excluded)
+
+    def __getitem__(self, i):
+        # skip over the excluded grid positions before i
+        g = i + bisect_right(self.shifts, i)
+
+        a, b = divmod(g, len(self.right))
+        return frozenset(self.anchor + (self.left[a], self.right[b]))
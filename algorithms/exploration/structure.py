@@ -0,0 +1,15 @@
+from itertools import combinations
+
+from subgraph.util import make_structure
+
+
+def induced_structure(graph, nodes, pairs):
+    """Structure of the subgraph induced by nodes, given its adjacent node pairs."""
+    node = graph.node
+    edges = [(node(a), node(b), graph.edge_label(a, b)) for a, b in pairs]
+    return make_structure([node(x) for x in nodes], edges)
+
+
+def adjacent_pairs(graph, nodes):
+    """All adjacent node pairs in nodes."""
+    return [(a, b) for a, b in combinations(nodes, 2) if b in graph.neighbors(a)]
@@ -1,5 +1,6 @@
 from . import optimized_triplet
 from . import optimized_quadruplet
+from . import connected_sets
 
 
 def new_subgraphs_func(k):
@@ -7,6 +8,8 @@ def new_subgraphs_func(k):
         return optimized_triplet.get_new_subgraphs
     elif k == 4:
         return optimized_quadruplet.get_new_subgraphs
+    elif k > 4:
+        return connected_sets.get_new_subgraphs
     else:
         raise ValueError("no function available for k = %d" % (k))
 
@@ -16,5 +19,18 @@ def all_subgraphs_func(k):
         return optimized_triplet.get_all_subgraphs
     elif k == 4:
         return optimized_quadruplet.get_all_subgraphs
+    elif k > 4:
+        return connected_sets.get_all_subgraphs
+    else:
+        raise ValueError("no function available for k = %d" % (k))
+
+
+def new_subgraph_space_func(k):
+    if k == 3:
+        return optimized_triplet.get_new_subgraph_space
+    elif k == 4:
+        return optimized_quadruplet.get_new_subgraph_space
+    elif k > 4:
+        return connected_sets.get_new_subgraph_space
     else:
         raise ValueError("no function available for k = %d" % (k))
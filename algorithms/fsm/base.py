@@ -1,33 +1,185 @@
+import numpy as np
+
 from functools import partial
 from abc import ABCMeta, abstractmethod
-from collections import Counter, defaultdict
+from collections import Counter
 
 from graph.simple_graph import SimpleGraph
+from graph.compact_graph import CompactGraph
+from graph.sorted_graph import SortedGraph
+from graph.bitset_graph import BitsetGraph
+
+from subgraph.cache import LabelCache
+from subgraph.registry import PatternRegistry, PatternDeltas
+from subgraph.lookup import TABLE_SIZES, TransitionTable, canonical_label_func
+from subgraph.util import structural_signature, pair_position
 
 from algorithms.exploration.util import (
     new_subgraphs_func,
-    all_subgraphs_func)
+    all_subgraphs_func,
+    new_subgraph_space_func)
+
+from util.instrumentation import Instrumentation
 
 class BaseAlgorithm(metaclass=ABCMeta):
 
+    # metric names of the phases of an edge addition, by method name
+    timed_phases = {}
+
     @abstractmethod
-    def __init__(self, k=None, **kwargs):
+    def __init__(self, k=None, L=None, Q=None, label_table=None,
+                 label_backend=None, label_cache_size=65536,
+                 label_histograms=False, compact_graph=False,
+                 sorted_adjacency=False, bitset_adjacency=False,
+                 instrumentation='full', sample_every=100,
+                 aggregate_every=None, **kwargs):
         self.k = k
 
-        self.graph = SimpleGraph()
+        # the explorers work on the node handles of either graph backend
+        if bitset_adjacency:
+            self.graph = BitsetGraph(label_histograms=label_histograms)
+        elif sorted_adjacency:
+            self.graph = SortedGraph(label_histograms=label_histograms)
+        elif compact_graph:
+            self.graph = CompactGraph(label_histograms=label_histograms)
+        else:
+            self.graph = SimpleGraph(label_histograms=label_histograms)
+
+        # the edge operations are timed according to the instrumentation level
+        self.instrumentation = Instrumentation(instrumentation,
+            every=sample_every, aggregate_every=aggregate_every)
+        self.instrumentation.attach(self)
+        self.metrics = self.instrumentation.metrics
+
+        self.registry = PatternRegistry()
 
-        self.metrics = defaultdict(list)
-        self.patterns = Counter()
+        # vertex and edge label counts L and Q enable label lookup tables
+        label_func = canonical_label_func(k, L, Q,
+            path=label_table, backend=label_backend)
+
+        # repeating subgraph shapes are labeled once while in the cache
+        self.canonical_label = LabelCache(label_func, max_size=label_cache_size)
+
+        # subgraphs gaining an edge change pattern through a table lookup
+        if k in TABLE_SIZES:
+            self.transitions = TransitionTable(k, label_func, self.registry)
+        else:
+            self.transitions = None
 
         self.get_new_subgraphs = partial(new_subgraphs_func(k), self.graph, k)
         self.get_all_subgraphs = partial(all_subgraphs_func(k), self.graph, k)
+        self.get_new_subgraph_space = partial(new_subgraph_space_func(k), self.graph, k)
+
+
+    @property
+    def patterns(self):
+        """Counter of the current pattern counts by canonical label."""
+        return self.registry.to_counter()
+
+
+    def pattern_id(self, subgraph):
+        """Get the pattern id of a subgraph."""
+        return self.registry.intern(self.canonical_label(subgraph))
+
+
+    def transition_pattern_id(self, subgraph, edge, new_subgraph):
+        """Get the pattern id of new_subgraph, i.e. subgraph with edge added."""
+        if self.transitions is None:
+            return self.pattern_id(new_subgraph)
+
+        nodes = subgraph.nodes
+        i = nodes.index(edge.get_u())
+        j = nodes.index(edge.get_v())
+
+        position = pair_position(self.k, i, j)
+        return self.transitions(structural_signature(subgraph), position, edge.label)
+
+
+    def is_new_edge(self, edge):
+        """Whether edge has not been added to the graph yet."""
+        return edge not in self.graph
+
+
+    def has_edge(self, edge):
+        """Whether edge is in the graph."""
+        return edge in self.graph
 
 
-    @abstractmethod
     def add_edge(self, edge):
+        """Add an edge to the graph, returns whether it was not in the graph yet."""
+        if not self.is_new_edge(edge):
+            return False
+
+        self.insert_edge(edge)
+        return True
+
+
+    def add_edges(self, batch):
+        """
+        Add a batch of edges, with the same result as adding them one by one.
+
+        Repeated node pairs within the batch are dropped in one step, keeping
+        the first edge of each pair. The pattern count changes of the whole
+        batch are buffered and applied at once, and the metrics get one row
+        per batch instead of one per edge. Returns the number of added edges.
+        """
+        added, _ = self.ingest(batch)
+        return added
+
+
+    def ingest(self, batch):
+        """Add a batch of edges, returns the number of added edges and their summed counts."""
+        counts = Counter()
+        added = 0
+
+        registry = self.registry
+        self.registry = deltas = PatternDeltas(registry)
+
+        try:
+            for edge in unique_edges(batch):
+                if self.is_new_edge(edge):
+                    counts.update(self.insert_edge(edge))
+                    added += 1
+        finally:
+            self.registry = registry
+            deltas.flush()
+
+        return added, counts
+
+
+    def remove_edge(self, edge):
+        """Remove an edge from the graph, returns whether it was in the graph."""
+        if not self.has_edge(edge):
+            return False
+
+        self.delete_edge(edge)
+        return True
+
+
+    @abstractmethod
+    def insert_edge(self, edge):
+        """
+        Add an edge that is not in the graph yet.
+
+        Returns a dict of the counts that are recorded as metrics.
+        """
         pass
 
 
+    def delete_edge(self, edge):
+        """
+        Remove an edge that is in the graph.
+
+        Returns a dict of the counts that are recorded as metrics.
+        """
+        raise NotImplementedError("edge removal requires a fully dynamic algorithm")
+
+
+    def state_metrics(self):
+        """Metrics of the state of the algorithm after an edge operation."""
+        return {}
+
+
     @abstractmethod
     def add_subgraph(self, subgraph):
         pass
@@ -36,3 +188,14 @@ class BaseAlgorithm(metaclass=ABCMeta):
     @abstractmethod
     def remove_subgraph(self, subgraph):
         pass
+
+
+def unique_edges(batch):
+    """The edges of a batch without repeated node pairs, in batch order."""
+    if not batch:
+        return []
+
+    pairs = np.array([(edge.u, edge.v) for edge in batch], dtype=np.int64)
+    _, first = np.unique(pairs, axis=0, return_index=True)
+
+    return [batch[i] for i in np.sort(first).tolist()]
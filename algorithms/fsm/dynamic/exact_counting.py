@@ -0,0 +1,24 @@
+from ..incremental.exact_counting import IncrementalExactCountingAlgorithm
+
+
+class DynamicExactCountingAlgorithm(IncrementalExactCountingAlgorithm):
+    """
+    Exact counting over a stream of edge additions and removals.
+
+    A removal is counted as the reverse of an addition: the edge is removed
+    from the graph first, so the explorers see the same neighborhood as they
+    did when the edge was added, and the updates are applied with the
+    opposite sign.
+    """
+
+    def delete_edge(self, edge):
+        self.graph.remove_edge(edge)
+
+        if self.delta_counting:
+            W = self.count_deltas(edge, sign=-1)
+        else:
+            W = self.count_subgraphs(edge, sign=-1)
+
+        self.graph.remove_isolated(edge)
+
+        return {'removed_subgraph_count': W}
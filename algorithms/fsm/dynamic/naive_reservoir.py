@@ -0,0 +1,73 @@
+from ..incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
+
+from subgraph.util import make_subgraph, is_connected
+
+
+class DynamicNaiveReservoirAlgorithm(IncrementalNaiveReservoirAlgorithm):
+    """
+    Reservoir sampling over a stream of edge additions and removals.
+
+    The sample is maintained with random pairing: subgraphs that disappear
+    when an edge is removed are not replaced right away, but counted as
+    uncompensated deletions, c1 of them in the reservoir and c2 outside of
+    it. The next new subgraphs pair up with these deletions, and take a
+    freed slot with probability c1 / (c1 + c2). Once all deletions are
+    compensated, the sampling continues as plain reservoir sampling, so the
+    reservoir stays a uniform sample of the current subgraphs. N is the
+    number of current subgraphs.
+    """
+
+    def __init__(self, k=3, M=1000, **kwargs):
+        super().__init__(k=k, M=M, **kwargs)
+        self.c1 = 0 # uncompensated deletions in the reservoir
+        self.c2 = 0 # uncompensated deletions outside the reservoir
+
+
+    def delete_edge(self, edge):
+        u = edge.get_u()
+        v = edge.get_v()
+
+        self.graph.remove_edge(edge)
+
+        # the subgraphs of edge that are not connected without it
+        W = len(self.get_new_subgraph_space(*self.graph.endpoints(edge)))
+
+        removed = 0
+        for old_subg in self.reservoir.get_common_subgraphs(u, v):
+            new_edges = tuple(e for e in old_subg.edges if (e.u, e.v) != (edge.u, edge.v))
+            new_subg = make_subgraph(old_subg.nodes, new_edges)
+
+            if is_connected(new_subg):
+                self.process_reduced_subgraph(old_subg, new_subg)
+            else:
+                self.registry.add(self.reservoir.remove(old_subg), -1)
+                removed += 1
+
+        self.graph.remove_isolated(edge)
+
+        self.N -= W
+        self.c1 += removed
+        self.c2 += W - removed
+
+        return {'removed_subgraph_count': W, 'excluded_subgraph_count': removed}
+
+
+    def process_new_subgraph(self, subgraph):
+        if self.c1 + self.c2 == 0:
+            return super().process_new_subgraph(subgraph)
+
+        # pair the new subgraph with an uncompensated deletion
+        if self.rng.random() * (self.c1 + self.c2) < self.c1:
+            self.c1 -= 1
+            return super().process_new_subgraph(subgraph)
+
+        self.c2 -= 1
+        return False
+
+
+    def process_reduced_subgraph(self, old_subgraph, new_subgraph):
+        pattern = self.pattern_id(new_subgraph)
+        old_pattern = self.reservoir.replace(old_subgraph, new_subgraph, pattern=pattern)
+
+        self.registry.add(old_pattern, -1)
+        self.registry.add(pattern, 1)
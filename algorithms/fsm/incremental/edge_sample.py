@@ -0,0 +1,200 @@
+import numpy as np
+
+from math import comb
+from itertools import chain
+from collections import Counter
+
+from ..base import BaseAlgorithm
+
+from subgraph.registry import PatternRegistry
+from subgraph.lookup import signature_subgraph
+from subgraph.util import structure_signature, pair_position, is_connected
+
+from sampling.rng import BufferedRNG
+
+
+class IncrementalEdgeSampleAlgorithm(BaseAlgorithm):
+    """
+    Pattern frequency estimation from a fixed-size edge sample.
+
+    In the style of TRIEST-IMPR, the graph only holds a uniform reservoir
+    sample of M edges, and memory stays bounded by M. When an edge arrives,
+    every connected edge set H over k nodes that contains the edge, and
+    whose other edges are all in the sample, is counted with the weight
+    1 / p of the probability that its other |H| - 1 edges are sampled.
+
+    The weights estimate the number of such edge sets of each pattern, in
+    which the k nodes may have more edges than H. These are turned into
+    counts of the induced subgraphs by Moebius inversion over the edge sets
+    of the node set: an edge set H'' of the sampled edges A of a node set
+    and the new edge e contributes to the pattern of H'' with the alternated
+    sum of the weights of all its supersets within A and e. The estimates
+    are unbiased, and exact as long as the whole stream fits the sample.
+
+    A repeated edge must not be counted again, but the sampled graph only
+    knows the sampled edges, so the node pairs of the stream are kept in a
+    set. With distinct_stream the stream is taken to have no repeated
+    edges, and only the sample is kept.
+    """
+
+    def __init__(self, k=3, M=1000, seed=None, distinct_stream=False, **kwargs):
+        self.M = M # edge sample size
+        self.t = 0 # number of edges encountered
+
+        # node pairs of all edges encountered, unless they are all distinct
+        self.pairs = None if distinct_stream else set()
+
+        # every algorithm instance draws from its own random stream
+        self.rng = BufferedRNG(seed)
+
+        # the sampled edges, the graph holds the same edges
+        self.edges = []
+
+        super().__init__(k=k, **kwargs)
+
+        # the estimates are weighted, so the counts are kept as floats
+        # and the patterns do not change through transitions
+        self.registry = PatternRegistry(dtype=np.float64)
+        self.transitions = None
+
+        # inverted edge sets of each node set shape, by the signature
+        # of its sampled edges and the position and label of the new edge
+        self.decompositions = {}
+
+
+    def state_metrics(self):
+        return {'sampled_edge_count': len(self.edges)}
+
+
+    def is_new_edge(self, edge):
+        if self.pairs is None:
+            return edge not in self.graph
+
+        return (edge.u, edge.v) not in self.pairs
+
+
+    def insert_edge(self, edge):
+        self.t += 1
+
+        if self.pairs is not None:
+            self.pairs.add((edge.u, edge.v))
+
+        u, v = self.graph.endpoints(edge)
+
+        # the node sets connected by edge in the sampled graph
+        additions, replacements = self.get_all_subgraphs(u, v, structures=True)
+
+        weights = self.inverse_probabilities()
+        differences = {}
+
+        for structure in chain(additions, replacements):
+            n_sampled = bin(structure.mask).count('1')
+
+            for pattern, with_edge, m, count in self.decomposition(structure, edge):
+                if with_edge:
+                    a, r = m - 1, n_sampled - m + 1
+                    sign = count
+                else:
+                    a, r = m, n_sampled - m
+                    sign = -count
+
+                key = (a, r)
+                if key not in differences:
+                    differences[key] = _difference(weights, a, r)
+
+                self.registry.add(pattern, sign * differences[key])
+
+        self.sample_edge(edge)
+
+        return {'new_subgraph_count': len(additions)}
+
+
+    def sample_edge(self, edge):
+        """Reservoir sampling of the edge stream into the graph."""
+        if len(self.edges) < self.M:
+            self.edges.append(edge)
+            self.graph.add_edge(edge)
+
+        elif self.rng.randrange(self.t) < self.M:
+            i = self.rng.randrange(self.M)
+            old_edge = self.edges[i]
+
+            self.graph.remove_edge(old_edge)
+            self.graph.remove_isolated(old_edge)
+
+            self.edges[i] = edge
+            self.graph.add_edge(edge)
+
+
+    def inverse_probabilities(self):
+        """
+        Inverse probabilities that j edges seen before the current edge are
+        all in the sample, for j = 0...k(k-1)/2.
+        """
+        weights = [1.0]
+        p = 1.0
+
+        for i in range(self.k * (self.k - 1) // 2):
+            if i < self.M and self.t - 1 - i > self.M - i:
+                p *= (self.M - i) / (self.t - 1 - i)
+            elif i >= self.M:
+                p = 0.0
+
+            weights.append(1.0 / p if p > 0 else float('inf'))
+
+        return weights
+
+
+    def decomposition(self, structure, edge):
+        """
+        Connected edge sets spanning the nodes of structure, when edge is added.
+
+        Returns the pattern id, whether edge is in the edge set, the size of
+        the edge set and the number of such edge sets for each combination.
+        """
+        nodes = structure.nodes
+        k = len(nodes)
+
+        i = nodes.index(edge.get_u())
+        j = nodes.index(edge.get_v())
+        position = pair_position(k, i, j)
+
+        key = (structure_signature(structure), position, edge.label)
+        terms = self.decompositions.get(key)
+
+        if terms is None:
+            signature = key[0]
+            v_labels = signature[:k]
+            e_labels = signature[k:position + k] + (edge.label,) + signature[position + k + 1:]
+
+            positions = [x for x, q in enumerate(e_labels) if q]
+            e_bit = positions.index(position)
+
+            counts = Counter()
+
+            for subset in range(1, 1 << len(positions)):
+                kept = set(x for b, x in enumerate(positions) if (subset >> b) & 1)
+                sub_signature = v_labels + tuple(q if x in kept else 0 for x, q in enumerate(e_labels))
+                subgraph = signature_subgraph(k, sub_signature)
+
+                if is_connected(subgraph):
+                    pattern = self.pattern_id(subgraph)
+                    counts[(pattern, bool((subset >> e_bit) & 1), len(kept))] += 1
+
+            terms = self.decompositions[key] = [term + (count,) for term, count in counts.items()]
+
+        return terms
+
+
+    def add_subgraph(self, subgraph):
+        self.registry.update(self.canonical_label(subgraph), 1)
+
+
+    def remove_subgraph(self, subgraph):
+        self.registry.update(self.canonical_label(subgraph), -1)
+
+
+def _difference(weights, a, r):
+    # alternating sum of the weights of the supersets of an edge set with
+    # a sampled edges, which has r more sampled edges to choose from
+    return sum((-1) ** j * comb(r, j) * weights[a + j] for j in range(r + 1))
@@ -1,62 +1,136 @@
-from datetime import datetime, timedelta
+from collections import Counter
 
 from ..base import BaseAlgorithm
 
-from subgraph.util import make_subgraph
-from subgraph.pattern import canonical_label
+from graph.node import Node
+
+from subgraph.subgraph import Subgraph, SubgraphEdge
+from subgraph.util import add_structure_edge
 
 
 class IncrementalExactCountingAlgorithm(BaseAlgorithm):
 
 
-    def __init__(self, k=3, **kwargs):
-        super().__init__(k=k)
+    def __init__(self, k=3, delta_counting=False, **kwargs):
+        if delta_counting and k != 3:
+            raise ValueError("delta counting only works for k = 3")
 
+        # delta counting updates the patterns from neighbor label histograms
+        self.delta_counting = delta_counting
+        super().__init__(k=k, label_histograms=delta_counting, **kwargs)
 
-    def add_edge(self, edge):
-        if edge in self.graph:
-            return False
 
-        e_add_start = datetime.now()
+    def insert_edge(self, edge):
+        if self.delta_counting:
+            W = self.count_deltas(edge)
+        else:
+            W = self.count_subgraphs(edge)
 
-        u = edge.get_u()
-        v = edge.get_v()
+        self.graph.add_edge(edge)
 
-        additions, replacements = self.get_all_subgraphs(u, v)
+        return {'new_subgraph_count': W}
 
-        for nodes in additions:
-            # collect the induced subgraph after addition of edge
-            # add that subgraph
-            edges = self.graph.get_induced_edges(nodes)
-            subgraph = make_subgraph(nodes, edges + [edge])
-            self.add_subgraph(subgraph)
 
-        for nodes in replacements:
-            # collect the induced subgraph with nodes
-            # remove that subgraph
-            # update the subgraph by adding edge
-            # add the updated subgraph
-            edges = self.graph.get_induced_edges(nodes)
+    def count_subgraphs(self, edge, sign=1):
+        """
+        Update the counts of all subgraphs of edge, returns the number of new subgraphs.
 
-            existing_subgraph = make_subgraph(nodes, edges)
-            self.remove_subgraph(existing_subgraph)
+        The graph must not contain edge. With sign = -1 the updates are
+        reversed, which counts the removal of edge from the graph.
+        """
+        u, v = self.graph.endpoints(edge)
 
-            updated_subgraph = make_subgraph(nodes, edges + [edge])
-            self.add_subgraph(updated_subgraph)
+        if sign > 0:
+            add, remove = self.add_structure, self.remove_structure
+        else:
+            add, remove = self.remove_structure, self.add_structure
 
-        self.graph.add_edge(edge)
+        # the explorer returns the induced structure of each subgraph,
+        # so the labels are looked up without building the subgraphs
+        additions, replacements = self.get_all_subgraphs(u, v, structures=True)
+
+        for structure in additions:
+            # add the subgraph induced after addition of edge
+            add(add_structure_edge(structure, edge))
+
+        for structure in replacements:
+            # remove the existing subgraph and
+            # add the subgraph updated by adding edge
+            remove(structure)
+            add(add_structure_edge(structure, edge))
+
+        return len(additions)
+
+
+    def count_deltas(self, edge, sign=1):
+        """
+        Update the triplet counts for edge from label combinations.
+
+        A neighbor w of only one endpoint forms a new path, and a common
+        neighbor turns a wedge into a triangle. The resulting patterns only
+        depend on the label of w and the labels of its edges to u and v, so
+        each distinct combination is labeled once and counted in bulk. The
+        paths are counted from the label histograms of u and v minus the
+        common neighbors. Returns the number of new subgraphs.
+
+        The graph must not contain edge. With sign = -1 the updates are
+        reversed, which counts the removal of edge from the graph.
+        """
+        u, v = self.graph.endpoints(edge)
+
+        # common neighbors by label and edge labels to u and v
+        wedges = Counter()
+        for w in self.graph.neighbors(u) & self.graph.neighbors(v):
+            wedges[(self.graph.label(w), self.graph.edge_label(u, w), self.graph.edge_label(w, v))] += 1
+
+        u_paths = Counter(self.graph.label_histogram(u))
+        v_paths = Counter(self.graph.label_histogram(v))
 
-        e_add_end = datetime.now()
-        ms = timedelta(microseconds=1)
-        self.metrics['edge_add_ms'].append((e_add_end - e_add_start) / ms)
-        self.metrics['new_subgraph_count'].append(len(additions))
+        for (l_w, q_uw, q_vw), count in wedges.items():
+            u_paths[(l_w, q_uw)] -= count
+            v_paths[(l_w, q_vw)] -= count
 
-        return True
+            wedge = _triplet(edge, l_w, None, q_uw, q_vw)
+            triangle = _triplet(edge, l_w, edge.label, q_uw, q_vw)
+
+            self.registry.update(self.canonical_label(wedge), -sign * count)
+            self.registry.update(self.canonical_label(triangle), sign * count)
+
+        W = 0
+
+        for (l_w, q_uw), count in u_paths.items():
+            if count > 0:
+                path = _triplet(edge, l_w, edge.label, q_uw, None)
+                self.registry.update(self.canonical_label(path), sign * count)
+                W += count
+
+        for (l_w, q_vw), count in v_paths.items():
+            if count > 0:
+                path = _triplet(edge, l_w, edge.label, None, q_vw)
+                self.registry.update(self.canonical_label(path), sign * count)
+                W += count
+
+        return W
 
 
     def add_subgraph(self, subgraph):
-        self.patterns.update([canonical_label(subgraph)])
+        self.registry.update(self.canonical_label(subgraph), 1)
 
 
     def remove_subgraph(self, subgraph):
-        self.patterns.subtract([canonical_label(subgraph)])
+        self.registry.update(self.canonical_label(subgraph), -1)
+
+
+    def add_structure(self, structure):
+        self.registry.update(self.canonical_label.label_structure(structure), 1)
+
+
+    def remove_structure(self, structure):
+        self.registry.update(self.canonical_label.label_structure(structure), -1)
+
+
+def _triplet(edge, l_w, q_uv, q_uw, q_vw):
+    # triplet with placeholder ids, k = 3 labels do not depend on the ids
+    nodes = (Node(0, edge.u_label), Node(1, edge.v_label), Node(2, l_w))
+    edges = tuple(SubgraphEdge(i, j, q) for i, j, q in [(0, 1, q_uv), (0, 2, q_uw), (1, 2, q_vw)] if q)
+    return Subgraph(nodes, edges)
@@ -1,83 +1,82 @@
-import random
-
-from datetime import datetime, timedelta
-
 from ..reservoir import ReservoirAlgorithm
 
-from subgraph.util import make_subgraph
-from subgraph.pattern import canonical_label
+from subgraph.util import make_subgraph, add_structure_edge, structure_subgraph
 
 
 class IncrementalNaiveReservoirAlgorithm(ReservoirAlgorithm):
 
-    def __init__(self, k=3, M=1000):
-        super().__init__(k=k, M=M)
+    timed_phases = {
+        'subgraph_replace_ms': 'update_subgraphs',
+        'subgraph_add_ms': 'sample_subgraphs'
+    }
 
+    def __init__(self, k=3, M=1000, **kwargs):
+        super().__init__(k=k, M=M, **kwargs)
 
-    def add_edge(self, edge):
-        if edge in self.graph:
-            return False
 
-        e_add_start = datetime.now()
+    def state_metrics(self):
+        return {'reservoir_full_bool': int(self.reservoir.is_full())}
 
-        u = edge.get_u()
-        v = edge.get_v()
 
-        # replace update all existing subgraphs with u and v in the reservoir
-        s_rep_start = datetime.now()
+    def insert_edge(self, edge):
+        self.update_subgraphs(edge)
+        W, I = self.sample_subgraphs(edge)
+
+        self.graph.add_edge(edge)
 
-        for old_subg in self.reservoir.get_common_subgraphs(u, v):
+        return {'new_subgraph_count': W, 'included_subgraph_count': I}
+
+
+    def update_subgraphs(self, edge):
+        """Add edge to all subgraphs in the reservoir that contain both of its nodes."""
+        for old_subg in self.reservoir.get_common_subgraphs(edge.get_u(), edge.get_v()):
             new_subg = make_subgraph(old_subg.nodes, old_subg.edges + (edge,))
-            self.process_existing_subgraph(old_subg, new_subg)
+            self.process_existing_subgraph(old_subg, new_subg, edge)
+
 
-        s_rep_end = datetime.now()
+    def sample_subgraphs(self, edge):
+        """
+        Offer the new subgraphs of edge to the reservoir.
 
-        # find new subgraph candidates for the reservoir
-        s_add_start = datetime.now()
-        additions = self.get_new_subgraphs(u, v)
+        Returns the number of new subgraphs and the number of them included.
+        """
+        additions = self.get_new_subgraphs(*self.graph.endpoints(edge), structures=True)
 
-        # perform reservoir sampling for each new subgraph candidate
         I = 0
-        for nodes in additions:
+        for structure in additions:
             self.N += 1
-            edges = self.graph.get_induced_edges(nodes)
-            subgraph = make_subgraph(nodes, edges+[edge])
+            subgraph = structure_subgraph(add_structure_edge(structure, edge))
             I += int(self.process_new_subgraph(subgraph))
-        s_add_end = datetime.now()
 
-        self.graph.add_edge(edge)
-
-        e_add_end = datetime.now()
-
-        ms = timedelta(microseconds=1)
-        self.metrics['edge_add_ms'].append((e_add_end - e_add_start) / ms)
-        self.metrics['subgraph_add_ms'].append((s_add_end - s_add_start) / ms)
-        self.metrics['subgraph_replace_ms'].append((s_rep_end - s_rep_start) / ms)
-        self.metrics['new_subgraph_count'].append(len(additions))
-        self.metrics['included_subgraph_count'].append(I)
-        self.metrics['reservoir_full_bool'].append(int(self.reservoir.is_full()))
-
-        return True
+        return len(additions), I
 
 
     def process_new_subgraph(self, subgraph):
-        success, old_subgraph = self.reservoir.add(subgraph, N=self.N)
+        success, old_subgraph, old_pattern = self.reservoir.add(subgraph, N=self.N)
+
+        if success:
+            pattern = self.pattern_id(subgraph)
+            self.reservoir.set_pattern(subgraph, pattern)
+            self.registry.add(pattern, 1)
 
-        if success: self.add_subgraph(subgraph)
-        if old_subgraph: self.remove_subgraph(old_subgraph)
+        if old_subgraph: self.registry.add(old_pattern, -1)
 
         return success
 
 
-    def process_existing_subgraph(self, old_subgraph, new_subgraph):
-        self.reservoir.replace(old_subgraph, new_subgraph)
-        self.remove_subgraph(old_subgraph)
-        self.add_subgraph(new_subgraph)
+    def process_existing_subgraph(self, old_subgraph, new_subgraph, edge):
+        # the pattern of the new subgraph follows from the cached
+        # pattern of the old subgraph and the edge added to it
+        pattern = self.transition_pattern_id(old_subgraph, edge, new_subgraph)
+        old_pattern = self.reservoir.replace(old_subgraph, new_subgraph, pattern=pattern)
+
+        self.registry.add(old_pattern, -1)
+        self.registry.add(pattern, 1)
 
 
     def add_subgraph(self, subgraph):
-        self.patterns[canonical_label(subgraph)] += 1
+        self.registry.update(self.canonical_label(subgraph), 1)
 
 
     def remove_subgraph(self, subgraph):
-        self.patterns[canonical_label(subgraph)] -= 1
+        self.registry.update(self.canonical_label(subgraph), -1)
@@ -1,44 +1,55 @@
-import random
-
-from datetime import datetime, timedelta
-
 from ..reservoir import ReservoirAlgorithm
 
-from graph.simple_graph import SimpleGraph
-
 from subgraph.util import make_subgraph
-from subgraph.pattern import canonical_label
 
 from sampling.skip_rs import SkipRS
 
 class IncerementalOptimizedReservoirAlgorithm(ReservoirAlgorithm):
 
+    timed_phases = {
+        'subgraph_replace_ms': 'update_subgraphs',
+        'subgraph_add_ms': 'sample_subgraphs'
+    }
+
 
-    def __init__(self, k=3, M=1000):
+    def __init__(self, k=3, M=1000, **kwargs):
         self.s = 0
-        self.skip_rs = SkipRS(M)
-        super().__init__(k=k, M=M)
+        super().__init__(k=k, M=M, **kwargs)
+        self.skip_rs = SkipRS(M, rng=self.rng)
 
 
-    def add_edge(self, edge):
-        if edge in self.graph:
-            return False
+    def state_metrics(self):
+        return {
+            'reservoir_full_bool': int(self.reservoir.is_full()),
+            'skiprs_treshold_bool': int(self.skip_rs.is_threshold_reached(self.N))
+        }
+
+
+    def insert_edge(self, edge):
+        self.update_subgraphs(edge)
+        W, I = self.sample_subgraphs(edge)
+
+        self.graph.add_edge(edge)
 
-        e_add_start = datetime.now()
+        return {'new_subgraph_count': W, 'included_subgraph_count': I}
 
-        u = edge.get_u()
-        v = edge.get_v()
 
-        # replace update all existing subgraphs with u and v in the reservoir
-        s_rep_start = datetime.now()
-        for old_subg in self.reservoir.get_common_subgraphs(u, v):
+    def update_subgraphs(self, edge):
+        """Add edge to all subgraphs in the reservoir that contain both of its nodes."""
+        for old_subg in self.reservoir.get_common_subgraphs(edge.get_u(), edge.get_v()):
             new_subg = make_subgraph(old_subg.nodes, old_subg.edges + (edge,))
-            self.process_existing_subgraph(old_subg, new_subg)
-        s_rep_end = datetime.now()
+            self.process_existing_subgraph(old_subg, new_subg, edge)
 
-        # find new subgraph candidates for the reservoir
-        s_add_start = datetime.now()
-        subgraph_candidates = self.get_new_subgraphs(u, v)
+
+    def sample_subgraphs(self, edge):
+        """
+        Sample the new subgraphs of edge into the reservoir.
+
+        Returns the number of new subgraphs and the number of them included.
+        """
+        # find new subgraph candidates for the reservoir, the candidate
+        # space is counted without building the candidate node sets
+        subgraph_candidates = self.get_new_subgraph_space(*self.graph.endpoints(edge))
 
         W = len(subgraph_candidates)
         I = 0 # number of subgraph candidates to include in sample
@@ -51,61 +62,52 @@ class IncerementalOptimizedReservoirAlgorithm(ReservoirAlgorithm):
             self.N += I
 
         # determine the number of candidates I to include in the sample
-        while self.s < W:
-            I += 1
-            Z_rs = self.skip_rs.apply(self.N)
-            self.N += Z_rs + 1
-            self.s += Z_rs + 1
+        I_rs, self.N, self.s = self.skip_rs.inclusions(self.N, self.s, W)
+        I += I_rs
 
         # sample I subgraphs from the W candidates
         if I < W:
-            additions = random.sample(subgraph_candidates, I)
+            additions = subgraph_candidates.sample(I, self.rng)
         else:
             additions = subgraph_candidates
 
         # add all sampled subgraphs
         for nodes in additions:
             edges = self.graph.get_induced_edges(nodes)
-            subgraph = make_subgraph(nodes, edges+[edge])
+            subgraph = make_subgraph(self.graph.to_nodes(nodes), edges+[edge])
             self.process_new_subgraph(subgraph)
 
-        s_add_end = datetime.now()
-
-        self.graph.add_edge(edge)
         self.s -= W
 
-        e_add_end = datetime.now()
-
-        ms = timedelta(microseconds=1)
-        self.metrics['edge_add_ms'].append((e_add_end - e_add_start) / ms)
-        self.metrics['subgraph_add_ms'].append((s_add_end - s_add_start) / ms)
-        self.metrics['subgraph_replace_ms'].append((s_rep_end - s_rep_start) / ms)
-        self.metrics['new_subgraph_count'].append(W)
-        self.metrics['included_subgraph_count'].append(I)
-        self.metrics['reservoir_full_bool'].append(int(self.reservoir.is_full()))
-        self.metrics['skiprs_treshold_bool'].append(int(self.skip_rs.is_threshold_reached(self.N)))
-
-        return True
+        return W, I
 
 
     def process_new_subgraph(self, subgraph):
-        success, old_subgraph = self.reservoir.add(subgraph)
+        success, old_subgraph, old_pattern = self.reservoir.add(subgraph)
 
-        if success: self.add_subgraph(subgraph)
-        if old_subgraph: self.remove_subgraph(old_subgraph)
+        if success:
+            pattern = self.pattern_id(subgraph)
+            self.reservoir.set_pattern(subgraph, pattern)
+            self.registry.add(pattern, 1)
+
+        if old_subgraph: self.registry.add(old_pattern, -1)
 
         return success
 
 
-    def process_existing_subgraph(self, old_subgraph, new_subgraph):
-        self.reservoir.replace(old_subgraph, new_subgraph)
-        self.remove_subgraph(old_subgraph)
-        self.add_subgraph(new_subgraph)
+    def process_existing_subgraph(self, old_subgraph, new_subgraph, edge):
+        # the pattern of the new subgraph follows from the cached
+        # pattern of the old subgraph and the edge added to it
+        pattern = self.transition_pattern_id(old_subgraph, edge, new_subgraph)
+        old_pattern = self.reservoir.replace(old_subgraph, new_subgraph, pattern=pattern)
+
+        self.registry.add(old_pattern, -1)
+        self.registry.add(pattern, 1)
 
 
     def add_subgraph(self, subgraph):
-        self.patterns[canonical_label(subgraph)] += 1
+        self.registry.update(self.canonical_label(subgraph), 1)
 
 
     def remove_subgraph(self, subgraph):
-        self.patterns[canonical_label(subgraph)] -= 1
+        self.registry.update(self.canonical_label(subgraph), -1)
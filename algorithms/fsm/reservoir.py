@@ -2,14 +2,23 @@ from abc import ABCMeta, abstractmethod
 
 from .base import BaseAlgorithm
 from sampling.subgraph_reservoir import SubgraphReservoir
+from sampling.compact_reservoir import CompactSubgraphReservoir
+from sampling.rng import BufferedRNG
 
 class ReservoirAlgorithm(BaseAlgorithm, metaclass=ABCMeta):
 
     @abstractmethod
-    def __init__(self, M=None, **kwargs):
+    def __init__(self, M=None, compact_reservoir=False, seed=None, **kwargs):
         self.M = M # reservoir size
         self.N = 0 # number of subgraphs encountered
-        self.reservoir = SubgraphReservoir(size=M)
+
+        # every algorithm instance draws from its own random stream
+        self.rng = BufferedRNG(seed)
+
+        if compact_reservoir:
+            self.reservoir = CompactSubgraphReservoir(size=M, k=kwargs['k'], rng=self.rng)
+        else:
+            self.reservoir = SubgraphReservoir(size=M, rng=self.rng)
 
         super().__init__(M=M, **kwargs)
 
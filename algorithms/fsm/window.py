@@ -0,0 +1,80 @@
+from collections import deque
+
+
+class SlidingWindow:
+    """
+    Sliding window over the edge stream of a fully dynamic algorithm.
+
+    The window holds either the last size edges or the edges of the last
+    duration time units, and edges leave it in arrival order. An expiring
+    edge is removed from the wrapped algorithm, which updates its patterns
+    and reservoir incrementally, so the graph and the sample only ever
+    cover the window. All other attributes, such as patterns and metrics,
+    are those of the wrapped algorithm.
+    """
+
+    def __init__(self, algorithm, size=None, duration=None):
+        """
+        Initialize a new sliding window.
+
+        :param algorithm: The fully dynamic algorithm that mines the window.
+        :param size: The maximum number of edges in the window.
+        :param duration: The maximum age of an edge in the window.
+        :type size: int
+        :type duration: int, float
+        """
+        if size is None and duration is None:
+            raise ValueError("the window needs a size or a duration")
+
+        self.algorithm = algorithm
+        self.size = size
+        self.duration = duration
+
+        # the edges in the window with their timestamps, oldest first
+        self.edges = deque()
+
+
+    def __getattr__(self, name):
+        return getattr(self.algorithm, name)
+
+
+    def __len__(self):
+        return len(self.edges)
+
+
+    def add_edge(self, edge, timestamp=None):
+        """
+        Add an edge arriving at timestamp, expiring edges that leave the window.
+
+        Timestamps are required for a window with a duration, and must not
+        decrease over the stream.
+        """
+        if self.duration is not None:
+            if timestamp is None:
+                raise ValueError("a window with a duration needs edge timestamps")
+
+            self.expire(timestamp - self.duration)
+
+        added = self.algorithm.add_edge(edge)
+
+        if added:
+            self.edges.append((timestamp, edge))
+
+            if self.size is not None and len(self.edges) > self.size:
+                self.algorithm.remove_edge(self.edges.popleft()[1])
+
+        return added
+
+
+    def add_edges(self, batch, timestamps=None):
+        """Add a batch of edges, one at a time as each addition may expire edges."""
+        if timestamps is None:
+            timestamps = [None] * len(batch)
+
+        return sum(self.add_edge(edge, t) for edge, t in zip(batch, timestamps))
+
+
+    def expire(self, timestamp):
+        """Remove all edges that arrived at or before timestamp."""
+        while self.edges and self.edges[0][0] <= timestamp:
+            self.algorithm.remove_edge(self.edges.popleft()[1])
@@ -0,0 +1,94 @@
+"""
+Benchmark the canonical labeling backends.
+
+Labels random connected k-node subgraphs with the permutation backend and the
+partition refinement backend and reports the mean time per subgraph. Stars
+whose leaves share a label are timed separately, as they are the worst case
+for the permutation backend.
+
+Run from the repository root with: python -m benchmarks.canonical_label
+"""
+
+import time
+import random
+
+from itertools import combinations
+from argparse import ArgumentParser
+
+from subgraph.util import make_subgraph
+from subgraph.subgraph import SubgraphEdge
+from subgraph.pattern import BACKENDS
+
+
+def random_subgraph(k, L, Q, p):
+    """Random connected subgraph: a random tree plus edges with probability p."""
+    order = random.sample(range(10 * k), k)
+    nodes = [(u, random.randint(1, L)) for u in order]
+
+    pairs = set()
+    for i in range(1, k):
+        pairs.add(tuple(sorted((order[i], order[random.randrange(i)]))))
+
+    for u, v in combinations(sorted(order), 2):
+        if random.random() < p:
+            pairs.add((u, v))
+
+    edges = [SubgraphEdge(u, v, random.randint(1, Q)) for u, v in pairs]
+    return make_subgraph(nodes, edges)
+
+
+def star_subgraph(k):
+    nodes = [(u, 1) for u in range(k)]
+    edges = [SubgraphEdge(0, v, 1) for v in range(1, k)]
+    return make_subgraph(nodes, edges)
+
+
+def time_backend(label_func, subgraphs):
+    start = time.perf_counter()
+
+    for subgraph in subgraphs:
+        label_func(subgraph)
+
+    return (time.perf_counter() - start) / len(subgraphs) * 1e6
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark canonical labeling backends.")
+
+    parser.add_argument('-k',
+        type=int,
+        nargs='+',
+        default=[3, 4, 5, 6, 7],
+        help="subgraph sizes to benchmark (default 3 4 5 6 7)")
+
+    parser.add_argument('-n', '--samples',
+        type=int,
+        default=200,
+        help="number of random subgraphs per size (default 200)")
+
+    parser.add_argument('-l', dest='L', type=int, default=2, help="number of vertex labels")
+    parser.add_argument('-q', dest='Q', type=int, default=2, help="number of edge labels")
+    parser.add_argument('-p', type=float, default=0.3, help="probability of extra edges")
+    parser.add_argument('-s', '--seed', type=int, default=42, help="random seed")
+
+    args = vars(parser.parse_args())
+
+    random.seed(args['seed'])
+
+    backends = sorted(BACKENDS)
+
+    print("%-3s %-8s" % ("k", "case"), *("%14s" % name for name in backends), "   (us/subgraph)")
+
+    for k in args['k']:
+        cases = {
+            'random': [random_subgraph(k, args['L'], args['Q'], args['p']) for _ in range(args['samples'])],
+            'star': [star_subgraph(k)] * max(1, args['samples'] // 10)
+        }
+
+        for case, subgraphs in cases.items():
+            timings = [time_backend(BACKENDS[name], subgraphs) for name in backends]
+            print("%-3d %-8s" % (k, case), *("%14.1f" % t for t in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark the lookup of reservoir subgraphs that contain an edge.
+
+Fills a subgraph reservoir by streaming the edges of a labeled power-law
+graph through the naive reservoir algorithm and then looks up the subgraphs
+of every remaining edge, once through the vertex pair index of the
+reservoir and once by intersecting per-vertex index sets, which are built
+for the benchmark before the lookups are timed. Next to the timings it
+reports the memory of each index: the array bytes of the pair index, and
+the bytes traced while the per-vertex sets are built.
+
+Run from the repository root with: python -m benchmarks.common_subgraphs
+"""
+
+import time
+import random
+import tracemalloc
+
+import numpy as np
+import networkx as nx
+
+from argparse import ArgumentParser
+from collections import defaultdict
+
+from graph.util import make_edge
+
+from algorithms.fsm.incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
+
+
+def power_law_stream(N, m, L, Q):
+    """Shuffled labeled edges of a Barabási–Albert graph."""
+    G = nx.barabasi_albert_graph(N, m)
+
+    labels = {u: random.randint(1, L) for u in G}
+    edges = [make_edge(u, labels[u], v, labels[v], random.randint(1, Q)) for u, v in G.edges]
+
+    random.shuffle(edges)
+    return edges
+
+
+def vertex_index(reservoir):
+    """Index the reservoir subgraphs by each of their vertices."""
+    vertex_subgraphs = defaultdict(set)
+
+    for idx, subgraph in enumerate(reservoir.subgraphs):
+        for u in subgraph.nodes:
+            vertex_subgraphs[u].add(idx)
+
+    return vertex_subgraphs
+
+
+def vertex_intersection_func(reservoir):
+    """The vertex set lookup and the bytes allocated for its index."""
+    tracemalloc.start()
+    vertex_subgraphs = vertex_index(reservoir)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def vertex_intersection(reservoir, u, v):
+        common_indices = vertex_subgraphs[u] & vertex_subgraphs[v]
+        return [reservoir.subgraphs[idx] for idx in common_indices]
+
+    return vertex_intersection, allocated
+
+
+def time_lookup(lookup, reservoir, edges):
+    found = 0
+    start = time.perf_counter()
+
+    for edge in edges:
+        found += len(lookup(reservoir, edge.get_u(), edge.get_v()))
+
+    return time.perf_counter() - start, found
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark common subgraph lookups.")
+
+    parser.add_argument('N', type=int, help="number of nodes in the graph")
+    parser.add_argument('-m', type=int, default=5, help="edges per new node (default 5)")
+    parser.add_argument('-k', type=int, default=3, help="size of subgraphs (default 3)")
+    parser.add_argument('-M', type=int, default=10000, help="reservoir size (default 10000)")
+    parser.add_argument('-f', '--fill', type=float, default=0.8,
+        help="fraction of the stream used to fill the reservoir (default 0.8)")
+    parser.add_argument('-s', '--seed', type=int, default=42, help="random seed")
+
+    args = vars(parser.parse_args())
+
+    random.seed(args['seed'])
+    np.random.seed(args['seed'])
+
+    edges = power_law_stream(args['N'], args['m'], 2, 2)
+    split = int(len(edges) * args['fill'])
+
+    algorithm = IncrementalNaiveReservoirAlgorithm(k=args['k'], M=args['M'], seed=args['seed'])
+
+    for edge in edges[:split]:
+        algorithm.add_edge(edge)
+
+    reservoir = algorithm.reservoir
+    queries = edges[split:]
+
+    lookups = {
+        'pair index': (lambda r, u, v: r.get_common_subgraphs(u, v), reservoir.pair_subgraphs.nbytes()),
+        'vertex sets': vertex_intersection_func(reservoir)
+    }
+
+    print("reservoir holds", len(reservoir), "subgraphs,", len(queries), "lookups")
+
+    for name, (lookup, nbytes) in lookups.items():
+        duration, found = time_lookup(lookup, reservoir, queries)
+        print("%-12s %10.2f us/edge %8d subgraphs found %8.1f MB index" %
+            (name, duration / len(queries) * 1e6, found, nbytes / 1e6))
+
+
+if __name__ == '__main__':
+    main()
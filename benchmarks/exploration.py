@@ -0,0 +1,85 @@
+"""
+Benchmark the exploration of subgraphs created by a new edge.
+
+Streams the edges of a labeled power-law graph and, before each edge is added,
+explores the k-node subgraphs that contain it. The specialised k = 3 and
+k = 4 explorers are timed against the generic connected set enumerator, which
+is also timed on its own for larger k.
+
+Run from the repository root with: python -m benchmarks.exploration
+"""
+
+import time
+import random
+
+import networkx as nx
+
+from argparse import ArgumentParser
+
+from graph.util import make_edge
+from graph.simple_graph import SimpleGraph
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet, connected_sets
+
+SPECIALISED = {
+    3: optimized_triplet.get_all_subgraphs,
+    4: optimized_quadruplet.get_all_subgraphs
+}
+
+
+def power_law_stream(N, m):
+    """Shuffled edges of a Barabási–Albert graph."""
+    G = nx.barabasi_albert_graph(N, m)
+    edges = [make_edge(u, 1, v, 1, 1) for u, v in G.edges]
+
+    random.shuffle(edges)
+    return edges
+
+
+def time_exploration(explore, k, edges):
+    graph = SimpleGraph()
+
+    found = 0
+    duration = 0.0
+
+    for edge in edges:
+        start = time.perf_counter()
+        additions, replacements = explore(graph, k, edge.get_u(), edge.get_v())
+        duration += time.perf_counter() - start
+
+        found += len(additions) + len(replacements)
+        graph.add_edge(edge)
+
+    return duration, found
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark new edge subgraph exploration.")
+
+    parser.add_argument('N', type=int, help="number of nodes in the graph")
+    parser.add_argument('-m', type=int, default=2, help="edges per new node (default 2)")
+    parser.add_argument('-k', type=int, nargs='+', default=[3, 4, 5],
+        help="sizes of subgraphs (default 3 4 5)")
+    parser.add_argument('-s', '--seed', type=int, default=42, help="random seed")
+
+    args = vars(parser.parse_args())
+
+    random.seed(args['seed'])
+
+    edges = power_law_stream(args['N'], args['m'])
+
+    print("streaming", len(edges), "edges")
+
+    for k in args['k']:
+        explorers = [('connected sets', connected_sets.get_all_subgraphs)]
+        if k in SPECIALISED:
+            explorers.insert(0, ('specialised', SPECIALISED[k]))
+
+        for name, explore in explorers:
+            duration, found = time_exploration(explore, k, edges)
+            print("k = %d %-15s %10.2f us/edge %12.0f subgraphs/s %10d subgraphs" %
+                (k, name, duration / len(edges) * 1e6, found / duration, found))
+
+
+if __name__ == '__main__':
+    main()
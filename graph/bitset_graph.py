@@ -0,0 +1,114 @@
+import numpy as np
+
+from graph.compact_graph import CompactGraph
+
+
+class BitsetGraph(CompactGraph):
+    """
+    Compact graph with each neighborhood stored as a bitset.
+
+    Bit j of the Python integer adjacency[i] is set if the nodes with
+    handles i and j are adjacent. neighbors() returns the bitset wrapped in a
+    BitSet, so the set operations of the explorers run as bitwise operations
+    on machine words and set sizes are popcounts. This suits dense graphs,
+    where a neighborhood covers a large fraction of all nodes.
+    """
+
+    def _new_neighborhood(self):
+        """Empty neighborhood of a new node."""
+        return 0
+
+
+    def _add_neighbor(self, i, j):
+        """Add handles i and j as neighbors in the adjacency."""
+        self.adjacency[i] |= 1 << j
+        self.adjacency[j] |= 1 << i
+
+
+    def _remove_neighbor(self, i, j):
+        """Remove the neighbor relationship of handles i and j."""
+        if not (self.adjacency[i] >> j) & 1:
+            raise KeyError(j)
+
+        self.adjacency[i] &= ~(1 << j)
+        self.adjacency[j] &= ~(1 << i)
+
+
+    def neighbors(self, handle):
+        """Retrieve the handles of all neighbors of a node."""
+        return BitSet(self.adjacency[handle])
+
+
+class BitSet:
+    """
+    Set of integer node handles stored as the bits of a Python integer.
+
+    Supports the set operators used by the explorers in both directions,
+    with other BitSets and with Python sets, which are converted to bits.
+    """
+    __slots__ = ('bits',)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+
+    def __len__(self):
+        return self.bits.bit_count()
+
+
+    def __iter__(self):
+        return iter(self.handles())
+
+
+    def __contains__(self, x):
+        return bool((self.bits >> x) & 1)
+
+
+    def __repr__(self):
+        return "BitSet(%s)" % (self.handles())
+
+
+    def handles(self):
+        """List the handles of the set bits in increasing order."""
+        if not self.bits:
+            return []
+
+        n_bytes = (self.bits.bit_length() + 7) // 8
+        bytes_ = np.frombuffer(self.bits.to_bytes(n_bytes, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(bytes_, bitorder='little')).tolist()
+
+
+    def __and__(self, other):
+        return BitSet(self.bits & to_bits(other))
+
+
+    def __or__(self, other):
+        return BitSet(self.bits | to_bits(other))
+
+
+    def __xor__(self, other):
+        return BitSet(self.bits ^ to_bits(other))
+
+
+    def __sub__(self, other):
+        return BitSet(self.bits & ~to_bits(other))
+
+
+    def __rsub__(self, other):
+        return BitSet(to_bits(other) & ~self.bits)
+
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+
+def to_bits(s):
+    """Integer with the bits of the handles in a BitSet or any other set."""
+    if isinstance(s, BitSet):
+        return s.bits
+
+    bits = 0
+    for x in s:
+        bits |= 1 << x
+    return bits
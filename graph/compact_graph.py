@@ -0,0 +1,191 @@
+from itertools import combinations
+from collections import defaultdict, Counter
+
+from graph.node import Node
+from graph.util import make_edge
+from graph.simple_graph import SimpleGraph
+
+class CompactGraph(SimpleGraph):
+    """
+    Graph with its vertices interned to dense integer handles.
+
+    Node ids are mapped to handles 0, 1, 2, ... on first sight. The nodes
+    with their labels are kept in a list indexed by handle, the adjacency in
+    a list of integer sets and the edge labels in a dict keyed by the packed
+    handle pair. The explorers work on handles, and the endpoints and node
+    methods convert between edges, handles and nodes at the boundary. Each
+    vertex has a single Node, instead of one per edge as in SimpleGraph.
+    The handles of nodes left without neighbors are reused for new nodes.
+    """
+    handles = None
+    node_ids = None
+    nodes = None
+    adjacency = None
+    edge_labels = None
+    label_histograms = None
+
+
+    def __init__(self, label_histograms=False):
+        self.handles = {}
+        self.free_handles = []
+        self.node_ids = []
+        self.nodes = []
+
+        self.adjacency = []
+        self.edge_labels = {}
+
+        if label_histograms:
+            self.label_histograms = defaultdict(Counter)
+
+
+    def __contains__(self, edge):
+        i = self.handles.get(edge.u)
+        j = self.handles.get(edge.v)
+
+        if i is None or j is None:
+            return False
+
+        return self._key(i, j) in self.edge_labels
+
+
+    def __len__(self):
+        return len(self.node_ids) - len(self.free_handles)
+
+
+    def handle(self, node_id, label):
+        """Get the handle of a node, interning the node if necessary."""
+        i = self.handles.get(node_id)
+
+        if i is None and self.free_handles:
+            i = self.free_handles.pop()
+
+            self.handles[node_id] = i
+            self.node_ids[i] = node_id
+            self.nodes[i] = Node(node_id, label)
+
+        elif i is None:
+            i = len(self.node_ids)
+
+            self.handles[node_id] = i
+            self.node_ids.append(node_id)
+            self.nodes.append(Node(node_id, label))
+            self.adjacency.append(self._new_neighborhood())
+
+        return i
+
+
+    def endpoints(self, edge):
+        """Get the handles of the endpoints of an edge."""
+        return self.handle(edge.u, edge.u_label), self.handle(edge.v, edge.v_label)
+
+
+    def node(self, handle):
+        """Get the node of a handle."""
+        return self.nodes[handle]
+
+
+    def to_nodes(self, handles):
+        """Get the nodes of an iterable of handles."""
+        return [self.nodes[i] for i in handles]
+
+
+    def label(self, handle):
+        """Get the label of the node of a handle."""
+        return self.nodes[handle].label
+
+
+    def add_edge(self, edge):
+        """Add an edge to the graph."""
+        i, j = self.endpoints(edge)
+
+        self._add_neighbor(i, j)
+        self.edge_labels[self._key(i, j)] = edge.label
+
+        if self.label_histograms is not None:
+            self._update_label_histograms(edge, 1)
+
+
+    def remove_edge(self, edge):
+        """Remove an edge from the graph."""
+        i, j = self.endpoints(edge)
+
+        self._remove_neighbor(i, j)
+        del self.edge_labels[self._key(i, j)]
+
+        if self.label_histograms is not None:
+            self._update_label_histograms(edge, -1)
+
+
+    def remove_isolated(self, edge):
+        """Release the handles of the endpoints of edge that are left without neighbors."""
+        for node_id in [edge.u, edge.v]:
+            i = self.handles.get(node_id)
+
+            if i is not None and not len(self.neighbors(i)):
+                del self.handles[node_id]
+                self.node_ids[i] = None
+                self.nodes[i] = None
+                self.adjacency[i] = self._new_neighborhood()
+                self.free_handles.append(i)
+
+                if self.label_histograms is not None:
+                    self.label_histograms.pop(i, None)
+
+
+    def _new_neighborhood(self):
+        """Empty neighborhood of a new node."""
+        return set()
+
+
+    def _add_neighbor(self, i, j):
+        """Add handles i and j as neighbors in the adjacency."""
+        self.adjacency[i].add(j)
+        self.adjacency[j].add(i)
+
+
+    def _remove_neighbor(self, i, j):
+        """Remove the neighbor relationship of handles i and j."""
+        self.adjacency[i].remove(j)
+        self.adjacency[j].remove(i)
+
+
+    def _update_label_histograms(self, edge, delta):
+        """Count edge in the neighbor label histograms of its endpoints."""
+        i, j = self.endpoints(edge)
+
+        for handle, key in [(i, (edge.v_label, edge.label)), (j, (edge.u_label, edge.label))]:
+            histogram = self.label_histograms[handle]
+            histogram[key] += delta
+
+            if histogram[key] == 0:
+                del histogram[key]
+
+
+    def neighbors(self, handle):
+        """Retrieve the handles of all neighbors of a node."""
+        return self.adjacency[handle]
+
+
+    def edge_label(self, i, j):
+        """Retrieve the label of the edge between handles i and j, or None."""
+        return self.edge_labels.get(self._key(i, j))
+
+
+    def get_induced_edges(self, handles):
+        """Retrieve the set of edges induced by a set of handles."""
+        edges = []
+
+        # sort the handles by node id to get the edges in sorted order
+        nodes = sorted((self.node_ids[i], i) for i in handles)
+
+        for (u, i), (v, j) in combinations(nodes, 2):
+            q_uv = self.edge_labels.get(self._key(i, j))
+            if q_uv != None:
+                edges.append(make_edge(u, self.label(i), v, self.label(j), q_uv))
+
+        return edges
+
+
+    def _key(self, i, j):
+        # the handle pair packed into a single integer
+        return (i << 32) | j if i < j else (j << 32) | i
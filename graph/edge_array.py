@@ -0,0 +1,122 @@
+import numpy as np
+
+from itertools import chain
+from multiprocessing import shared_memory
+
+from .graph_edge import Edge
+
+EDGE_FIELDS = [
+    ('u', np.int64),
+    ('u_label', np.int32),
+    ('v', np.int64),
+    ('v_label', np.int32),
+    ('label', np.int32)
+]
+
+# edges are converted to Edge namedtuples this many at a time
+CHUNK_SIZE = 65536
+
+
+def edge_dtype(timestamps=False):
+    """Structured dtype of an edge array, with an optional timestamp field."""
+    fields = EDGE_FIELDS + [('timestamp', np.float64)] if timestamps else EDGE_FIELDS
+    return np.dtype(fields)
+
+
+def read_edge_file(edge_file):
+    """
+    Read an edge file into a structured edge array.
+
+    Each row holds u, l_u, v, l_v and q separated by spaces, and optionally
+    a timestamp, which the first row decides for the whole file. The rows
+    are parsed straight into the array, then as in make_edge the endpoints
+    of each edge are ordered so that u < v, and the edges are sorted by
+    their timestamps.
+    """
+    first = ''
+    for first in edge_file:
+        if first.strip():
+            break
+
+    timestamps = len(first.split()) > 5
+    dtype = edge_dtype(timestamps)
+
+    if not first.strip():
+        return np.zeros(0, dtype=dtype)
+
+    edges = np.loadtxt(chain([first], edge_file), dtype=dtype,
+        usecols=range(len(dtype.names)), ndmin=1)
+
+    swap = edges['v'] < edges['u']
+
+    for a, b in [('u', 'v'), ('u_label', 'v_label')]:
+        values = edges[a][swap]
+        edges[a][swap] = edges[b][swap]
+        edges[b][swap] = values
+
+    if timestamps:
+        edges = edges[np.argsort(edges['timestamp'], kind='stable')]
+
+    return edges
+
+
+def to_edges(edges):
+    """Convert the rows of an edge array to Edge namedtuples."""
+    return [Edge(*row[:5]) for row in edges.tolist()]
+
+
+def iter_edges(edges, order=None):
+    """Iterate the Edges and rows of an edge array in the order of an index array."""
+    if order is None:
+        order = np.arange(len(edges))
+
+    for i in range(0, len(order), CHUNK_SIZE):
+        rows = edges[order[i:i + CHUNK_SIZE]].tolist()
+
+        for row in rows:
+            yield Edge(*row[:5]), row
+
+
+class SharedEdgeArray:
+    """
+    Edge array in shared memory.
+
+    The process that creates the array copies the edges into a new shared
+    memory block, and other processes attach to the block by its name,
+    length and dtype, and read the edges without copying them. The creator
+    unlinks the block when it is no longer needed.
+    """
+
+    def __init__(self, memory, length, dtype, owner=False):
+        self.memory = memory
+        self.owner = owner
+        self.array = np.ndarray(length, dtype=dtype, buffer=memory.buf)
+
+
+    @classmethod
+    def create(cls, edges):
+        """Copy an edge array into a new shared memory block."""
+        memory = shared_memory.SharedMemory(create=True, size=max(edges.nbytes, 1))
+        shared = cls(memory, len(edges), edges.dtype, owner=True)
+        shared.array[:] = edges
+        return shared
+
+
+    @classmethod
+    def attach(cls, name, length, dtype):
+        """Attach to the shared memory block of an edge array."""
+        return cls(shared_memory.SharedMemory(name=name), length, dtype)
+
+
+    def handle(self):
+        """The arguments of attach for this array."""
+        return self.memory.name, len(self.array), self.array.dtype
+
+
+    def close(self):
+        """Detach from the block, and free it if this process created it."""
+        self.array = None
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
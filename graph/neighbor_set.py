@@ -0,0 +1,105 @@
+import numpy as np
+
+# neighbor sets below this size are kept as Python sets
+SMALL_SET_SIZE = 64
+
+
+class NeighborSet:
+    """
+    Set of integer node handles stored as a sorted NumPy array.
+
+    Supports the set operators used by the explorers in both directions,
+    with other NeighborSets and with Python sets. Two large sets are merged
+    with the vectorized NumPy set routines, while a much smaller operand is
+    probed against the sorted array with a binary search. Results with less
+    than SMALL_SET_SIZE elements come back as Python sets, as hashing is
+    faster than NumPy for small sets.
+    """
+    __slots__ = ('array',)
+
+    def __init__(self, array):
+        self.array = array
+
+
+    def __len__(self):
+        return len(self.array)
+
+
+    def __iter__(self):
+        return iter(self.array.tolist())
+
+
+    def __contains__(self, x):
+        a = self.array
+        i = a.searchsorted(x)
+        return bool(i < len(a) and a[i] == x)
+
+
+    def __repr__(self):
+        return "NeighborSet(%s)" % (self.array.tolist())
+
+
+    def __and__(self, other):
+        a, b = self.array, to_array(other)
+        if len(b) < len(a):
+            a, b = b, a
+
+        if len(a) * 8 < len(b):
+            return _wrap(a[member(a, b)])
+
+        return _wrap(np.intersect1d(a, b, assume_unique=True))
+
+
+    def __or__(self, other):
+        return _wrap(np.union1d(self.array, to_array(other)))
+
+
+    def __xor__(self, other):
+        return _wrap(np.setxor1d(self.array, to_array(other), assume_unique=True))
+
+
+    def __sub__(self, other):
+        return _difference(self.array, to_array(other))
+
+
+    def __rsub__(self, other):
+        return _difference(to_array(other), self.array)
+
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+
+def to_array(s):
+    """Sorted array of the handles in a NeighborSet or any other set."""
+    if isinstance(s, NeighborSet):
+        return s.array
+
+    a = np.fromiter(s, dtype=np.int64, count=len(s))
+    a.sort()
+    return a
+
+
+def member(x, a):
+    """Mask of the elements of x that are in the sorted array a."""
+    if len(a) == 0:
+        return np.zeros(len(x), dtype=bool)
+
+    i = a.searchsorted(x)
+    i[i == len(a)] = 0
+    return a[i] == x
+
+
+def _difference(a, b):
+    if len(a) * 8 < len(b):
+        return _wrap(a[~member(a, b)])
+
+    return _wrap(np.setdiff1d(a, b, assume_unique=True))
+
+
+def _wrap(a):
+    if len(a) < SMALL_SET_SIZE:
+        return set(a.tolist())
+
+    return NeighborSet(a)
@@ -1,5 +1,5 @@
 from itertools import combinations, product
-from collections import defaultdict
+from collections import defaultdict, Counter
 
 from graph.util import make_edge
 
@@ -8,12 +8,18 @@ from util.set import flatten
 class SimpleGraph:
     adjacency_matrix = None
     edge_labels = None
+    label_histograms = None
 
 
-    def __init__(self):
+    def __init__(self, label_histograms=False):
         self.adjacency_matrix = defaultdict(set)
         self.edge_labels = {}
 
+        # optional counts of the neighbors of each node
+        # by (neighbor label, edge label)
+        if label_histograms:
+            self.label_histograms = defaultdict(Counter)
+
 
     def __contains__(self, edge):
         return (edge.u, edge.v) in self.edge_labels
@@ -24,12 +30,28 @@ class SimpleGraph:
         self._add_neighbor(edge.get_u(), edge.get_v())
         self._add_edge_label(edge)
 
+        if self.label_histograms is not None:
+            self._update_label_histograms(edge, 1)
+
 
     def remove_edge(self, edge):
         """Remova an edge from the graph."""
         self._remove_neighbor(edge.get_u(), edge.get_v())
         self._remove_edge_label(edge)
 
+        if self.label_histograms is not None:
+            self._update_label_histograms(edge, -1)
+
+
+    def remove_isolated(self, edge):
+        """Forget the endpoints of edge that are left without neighbors."""
+        for node in [edge.get_u(), edge.get_v()]:
+            if not self.adjacency_matrix.get(node):
+                self.adjacency_matrix.pop(node, None)
+
+                if self.label_histograms is not None:
+                    self.label_histograms.pop(node, None)
+
 
     def _add_neighbor(self, U, V):
         """Add U and V as neighbors to the adjacency matrix."""
@@ -53,6 +75,37 @@ class SimpleGraph:
         del self.edge_labels[(edge.u, edge.v)]
 
 
+    def _update_label_histograms(self, edge, delta):
+        """Count edge in the neighbor label histograms of its endpoints."""
+        for node, key in [(edge.get_u(), (edge.v_label, edge.label)),
+                          (edge.get_v(), (edge.u_label, edge.label))]:
+            histogram = self.label_histograms[node]
+            histogram[key] += delta
+
+            if histogram[key] == 0:
+                del histogram[key]
+
+
+    def endpoints(self, edge):
+        """Get the handles of the endpoints of an edge, the nodes themselves."""
+        return edge.get_u(), edge.get_v()
+
+
+    def node(self, handle):
+        """Get the node of a handle."""
+        return handle
+
+
+    def to_nodes(self, handles):
+        """Get the nodes of an iterable of handles."""
+        return handles
+
+
+    def label(self, handle):
+        """Get the label of the node of a handle."""
+        return handle.label
+
+
     def neighbors(self, node):
         """Retrieve all neighbors of a node."""
         if node in self.adjacency_matrix:
@@ -61,6 +114,23 @@ class SimpleGraph:
         return set()
 
 
+    def edge_label(self, u, v):
+        """Retrieve the label of the edge between nodes u and v, or None."""
+        u, v = u.node_id, v.node_id
+        return self.edge_labels.get((u, v) if u < v else (v, u))
+
+
+    def label_histogram(self, node):
+        """Count the neighbors of a node by (neighbor label, edge label)."""
+        if self.label_histograms is None:
+            raise ValueError("the graph does not keep label histograms")
+
+        if node in self.label_histograms:
+            return self.label_histograms[node]
+
+        return Counter()
+
+
     def n_hop_neighborhood(self, source, n):
         """Enumerate all n-hop neighborhoods originating from source node."""
 
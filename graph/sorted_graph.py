@@ -0,0 +1,139 @@
+import numpy as np
+
+from graph.compact_graph import CompactGraph
+from graph.neighbor_set import NeighborSet, to_array, member
+
+# neighborhoods of at least this size are kept in sorted arrays
+SORTED_DEGREE = 1024
+
+
+class SortedGraph(CompactGraph):
+    """
+    Compact graph with the neighbors of high-degree nodes in sorted arrays.
+
+    A neighborhood is a Python set of handles until its size reaches
+    threshold, and from then on a sorted NumPy array of handles that is
+    returned wrapped in a NeighborSet, so the set operations of the
+    explorers on hubs run as vectorized merges and binary searches. A
+    neighborhood that shrinks below half of threshold becomes a set again.
+
+    The NeighborSet of a hub is a view of its array, which is only valid
+    until the next edge is added to or removed from the hub.
+    """
+
+    def __init__(self, label_histograms=False, threshold=SORTED_DEGREE):
+        super().__init__(label_histograms=label_histograms)
+        self.threshold = threshold
+
+
+    def _add_neighbor(self, i, j):
+        """Add handles i and j as neighbors in the adjacency."""
+        self._insert(i, j)
+        self._insert(j, i)
+
+
+    def _remove_neighbor(self, i, j):
+        """Remove the neighbor relationship of handles i and j."""
+        self._delete(i, j)
+        self._delete(j, i)
+
+
+    def _insert(self, i, j):
+        nbrs = self.adjacency[i]
+
+        if isinstance(nbrs, set):
+            nbrs.add(j)
+
+            if len(nbrs) >= self.threshold:
+                self.adjacency[i] = SortedNeighbors(nbrs)
+        else:
+            nbrs.insert(j)
+
+
+    def _delete(self, i, j):
+        nbrs = self.adjacency[i]
+        nbrs.remove(j)
+
+        if not isinstance(nbrs, set) and 2 * nbrs.size < self.threshold:
+            self.adjacency[i] = set(nbrs.array().tolist())
+
+
+    def neighbors(self, handle):
+        """Retrieve the handles of all neighbors of a node."""
+        nbrs = self.adjacency[handle]
+
+        if isinstance(nbrs, set):
+            return nbrs
+
+        return NeighborSet(nbrs.array())
+
+
+    def two_hop_neighborhood(self, source, through_nodes=None, exclude_nodes=set()):
+        """Enumerate all 2-hop neighborhoods originating from source node."""
+        one_hop_nodes = self.neighbors(source)
+
+        if isinstance(one_hop_nodes, set) and not isinstance(exclude_nodes, NeighborSet):
+            return super().two_hop_neighborhood(source, through_nodes, exclude_nodes)
+
+        # filter the excluded nodes out of all second hops at once
+        # instead of once per node in the first hop
+        exclude_nodes = to_array(exclude_nodes | one_hop_nodes | set([source]))
+
+        if through_nodes != None:
+            one_hop_nodes = one_hop_nodes & through_nodes
+
+        reached = []
+        through = []
+
+        for v in one_hop_nodes:
+            nbrs = self.neighbors(v)
+            reached.extend(nbrs)
+            through.extend([v] * len(nbrs))
+
+        reached = np.array(reached, dtype=np.int64)
+        keep = ~member(reached, exclude_nodes)
+
+        two_hop_dict = {}
+
+        for s, v in zip(reached[keep].tolist(), np.array(through, dtype=np.int64)[keep].tolist()):
+            if s not in two_hop_dict:
+                two_hop_dict[s] = set()
+            two_hop_dict[s].add(v)
+
+        return two_hop_dict
+
+
+class SortedNeighbors:
+    """Sorted array of handles with spare capacity for insertions."""
+    __slots__ = ('buffer', 'size')
+
+    def __init__(self, handles):
+        self.size = len(handles)
+        self.buffer = np.zeros(2 * self.size, dtype=np.int64)
+        self.buffer[:self.size] = sorted(handles)
+
+
+    def array(self):
+        return self.buffer[:self.size]
+
+
+    def insert(self, j):
+        if self.size == len(self.buffer):
+            self.buffer = np.concatenate([self.buffer, np.zeros_like(self.buffer)])
+
+        # shift the larger handles up by one in place
+        k = self.array().searchsorted(j)
+        self.buffer[k + 1:self.size + 1] = self.buffer[k:self.size]
+        self.buffer[k] = j
+        self.size += 1
+
+
+    def remove(self, j):
+        a = self.array()
+        k = a.searchsorted(j)
+
+        if k == self.size or a[k] != j:
+            raise KeyError(j)
+
+        self.buffer[k:self.size - 1] = self.buffer[k + 1:self.size]
+        self.size -= 1
@@ -0,0 +1,268 @@
+import numpy as np
+
+from itertools import combinations
+
+from .rng import BufferedRNG
+from .slot_index import SlotTable, PairIndex
+
+from graph.node import Node
+from subgraph.subgraph import Subgraph, SubgraphEdge
+from subgraph.util import pair_position
+
+# edge mask dtypes by the number of node pairs they hold
+MASK_BITS = [(8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64)]
+
+class CompactSubgraphReservoir:
+    """
+    Subgraph reservoir backed by preallocated NumPy arrays.
+
+    Slot i of the reservoir stores the sorted vertex ids and vertex labels of
+    a k-node subgraph, a bitmask of the node pairs that are connected by an
+    edge, the labels of those edges in combinations order and the cached
+    pattern id of the subgraph (-1 if unknown). Subgraphs are materialized
+    only when they leave the reservoir through the public API.
+
+    The slots are indexed by their vertex ids in a SlotTable and by their
+    node pairs in a PairIndex, which both read the keys back from the
+    vertex array, so the whole reservoir lives in a fixed set of arrays.
+    """
+    subgraph_indices = None
+    pair_subgraphs = None
+
+    def __init__(self, size, k, rng=None):
+        """
+        Initialize a new compact subgraph reservoir.
+
+        :param size: The maximum size of the reservoir.
+        :param k: The number of nodes in each subgraph.
+        :param rng: The random number stream used to pick subgraphs.
+        :type size: int
+        :type k: int
+        """
+        self.max_size = size
+        self.rng = rng if rng is not None else BufferedRNG()
+        self.k = k
+        self.size = 0
+
+        n_pairs = k * (k - 1) // 2
+        self.pairs = list(combinations(range(k), 2))
+
+        if n_pairs > MASK_BITS[-1][0]:
+            raise ValueError("edge masks hold at most %d node pairs, k = %d has %d" % (MASK_BITS[-1][0], k, n_pairs))
+
+        # the smallest unsigned integer with a bit for every node pair
+        mask_dtype = next(dtype for bits, dtype in MASK_BITS if n_pairs <= bits)
+
+        self.vertices = np.zeros((size, k), dtype=np.int64)
+        self.vertex_labels = np.zeros((size, k), dtype=np.uint8)
+        self.edge_masks = np.zeros(size, dtype=mask_dtype)
+        self.edge_labels = np.zeros((size, n_pairs), dtype=np.uint8)
+        self.patterns = np.full(size, -1, dtype=np.int32)
+
+        self.subgraph_indices = SlotTable(size, self._slot_key)
+        self.pair_subgraphs = PairIndex(size, n_pairs, self._slot_pair)
+
+
+    def __contains__(self, subgraph):
+        return self.subgraph_indices.get(self._key(subgraph)) >= 0
+
+
+    def __len__(self):
+        return self.size
+
+
+    def is_full(self):
+        """Checks if the reservoir has reached max_size."""
+        return len(self) >= self.max_size
+
+
+    def nbytes(self):
+        """Number of bytes taken by the arrays of the reservoir."""
+        arrays = [self.vertices, self.vertex_labels, self.edge_masks, self.edge_labels, self.patterns]
+        return sum(a.nbytes for a in arrays) + self.subgraph_indices.nbytes() + self.pair_subgraphs.nbytes()
+
+
+    def add(self, subgraph, N=float('-inf'), pattern=-1):
+        """
+        Tries to add a subgraph to the resevoir.
+
+        Returns whether the subgraph was added, and the subgraph it replaced
+        along with its pattern id, or None and -1 if nothing was replaced.
+        """
+
+        success = False
+        old_subgraph = None
+        old_pattern = -1
+
+        if subgraph not in self:
+
+            if self.is_full():
+                # the reservoir is full, so we replace an existing subgraph
+                old_subgraph = self.random(N=N)
+
+                if old_subgraph:
+                    old_pattern = self.replace(old_subgraph, subgraph, pattern=pattern)
+                    success = True
+
+            else:
+                # the reservoir is not full, so we add the new subgraph
+                idx = self.size
+                self.size += 1
+
+                self._store(idx, subgraph, pattern)
+
+                self.subgraph_indices.set(self._key(subgraph), idx)
+                self.pair_subgraphs.add(idx)
+
+                success = True
+
+        return success, old_subgraph, old_pattern
+
+
+    def replace(self, old_subgraph, new_subgraph, pattern=-1):
+        """
+        Replaces old_subgraph with new_subgraph in the reservoir.
+
+        Returns the pattern id that was stored for old_subgraph.
+        """
+
+        # keep track of the index where this operation is happening
+        old_key = self._key(old_subgraph)
+        new_key = self._key(new_subgraph)
+
+        idx = self.subgraph_indices.get(old_key)
+        old_pattern = int(self.patterns[idx])
+
+        # only change the indexes if the vertices change, and
+        # unindex the slot while it still holds the old vertices
+        if old_key != new_key:
+            self.subgraph_indices.delete(old_key)
+            self.pair_subgraphs.remove(idx)
+
+        self._store(idx, new_subgraph, pattern)
+
+        if old_key != new_key:
+            self.subgraph_indices.set(new_key, idx)
+            self.pair_subgraphs.add(idx)
+
+        return old_pattern
+
+
+    def remove(self, subgraph):
+        """
+        Removes a subgraph from the reservoir.
+
+        The last slot of the reservoir is moved into the freed slot.
+        Returns the pattern id that was stored for the subgraph.
+        """
+        key = self._key(subgraph)
+
+        idx = self.subgraph_indices.get(key)
+        pattern = int(self.patterns[idx])
+
+        self.subgraph_indices.delete(key)
+        self.pair_subgraphs.remove(idx)
+
+        last = self.size - 1
+
+        if idx != last:
+            last_key = self._slot_key(last)
+            self.pair_subgraphs.remove(last)
+
+            for array in [self.vertices, self.vertex_labels, self.edge_masks, self.edge_labels, self.patterns]:
+                array[idx] = array[last]
+
+            # the table entry of the moved slot is found through the key
+            # that the last slot still holds
+            self.subgraph_indices.set(last_key, idx)
+            self.pair_subgraphs.add(idx)
+
+        self.size -= 1
+
+        return pattern
+
+
+    def get_common_subgraphs(self, u, v):
+        """Get all subgraphs from the reservoir that contain the edge (u, v)."""
+        u, v = u.node_id, v.node_id
+        pair = (u, v) if u < v else (v, u)
+        return [self.subgraph(idx) for idx in self.pair_subgraphs.slots(pair)]
+
+
+    def get_pattern(self, subgraph):
+        """Get the cached pattern id of a subgraph in the reservoir."""
+        return int(self.patterns[self.subgraph_indices.get(self._key(subgraph))])
+
+
+    def set_pattern(self, subgraph, pattern):
+        """Cache the pattern id of a subgraph in the reservoir."""
+        self.patterns[self.subgraph_indices.get(self._key(subgraph))] = pattern
+
+
+    def random(self, N=float('-inf')):
+        """
+        Get a subgraph (or None) from the reservoir uniformly at random.
+
+        Returns a subgraph from the reservoir uniformly at random. If value of
+        parameter N exceeds the size of the reservoir M, we return a subgraph
+        with probability M/N and otherwise return None. If N < M, the method
+        always returns a random subgraph from the reservoir.
+
+        :param N: population size N used to pick a subgraph at propability M/N
+        :type N: int, float
+        """
+
+        size = len(self)
+        idx = self.rng.randrange(size if size > N else N)
+
+        if idx < size:
+            return self.subgraph(idx)
+        else:
+            return None
+
+
+    def subgraph(self, idx):
+        """Materialize the subgraph stored in slot idx."""
+        ids = self.vertices[idx].tolist()
+        labels = self.vertex_labels[idx].tolist()
+        e_labels = self.edge_labels[idx].tolist()
+
+        nodes = tuple(Node(u, l) for u, l in zip(ids, labels))
+        edges = tuple(SubgraphEdge(ids[i], ids[j], q) for (i, j), q in zip(self.pairs, e_labels) if q)
+
+        return Subgraph(nodes, edges)
+
+
+    def _store(self, idx, subgraph, pattern):
+        nodes, edges = subgraph
+        index = {u: i for i, (u, _) in enumerate(nodes)}
+
+        e_labels = [0] * len(self.pairs)
+        mask = 0
+
+        for u, v, label in edges:
+            i, j = index[u], index[v]
+            if j < i: i, j = j, i
+            position = pair_position(self.k, i, j)
+            e_labels[position] = label
+            mask |= 1 << position
+
+        self.vertices[idx] = [u for u, _ in nodes]
+        self.vertex_labels[idx] = [l for _, l in nodes]
+        self.edge_masks[idx] = mask
+        self.edge_labels[idx] = e_labels
+        self.patterns[idx] = pattern
+
+
+    def _key(self, subgraph):
+        return tuple(u for u, _ in subgraph.nodes)
+
+
+    def _slot_key(self, idx):
+        return tuple(self.vertices[idx].tolist())
+
+
+    def _slot_pair(self, idx, p):
+        i, j = self.pairs[p]
+        ids = self.vertices[idx]
+        return int(ids[i]), int(ids[j])
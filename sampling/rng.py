@@ -0,0 +1,58 @@
+import numpy as np
+
+
+class BufferedRNG:
+    """
+    Random number stream that draws from a NumPy Generator in blocks.
+
+    Uniform and integer variates are prefetched block_size at a time and
+    served from Python lists, which avoids the overhead of a NumPy call per
+    scalar draw. The methods follow the names of the random module, so the
+    sampling routines accept either one as their source of randomness.
+    """
+
+    def __init__(self, seed=None, block_size=4096):
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+
+        self._uniforms = []
+        self._integers = []
+
+
+    def random(self):
+        """Uniform variate on [0, 1)."""
+        if not self._uniforms:
+            self._uniforms = self.generator.random(self.block_size).tolist()
+
+        return self._uniforms.pop()
+
+
+    def randrange(self, n):
+        """Uniform integer on [0, n)."""
+        if not self._integers:
+            block = self.generator.integers(0, 2**64, size=self.block_size, dtype=np.uint64)
+            self._integers = block.tolist()
+
+        # multiply-shift maps a 64-bit integer onto [0, n) with
+        # a bias of at most n / 2^64 for each value
+        return (self._integers.pop() * int(n)) >> 64
+
+
+    def sample(self, population, k):
+        """Choose k unique elements from a sequence with Floyd's algorithm."""
+        n = len(population)
+
+        if not 0 <= k <= n:
+            raise ValueError("sample larger than population or is negative")
+
+        selected = set()
+        result = []
+
+        for j in range(n - k, n):
+            i = self.randrange(j + 1)
+            if i in selected:
+                i = j
+            selected.add(i)
+            result.append(population[i])
+
+        return result
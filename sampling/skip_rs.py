@@ -1,4 +1,5 @@
-import numpy as np
+import math
+import random
 
 # magic number used by Vitter in determining when to use
 # Algorithm X over Algorithm Z
@@ -8,62 +9,116 @@ class SkipRS:
     w = None
     n = None
 
-    def __init__(self, n):
+    def __init__(self, n, rng=random):
         self.n = float(n)
-        self.w = np.exp(-np.log(np.random.rand()) / n)
+        self.rng = rng
+        self.w = math.exp(-math.log(_uniform(rng)) / n)
 
 
     def apply(self, t):
         if self.is_threshold_reached(t):
-            S, W = algorithm_z(t, self.n, self.w)
+            S, W = algorithm_z(t, self.n, self.w, rng=self.rng)
             self.w = W
             return S
         else:
-            return algorithm_x(t, self.n)
+            return algorithm_x(t, self.n, rng=self.rng)
+
+
+    def inclusions(self, t, s, W):
+        """
+        Counts the records included in the sample among the next W records.
+
+        The record at offset s is the next one to be included, and t is the
+        number of records seen up to and including the last inclusion. Only
+        one skip is drawn per included record, so the cost does not depend
+        on the number of records W.
+
+        :param t: The number of records seen
+        :param s: The offset of the next included record
+        :param W: The number of new records
+        :type t: int
+        :type s: int
+        :type W: int
+        :returns: the number of included records I and the updated t and s
+        :rtype: (int, int, int)
+        """
+        I = 0
+
+        while s < W:
+            I += 1
+            S = self.apply(t)
+            t += S + 1
+            s += S + 1
+
+        return I, t, s
 
 
     def is_threshold_reached(self, t):
         return t > UPPERCASE_T * self.n
 
 
-def algorithm_x(t, n):
+def algorithm_x(t, n, rng=random):
     """
     Calculates the number of records to skip using Vitter's Algorithm X.
 
+    Algorithm X walks the records one at a time until the probability
+    that all of them are skipped,
+
+        q(S) = ((t+1-n) ... (t+S+1-n)) / ((t+1) ... (t+S+1)),
+
+    drops to a uniform random variate V. Instead of walking, we evaluate
+    log q(S) in closed form with log-gamma functions and find the smallest
+    S with q(S) <= V by galloping and bisection in O(log S) steps.
+
     :param t: The number of records seen
     :param n: The size of the sample
+    :param rng: The source of uniform random variates
     :type t: int
     :type n: float
+    :type rng: BufferedRNG, random
     :returns: S, the number of records to skip
     :rtype: int
     """
-    V = np.random.rand()
-    S = 0
-    t = t + 1
+    log_V = math.log(_uniform(rng))
 
     # num = t - n always in Vitter's pseudocode
     # as Algorithm X is only used to process
     # records in the interval [n, T*n] sequentially
-    quot = (t - n) / float(t)
+    base = math.lgamma(t + 1) - math.lgamma(t + 1 - n)
+
+    def log_q(S):
+        return base + math.lgamma(t + S + 2 - n) - math.lgamma(t + S + 2)
+
+    if log_q(0) <= log_V:
+        return 0
 
-    while quot > V:
-        S = S + 1
-        t = t + 1
-        quot = quot * ((t - n) / float(t))
+    # gallop to an upper bound, log_q(lo) > log_V >= log_q(hi)
+    lo, hi = 0, 1
+    while log_q(hi) > log_V:
+        lo, hi = hi, 2 * hi
 
-    return S
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if log_q(mid) > log_V:
+            lo = mid
+        else:
+            hi = mid
+
+    return hi
 
 
-def algorithm_z(t, n, w):
+def algorithm_z(t, n, w, rng=random):
     """
     Calculates the number of records to be skipped with Vitter's Algorithm Z.
 
     :param t: The number of records seen
     :param n: The size of the sample
     :param w: The initial state of the random variable W
+    :param rng: The source of uniform random variates
     :type t: int
     :type n: float
     :type w: float
+    :type rng: BufferedRNG, random
     :returns: the number of records to skip S and a new value for W
     :rtype: (int, float)
     """
@@ -73,13 +128,13 @@ def algorithm_z(t, n, w):
     term = t - n + 1
 
     while True:
-        U = np.random.rand()
+        U = _uniform(rng)
         X = t * (W - 1.)
         S = int(X)
 
         # Test in U <= h(S)/cg(X) in the manner of (6.3)
         tmp = (t + 1) / term
-        lhs = np.exp(np.log(((U * tmp * tmp) * (term + S)) / float(t + X)) / n)
+        lhs = math.exp(math.log(((U * tmp * tmp) * (term + S)) / float(t + X)) / n)
         rhs = (((t + X) / (term + S)) * term) / float(t)
 
         if lhs <= rhs:
@@ -101,9 +156,14 @@ def algorithm_z(t, n, w):
             denom = denom - 1
 
         # generate W in advance 
-        W = np.exp(-np.log(np.random.rand()) / n)
+        W = math.exp(-math.log(_uniform(rng)) / n)
 
-        if np.exp(np.log(y) / n) <= (t + X) / float(t):
+        if math.exp(math.log(y) / n) <= (t + X) / float(t):
             break
 
     return S, W
+
+
+def _uniform(rng):
+    # uniform variate on (0, 1], safe to take the logarithm of
+    return 1.0 - rng.random()
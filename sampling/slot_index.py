@@ -0,0 +1,193 @@
+import numpy as np
+
+
+def table_capacity(n_keys):
+    """Smallest power of two that is at most half full with n_keys keys."""
+    capacity = 8
+    while capacity < 2 * n_keys:
+        capacity <<= 1
+    return capacity
+
+
+class SlotTable:
+    """
+    Open addressing hash table from keys to slots.
+
+    The table is an int32 array of slots probed linearly from the hash of a
+    key, with -1 marking empty entries. The keys themselves are not stored,
+    key_of(slot) reads the key of a slot back from the arrays of its owner,
+    so a table entry costs four bytes. Deleting a key shifts the following
+    entries of its probe sequence back, which leaves no tombstones behind.
+    """
+
+    def __init__(self, n_keys, key_of):
+        """
+        Initialize a new slot table.
+
+        :param n_keys: The maximum number of keys in the table.
+        :param key_of: Function that returns the key stored at a slot.
+        :type n_keys: int
+        """
+        capacity = table_capacity(n_keys)
+
+        self.table = np.full(capacity, -1, dtype=np.int32)
+        self.mask = capacity - 1
+        self.key_of = key_of
+
+
+    def find(self, key):
+        """
+        Probe for key.
+
+        Returns the table position and slot of key, or the position of the
+        empty entry where the key would be inserted and -1.
+        """
+        table, mask, key_of = self.table, self.mask, self.key_of
+        i = hash(key) & mask
+
+        while True:
+            slot = int(table[i])
+
+            if slot < 0 or key_of(slot) == key:
+                return i, slot
+
+            i = (i + 1) & mask
+
+
+    def get(self, key):
+        """Get the slot of key, or -1 if it is not in the table."""
+        return self.find(key)[1]
+
+
+    def set(self, key, slot):
+        """Map key to slot."""
+        i, _ = self.find(key)
+        self.table[i] = slot
+
+
+    def delete(self, key):
+        """Remove key, which must be in the table."""
+        i, slot = self.find(key)
+
+        if slot < 0:
+            raise KeyError(key)
+
+        self.clear(i)
+
+
+    def clear(self, i):
+        """Empty table position i, moving back the entries probed past it."""
+        table, mask, key_of = self.table, self.mask, self.key_of
+        j = i
+
+        while True:
+            j = (j + 1) & mask
+            slot = int(table[j])
+
+            if slot < 0:
+                break
+
+            # the entry at j can fill the hole at i unless its
+            # home position lies cyclically in between (i, j]
+            home = hash(key_of(slot)) & mask
+
+            if (j - home) & mask >= (j - i) & mask:
+                table[i] = slot
+                i = j
+
+        table[i] = -1
+
+
+    def nbytes(self):
+        """Number of bytes taken by the table."""
+        return self.table.nbytes
+
+
+class PairIndex:
+    """
+    Slots by the node pairs they contain, in chained int32 arrays.
+
+    Entry e = slot * n_pairs + p stands for the p-th node pair of a slot,
+    which pair_of(slot, p) reads back from the arrays of the owner. A
+    SlotTable maps each node pair to the first entry of its chain, and the
+    entries of a chain are linked both ways through the next and prev
+    arrays, so a slot joins or leaves a chain in constant time. Slots must
+    be added after and removed before their pairs change.
+    """
+
+    def __init__(self, n_slots, n_pairs, pair_of):
+        """
+        Initialize a new pair index.
+
+        :param n_slots: The number of slots.
+        :param n_pairs: The number of node pairs of each slot.
+        :param pair_of: Function that returns the p-th node pair of a slot.
+        :type n_slots: int
+        :type n_pairs: int
+        """
+        self.n_pairs = n_pairs
+        self.pair_of = pair_of
+
+        self.heads = SlotTable(n_slots * n_pairs, lambda e: pair_of(*divmod(e, n_pairs)))
+        self.next = np.full(n_slots * n_pairs, -1, dtype=np.int32)
+        self.prev = np.full(n_slots * n_pairs, -1, dtype=np.int32)
+
+
+    def add(self, slot):
+        """Add slot to the chains of its node pairs."""
+        table, next_, prev = self.heads.table, self.next, self.prev
+
+        for p in range(self.n_pairs):
+            e = slot * self.n_pairs + p
+            i, head = self.heads.find(self.pair_of(slot, p))
+
+            # the slot becomes the head of the chain
+            next_[e] = head
+            prev[e] = -1
+
+            if head >= 0:
+                prev[head] = e
+
+            table[i] = e
+
+
+    def remove(self, slot):
+        """Remove slot from the chains of its node pairs."""
+        table, next_, prev = self.heads.table, self.next, self.prev
+
+        for p in range(self.n_pairs):
+            e = slot * self.n_pairs + p
+            before, after = int(prev[e]), int(next_[e])
+
+            if after >= 0:
+                prev[after] = before
+
+            if before >= 0:
+                next_[before] = after
+                continue
+
+            # the slot was the head of the chain
+            i, _ = self.heads.find(self.pair_of(slot, p))
+
+            if after >= 0:
+                table[i] = after
+            else:
+                self.heads.clear(i)
+
+
+    def slots(self, pair):
+        """Get the slots that contain the node pair."""
+        next_, n_pairs = self.next, self.n_pairs
+        e = self.heads.get(pair)
+
+        slots = []
+        while e >= 0:
+            slots.append(e // n_pairs)
+            e = int(next_[e])
+
+        return slots
+
+
+    def nbytes(self):
+        """Number of bytes taken by the table and the chains."""
+        return self.heads.nbytes() + self.next.nbytes + self.prev.nbytes
@@ -1,22 +1,31 @@
-import numpy as np
+from itertools import combinations
 
-from collections import defaultdict
+from .rng import BufferedRNG
+from .slot_index import PairIndex
 
 class SubgraphReservoir:
     subgraphs = None
-    vertex_subgraphs = None
+    patterns = None
+    pair_subgraphs = None
 
-    def __init__(self, size):
+    def __init__(self, size, rng=None):
         """
         Initialize a new subgraph reservoir.
 
         :param size: The maximum size of the reservoir.
+        :param rng: The random number stream used to pick subgraphs.
         :type size: int
         """
         self.max_size = size
+        self.rng = rng if rng is not None else BufferedRNG()
         self.subgraphs = []
+        self.patterns = []
         self.subgraph_indices = {}
-        self.vertex_subgraphs = defaultdict(set)
+
+        # the pair index is sized by the number of nodes of the subgraphs,
+        # so it is created when the first subgraph is added
+        self.pairs = None
+        self.pair_subgraphs = None
 
 
     def __contains__(self, subgraph):
@@ -32,11 +41,17 @@ class SubgraphReservoir:
         return len(self) >= self.max_size
 
 
-    def add(self, subgraph, N=float('-inf')):
-        """Tries to add a subgraph to the resevoir."""
+    def add(self, subgraph, N=float('-inf'), pattern=-1):
+        """
+        Tries to add a subgraph to the resevoir.
+
+        Returns whether the subgraph was added, and the subgraph it replaced
+        along with its pattern id, or None and -1 if nothing was replaced.
+        """
 
         success = False
         old_subgraph = None
+        old_pattern = -1
 
         if subgraph not in self:
 
@@ -45,51 +60,115 @@ class SubgraphReservoir:
                 old_subgraph = self.random(N=N)
 
                 if old_subgraph:
-                    self.replace(old_subgraph, subgraph)
+                    old_pattern = self.replace(old_subgraph, subgraph, pattern=pattern)
                     success = True
 
             else:
                 # the reservoir is not full, so we add the new subgraph
                 idx = len(self)
                 self.subgraphs.append(subgraph)
+                self.patterns.append(pattern)
 
                 self.subgraph_indices[subgraph] = idx
-
-                for u in subgraph.nodes:
-                    self.vertex_subgraphs[u].add(idx)
+                self._pair_index(len(subgraph.nodes)).add(idx)
 
                 success = True
 
-        return success, old_subgraph
+        return success, old_subgraph, old_pattern
+
 
+    def replace(self, old_subgraph, new_subgraph, pattern=-1):
+        """
+        Replaces old_subgraph with new_subgraph in the reservoir.
 
-    def replace(self, old_subgraph, new_subgraph):
-        """Replaces old_subgraph with new_subgraph in the reservoir."""
+        Returns the pattern id that was stored for old_subgraph.
+        """
 
         # keep track of the index where this operation is happening
         idx = self.subgraph_indices[old_subgraph]
 
+        # change the subgraphs by vertex pair mapping only if the vertices
+        # change, and unindex the slot while it still holds the old subgraph
+        new_nodes = old_subgraph.nodes != new_subgraph.nodes
+
+        if new_nodes:
+            self.pair_subgraphs.remove(idx)
+
         # replace the old subgraph with new_subgraph in the data structures
         del self.subgraph_indices[old_subgraph]
         self.subgraphs[idx] = new_subgraph
+        old_pattern = self.patterns[idx]
+        self.patterns[idx] = pattern
         self.subgraph_indices[new_subgraph] = idx
 
-        # change the subgraphs by vertex mapping
-        # only change mapping for vertices if necessary
-        old_nodes = set(old_subgraph.nodes)
-        new_nodes = set(new_subgraph.nodes)
+        if new_nodes:
+            self.pair_subgraphs.add(idx)
+
+        return old_pattern
+
+
+    def remove(self, subgraph):
+        """
+        Removes a subgraph from the reservoir.
+
+        The last subgraph of the reservoir is moved into the freed position.
+        Returns the pattern id that was stored for the subgraph.
+        """
+        idx = self.subgraph_indices.pop(subgraph)
+        pattern = self.patterns[idx]
 
-        for u in new_nodes - old_nodes:
-            self.vertex_subgraphs[u].add(idx)
+        self.pair_subgraphs.remove(idx)
 
-        for v in old_nodes - new_nodes:
-            self.vertex_subgraphs[v].remove(idx)
+        last = len(self) - 1
+
+        if idx != last:
+            moved = self.subgraphs[last]
+            self.pair_subgraphs.remove(last)
+
+            self.subgraphs[idx] = moved
+            self.patterns[idx] = self.patterns[last]
+            self.subgraph_indices[moved] = idx
+
+            self.pair_subgraphs.add(idx)
+
+        self.subgraphs.pop()
+        self.patterns.pop()
+
+        return pattern
+
+
+    def _pair_index(self, k):
+        if self.pair_subgraphs is None:
+            self.pairs = list(combinations(range(k), 2))
+            self.pair_subgraphs = PairIndex(self.max_size, len(self.pairs), self._slot_pair)
+
+        return self.pair_subgraphs
+
+
+    def _slot_pair(self, idx, p):
+        # nodes are sorted, so the pairs are sorted as well
+        i, j = self.pairs[p]
+        nodes = self.subgraphs[idx].nodes
+        return nodes[i], nodes[j]
 
 
     def get_common_subgraphs(self, u, v):
         """Get all subgraphs from the reservoir that contain the edge (u, v)."""
-        common_indices = self.vertex_subgraphs[u] & self.vertex_subgraphs[v]
-        return [self.subgraphs[idx] for idx in common_indices]
+        if self.pair_subgraphs is None:
+            return []
+
+        pair = (u, v) if u < v else (v, u)
+        return [self.subgraphs[idx] for idx in self.pair_subgraphs.slots(pair)]
+
+
+    def get_pattern(self, subgraph):
+        """Get the cached pattern id of a subgraph in the reservoir."""
+        return self.patterns[self.subgraph_indices[subgraph]]
+
+
+    def set_pattern(self, subgraph, pattern):
+        """Cache the pattern id of a subgraph in the reservoir."""
+        self.patterns[self.subgraph_indices[subgraph]] = pattern
 
 
     def random(self, N=float('-inf')):
@@ -106,7 +185,7 @@ class SubgraphReservoir:
         """
 
         size = len(self)
-        idx = np.random.randint(size if size > N else N)
+        idx = self.rng.randrange(size if size > N else N)
 
         if idx < size:
             return self.subgraphs[idx]
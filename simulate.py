@@ -6,43 +6,152 @@ import uuid
 import numpy as np
 
 from collections import defaultdict
+from itertools import zip_longest
 from argparse import ArgumentParser, FileType
+from concurrent.futures import ProcessPoolExecutor
 
-from graph.util import make_edge
+from graph.edge_array import read_edge_file, to_edges, iter_edges, SharedEdgeArray
+
+from subgraph.pattern import decode_label
+from subgraph.lookup import TABLE_SIZES, canonical_label_func
 
 from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
 from algorithms.fsm.incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
 from algorithms.fsm.incremental.optimized_reservoir import IncerementalOptimizedReservoirAlgorithm
+from algorithms.fsm.incremental.edge_sample import IncrementalEdgeSampleAlgorithm
+from algorithms.fsm.dynamic.exact_counting import DynamicExactCountingAlgorithm
+from algorithms.fsm.dynamic.naive_reservoir import DynamicNaiveReservoirAlgorithm
+from algorithms.fsm.window import SlidingWindow
 
 ALGORITHMS = {
 
     'incremental': {
         'exact': IncrementalExactCountingAlgorithm,
         'naive': IncrementalNaiveReservoirAlgorithm,
-        'optimal': IncerementalOptimizedReservoirAlgorithm
+        'optimal': IncerementalOptimizedReservoirAlgorithm,
+        'triest': IncrementalEdgeSampleAlgorithm
     },
 
     'dynamic': {
-        'exact': None,
-        'naive': None,
-        'optimal': None
+        'exact': DynamicExactCountingAlgorithm,
+        'naive': DynamicNaiveReservoirAlgorithm,
+        'optimal': None,
+        'triest': None
     }
 
 }
 
-def run_simulation(simulator, edges):
-    np.random.shuffle(edges)
+def format_label(c_label, k):
+    """Format an integer canonical label as its dash-separated labels."""
+    v_labels, e_labels = decode_label(c_label, k)
+    return '-'.join(str(x) for x in v_labels + e_labels)
+
+
+def run_simulation(simulator, edges, timed=False, delete_every=None,
+                   batch_size=None, rng=None):
+    """
+    Stream the edges of an edge array to the simulator.
+
+    Unless timed is set, the edges are streamed in the order of a random
+    permutation of their indices, otherwise in the order of the array along
+    with their timestamps. The array itself is never reordered, so it can
+    be shared by the runs. If delete_every is set, every delete_every-th
+    addition is followed by the removal of an edge picked uniformly at
+    random from the graph. If batch_size is set, the edges are added in
+    batches of that size instead. The order and the removals are drawn from
+    the NumPy Generator rng.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if timed:
+        order = np.arange(len(edges))
+    else:
+        order = rng.permutation(len(edges))
+
+    if batch_size:
+        start_time = time.time()
+
+        for i in range(0, len(order), batch_size):
+            simulator.add_edges(to_edges(edges[order[i:i + batch_size]]))
+
+        return time.time() - start_time
+
+    present = []
 
     start_time = time.time()
 
-    for edge in edges:
-        simulator.add_edge(edge)
+    for i, (edge, row) in enumerate(iter_edges(edges, order)):
+        timestamp = row[5:] if timed else ()
+
+        if simulator.add_edge(edge, *timestamp) and delete_every:
+            present.append(edge)
+
+        if delete_every and (i + 1) % delete_every == 0 and present:
+            j = int(rng.integers(len(present)))
+            present[j], present[-1] = present[-1], present[j]
+            simulator.remove_edge(present.pop())
 
     end_time = time.time()
 
     return end_time - start_time
 
 
+# the edge array of the simulations run by a worker process
+_stream = None
+
+
+def init_worker(edges):
+    """
+    Keep the edge array in the worker process for all of its runs.
+
+    edges is either an edge array or the handle of a SharedEdgeArray, which
+    the worker attaches to without copying the edges.
+    """
+    global _stream
+
+    if isinstance(edges, tuple):
+        _stream = SharedEdgeArray.attach(*edges)
+    else:
+        _stream = edges
+
+
+def run_worker(config, seed):
+    """
+    Run one simulation on the edge array of the worker process.
+
+    The seed, a SeedSequence, determines the order of the stream and the
+    random stream of the algorithm. Returns the duration of the run, its
+    metrics, its pattern counts and the summaries of aggregated metrics.
+    """
+    edges = _stream.array if isinstance(_stream, SharedEdgeArray) else _stream
+
+    # child seeds for the stream order and the algorithm, derived without
+    # changing the spawn counter of seed, so a seed always gives the same run
+    run_seed, algorithm_seed = [np.random.SeedSequence(seed.entropy,
+        spawn_key=seed.spawn_key + (i,)) for i in range(2)]
+
+    simulator = config['Algorithm'](seed=algorithm_seed, **config['algorithm_args'])
+
+    if config['window_size'] is not None or config['window_duration'] is not None:
+        simulator = SlidingWindow(simulator,
+            size=config['window_size'], duration=config['window_duration'])
+
+    # timestamps are only used by windows with a duration
+    duration = run_simulation(simulator, edges,
+        timed=config['window_duration'] is not None,
+        delete_every=config['delete_every'], batch_size=config['batch_size'],
+        rng=np.random.default_rng(run_seed))
+
+    metrics = {name: simulator.metrics.array(name) for name in simulator.metrics}
+
+    summaries = None
+    if config['aggregate_every']:
+        summaries = {name: simulator.metrics.summary(name) for name in simulator.metrics}
+
+    return duration, metrics, +simulator.patterns, summaries
+
+
 def main():
     parser = ArgumentParser(description="Run FSM on an evolving graph.")
 
@@ -55,8 +164,8 @@ def main():
         help="choose between incremental or fully dynamic stream setting")
 
     parser.add_argument('algorithm',
-        choices=['exact', 'naive', 'optimal'],
-        help="choose exact counting, or naive or optimised reservoir sampling")
+        choices=['exact', 'naive', 'optimal', 'triest'],
+        help="choose exact counting, naive or optimised reservoir sampling, or estimation from an edge sample")
 
     parser.add_argument('edge_file',
         type=FileType('r'),
@@ -68,13 +177,109 @@ def main():
     parser.add_argument('-m',
         dest='M',
         type=int,
-        help="reservoir size required for naive and optimal algorithms")
+        help="reservoir size required for naive and optimal algorithms, edge sample size for triest")
 
     parser.add_argument('-t', '--times',
         type=int,
         default=10,
         help="number of times the simulation is run in this instance")
 
+    parser.add_argument('--label-table',
+        dest='label_table',
+        help="use a canonical label lookup table stored in this file, "
+             "which is enumerated first if it does not exist (k = 3 or 4)")
+
+    parser.add_argument('--label-backend',
+        dest='label_backend',
+        choices=['permutation', 'refinement'],
+        help="canonical labeling backend (default depends on k), the backends "
+             "label some patterns differently, so compare runs of one backend only")
+
+    parser.add_argument('--label-cache',
+        dest='label_cache_size',
+        type=int,
+        default=65536,
+        help="number of canonical labels kept in the LRU cache (default 65536)")
+
+    parser.add_argument('--compact-reservoir',
+        dest='compact_reservoir',
+        action='store_true',
+        help="store the reservoir in preallocated arrays")
+
+    parser.add_argument('--compact-graph',
+        dest='compact_graph',
+        action='store_true',
+        help="store the graph with vertices interned to integer handles")
+
+    parser.add_argument('--sorted-adjacency',
+        dest='sorted_adjacency',
+        action='store_true',
+        help="keep the neighbors of high-degree nodes in sorted arrays")
+
+    parser.add_argument('--bitset-adjacency',
+        dest='bitset_adjacency',
+        action='store_true',
+        help="store each neighborhood as a bitset, for dense graphs")
+
+    parser.add_argument('--delta-counting',
+        dest='delta_counting',
+        action='store_true',
+        help="count k = 3 patterns from neighbor label histograms (exact only)")
+
+    parser.add_argument('--distinct-stream',
+        dest='distinct_stream',
+        action='store_true',
+        help="assume the stream repeats no edge, so triest keeps only its M sampled "
+             "edges; otherwise it also keeps every node pair of the stream to skip "
+             "repeated edges, which takes memory linear in the stream (triest only)")
+
+    parser.add_argument('--delete-every',
+        dest='delete_every',
+        type=int,
+        default=10,
+        help="remove a random edge after every n additions (dynamic only, default 10)")
+
+    parser.add_argument('--batch-size',
+        dest='batch_size',
+        type=int,
+        help="add the edges in batches of this size, with one metrics row per batch (incremental only)")
+
+    parser.add_argument('--instrumentation',
+        choices=['off', 'sampled', 'full'],
+        default='full',
+        help="record the metrics of every edge, of every nth edge or of none (default full)")
+
+    parser.add_argument('--sample-every',
+        dest='sample_every',
+        type=int,
+        default=100,
+        help="record the metrics of every nth edge with sampled instrumentation (default 100)")
+
+    parser.add_argument('--aggregate',
+        dest='aggregate_every',
+        type=int,
+        help="keep the metrics in fixed-size summaries, writing the mean of every n values "
+             "and a summary file with quantiles instead of one row per edge")
+
+    parser.add_argument('--window-size',
+        dest='window_size',
+        type=int,
+        help="mine only the last n edges of the stream (dynamic only)")
+
+    parser.add_argument('--window-duration',
+        dest='window_duration',
+        type=float,
+        help="mine only the edges of the last t time units, needs a timestamp column (dynamic only)")
+
+    parser.add_argument('--workers',
+        type=int,
+        default=1,
+        help="number of processes running the simulations in parallel (default 1)")
+
+    parser.add_argument('--seed',
+        type=int,
+        help="seed for the runs, each run gets its own seed derived from it")
+
     args = vars(parser.parse_args())
 
     k = args['k']
@@ -82,6 +287,28 @@ def main():
     stream = args['stream_setting']
     M = args['M']
     times = args['times']
+    label_table = args['label_table']
+    label_backend = args['label_backend']
+    label_cache_size = args['label_cache_size']
+    compact_reservoir = args['compact_reservoir']
+    compact_graph = args['compact_graph']
+    sorted_adjacency = args['sorted_adjacency']
+    bitset_adjacency = args['bitset_adjacency']
+    delta_counting = args['delta_counting']
+    distinct_stream = args['distinct_stream']
+    batch_size = args['batch_size']
+    instrumentation = args['instrumentation']
+    sample_every = args['sample_every']
+    aggregate_every = args['aggregate_every']
+    window_size = args['window_size']
+    window_duration = args['window_duration']
+    windowed = window_size is not None or window_duration is not None
+
+    # in a window, edges only leave the graph when they expire
+    delete_every = args['delete_every'] if stream == 'dynamic' and not windowed else None
+
+    workers = args['workers']
+    seed = args['seed']
 
     in_file = args['edge_file']
     output_dir = args['output_dir']
@@ -93,13 +320,20 @@ def main():
     print("algorithm:     ", algo)
     print("k:             ", k)
     print("M:             ", M)
+    if delete_every:
+        print("delete every:  ", delete_every)
+    if window_size:
+        print("window size:   ", window_size)
+    if window_duration:
+        print("window time:   ", window_duration)
     print("times:         ", times)
+    print("workers:       ", workers)
     print("input graph:   ", in_file.name, "\n")
 
 
     Algorithm = ALGORITHMS[stream][algo]
 
-    if (algo in ['naive', 'optimal']) and (M == None):
+    if (algo in ['naive', 'optimal', 'triest']) and (M == None):
         msg = "the reservoir size must be defined for %s algorithm" % (algo)
         raise ValueError(msg)
 
@@ -107,33 +341,92 @@ def main():
         msg = "%s algorithm is not available for %s stream setting" % (algo, stream)
         raise NotImplementedError(msg)
 
+    if windowed and stream != 'dynamic':
+        raise ValueError("a sliding window requires the dynamic stream setting")
+
+    if batch_size and stream != 'incremental':
+        raise ValueError("batches of edges require the incremental stream setting")
 
-    # read the input graph from the edge file
+
+    # read the input graph from the edge file into a structured array,
+    # with an optional sixth column holding the arrival time of each edge
     with in_file as edge_file:
-        edge_reader = csv.reader(edge_file, delimiter=' ')
-        edges = [make_edge(*tuple(int(x) for x in row)) for row in edge_reader]
+        edges = read_edge_file(edge_file)
+
+    if window_duration is not None and 'timestamp' not in edges.dtype.names:
+        raise ValueError("a window with a duration requires a timestamp column")
+
+    # the label counts determine the size of the label lookup tables
+    L = int(max(edges['u_label'].max(), edges['v_label'].max()))
+    Q = int(edges['label'].max())
+
+    if label_table and k in TABLE_SIZES:
+        # the table is loaded or enumerated once, the runs share it
+        print("Preparing the label table", label_table, "\n")
+        canonical_label_func(k, L, Q, path=label_table, backend=label_backend).build()
 
 
     # run simulations and collect the duration and metrics from each run
     durations = []
     run_metrics = defaultdict(list)
     run_patterns = []
+    run_summaries = []
+
+    config = {
+        'Algorithm': Algorithm,
+        'algorithm_args': dict(k=k, M=M, L=L, Q=Q, label_table=label_table,
+            label_backend=label_backend, label_cache_size=label_cache_size,
+            compact_reservoir=compact_reservoir, compact_graph=compact_graph,
+            sorted_adjacency=sorted_adjacency, bitset_adjacency=bitset_adjacency,
+            delta_counting=delta_counting, distinct_stream=distinct_stream,
+            instrumentation=instrumentation,
+            sample_every=sample_every, aggregate_every=aggregate_every),
+        'window_size': window_size,
+        'window_duration': window_duration,
+        'delete_every': delete_every,
+        'batch_size': batch_size,
+        'aggregate_every': aggregate_every
+    }
+
+    # every run gets its own independent seed
+    seeds = np.random.SeedSequence(seed).spawn(times)
 
     print("SIMULATIONS", "\n")
 
-    for i in range(times):
-        print("Running simulation", i + 1, "...")
+    shared = None
+    executor = None
+
+    try:
+        if workers > 1:
+            # the edge array is copied into shared memory once, the workers
+            # attach to it and the results come back in the order of the runs
+            shared = SharedEdgeArray.create(edges)
+            executor = ProcessPoolExecutor(max_workers=workers,
+                initializer=init_worker, initargs=(shared.handle(),))
+            results = executor.map(run_worker, [config] * times, seeds)
+        else:
+            init_worker(edges)
+            results = map(run_worker, [config] * times, seeds)
+
+        for i, (duration, metrics, patterns, summaries) in enumerate(results):
+            print("Simulation", i + 1, "took", duration, "seconds.")
 
-        simulator = Algorithm(k=k, M=M)
-        duration = run_simulation(simulator, edges)
+            durations.append(duration)
+            for name, values in metrics.items():
+                run_metrics[name].append(values)
 
-        print("Done, run took", duration, "seconds.", "\n")
+            run_patterns.append(patterns)
 
-        durations.append(duration)
-        for name, values in simulator.metrics.items():
-            run_metrics[name].append(values)
+            if summaries is not None:
+                run_summaries.append(summaries)
+    finally:
+        if executor is not None:
+            executor.shutdown()
 
-        run_patterns.append(+simulator.patterns)
+        if shared is not None:
+            shared.close()
+
+    print()
 
     avg_duration = np.mean(durations)
 
@@ -162,12 +455,30 @@ def main():
 
         metrics_writer.writerow(metrics_headers)
 
-        for row_values in zip(*[run_metrics[name] for name in metrics_headers]):
-            metrics_writer.writerow([float(x) for x in row_values])
+        # the removal metrics of a dynamic stream have fewer rows
+        for row_values in zip_longest(*[run_metrics[name] for name in metrics_headers]):
+            metrics_writer.writerow(['' if x is None else float(x) for x in row_values])
 
         print("metrics file: ", metrics_file.name)
 
 
+    if aggregate_every:
+        summary_path = os.path.join(output_dir, "%s_summary.csv" % (identifier))
+        summary_headers = ["metric", "run", "count", "mean", "min", "max", "p50", "p99", "p999", "rolling_mean"]
+
+        with open(summary_path, 'w', encoding='utf-8') as summary_file:
+            summary_writer = csv.writer(summary_file, delimiter=' ')
+
+            summary_writer.writerow(summary_headers)
+
+            for i, summaries in enumerate(run_summaries):
+                for name in sorted(summaries):
+                    summary = summaries[name]
+                    summary_writer.writerow([name, i + 1] + [summary[x] for x in summary_headers[2:]])
+
+            print("summary file: ", summary_file.name)
+
+
     patterns_path = os.path.join(output_dir, "%s_patterns.csv" % (identifier))
     patterns_headers = ["canonical_label"] + ["count_%d" % (i + 1) for i in range(times)]
 
@@ -180,7 +491,7 @@ def main():
 
         for c_label in canonical_labels:
             counts = [p[c_label] for p in run_patterns]
-            patterns_writer.writerow([c_label, *counts])
+            patterns_writer.writerow([format_label(c_label, k), *counts])
 
         print("patterns file:", patterns_file.name)
 
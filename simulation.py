@@ -100,7 +100,7 @@ def main():
     nrs_reservoir_full = []
 
     for i in range(10):
-        sim = IncrementalNaiveReservoirAlgorithm(k=k, M=1529) #324938
+        sim = IncrementalNaiveReservoirAlgorithm(k=k, M=1529, seed=i) #324938
         duration = run_simulation(sim, graph)
 
         print("The simulation ran for", duration, "seconds.")
@@ -130,7 +130,7 @@ def main():
     ors_skip_thresh = []
 
     for i in range(10):
-        sim = IncerementalOptimizedReservoirAlgorithm(k=k, M=1529) #324938
+        sim = IncerementalOptimizedReservoirAlgorithm(k=k, M=1529, seed=i) #324938
         duration = run_simulation(sim, graph)
 
         print("The simulation ran for", duration, "seconds.")
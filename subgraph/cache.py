@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+from .util import structural_signature, structure_signature, structure_subgraph
+
+
+class LabelCache:
+    """
+    Bounded memoization cache in front of a canonical labeling function.
+
+    Labels are cached by the structural signature of the subgraph, which does
+    not depend on the vertex ids, so every subgraph with the same shape and
+    labels shares a cache entry. When the cache holds max_size entries, the
+    least recently used one is evicted. A max_size of None never evicts.
+    """
+
+    def __init__(self, label_func, max_size=65536):
+        self.label_func = label_func
+        self.max_size = max_size
+        self.labels = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+
+    def __call__(self, subgraph):
+        return self.label(subgraph)
+
+
+    def __len__(self):
+        return len(self.labels)
+
+
+    def label(self, subgraph):
+        """Get the canonical label of a subgraph from the cache."""
+        signature = structural_signature(subgraph)
+        c_label = self._get(signature)
+
+        if c_label is None:
+            c_label = self._put(signature, self.label_func(subgraph))
+
+        return c_label
+
+
+    def label_structure(self, structure):
+        """Get the canonical label of the subgraph described by a structure."""
+        signature = structure_signature(structure)
+        c_label = self._get(signature)
+
+        if c_label is None:
+            # the subgraph is only built when its label is not cached
+            c_label = self._put(signature, self.label_func(structure_subgraph(structure)))
+
+        return c_label
+
+
+    def _get(self, signature):
+        c_label = self.labels.get(signature)
+
+        if c_label is not None:
+            self.hits += 1
+            self.labels.move_to_end(signature)
+
+        return c_label
+
+
+    def _put(self, signature, c_label):
+        self.misses += 1
+        self.labels[signature] = c_label
+
+        if self.max_size is not None and len(self.labels) > self.max_size:
+            self.labels.popitem(last=False)
+
+        return c_label
+
+
+    def clear(self):
+        self.labels.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,208 @@
+import os
+import pickle
+
+from itertools import combinations, product
+
+from .subgraph import Subgraph, SubgraphEdge
+from .pattern import LABEL_BITS, canonical_label, canonical_label_backend
+from .util import structural_signature
+
+# subgraph sizes for which a complete lookup table is feasible
+TABLE_SIZES = (3, 4)
+
+# label tables of this process, by k, L, Q, path and backend
+_tables = {}
+
+
+class LabelTable:
+    """
+    Canonical label lookup table for k-node subgraphs.
+
+    The table maps the structural signature of connected subgraphs with
+    vertex labels [1,...,L] and edge labels [1,...,Q] to their canonical
+    labels, so that labeling a subgraph costs a single dictionary lookup.
+    On first use the table is loaded from path if that file exists, and is
+    empty otherwise. build() enumerates every signature up front and writes
+    the table to path. Signatures missing from the table are labeled with
+    label_func and added to the table, at most max_inserts of them.
+    """
+    table = None
+
+    def __init__(self, k, L, Q, path=None, label_func=canonical_label, max_inserts=65536):
+        self.k = k
+        self.L = L
+        self.Q = Q
+        self.path = path
+        self.label_func = label_func
+        self.max_inserts = max_inserts
+        self.inserts = 0
+
+
+    def __call__(self, subgraph):
+        return self.label(subgraph)
+
+
+    def __len__(self):
+        return len(self.table) if self.table is not None else 0
+
+
+    def label(self, subgraph):
+        """Look up the canonical label of a subgraph."""
+        if self.table is None:
+            if self.path and os.path.exists(self.path):
+                self.load(self.path)
+            else:
+                self.table = {}
+
+        signature = structural_signature(subgraph)
+        c_label = self.table.get(signature)
+
+        if c_label is None:
+            c_label = self.label_func(subgraph)
+
+            if self.inserts < self.max_inserts:
+                self.table[signature] = c_label
+                self.inserts += 1
+
+        return c_label
+
+
+    def build(self):
+        """Load the table from disk or enumerate all labeled subgraphs."""
+        if self.path and os.path.exists(self.path):
+            self.load(self.path)
+        else:
+            self.table = {}
+
+            for signature in enumerate_signatures(self.k, self.L, self.Q):
+                subgraph = signature_subgraph(self.k, signature)
+                self.table[signature] = self.label_func(subgraph)
+
+            if self.path:
+                self.save(self.path)
+
+        return self.table
+
+
+    def load(self, path):
+        """Read a previously enumerated table from path."""
+        with open(path, 'rb') as table_file:
+            k, L, Q, label_bits, table = pickle.load(table_file)
+
+        if (k, L, Q, label_bits) != (self.k, self.L, self.Q, LABEL_BITS):
+            msg = "table in %s was built for k = %d, L = %d, Q = %d with %d bit labels" % (path, k, L, Q, label_bits)
+            raise ValueError(msg)
+
+        self.table = table
+
+
+    def save(self, path):
+        """Write the enumerated table to path."""
+        with open(path, 'wb') as table_file:
+            pickle.dump((self.k, self.L, self.Q, LABEL_BITS, self.table), table_file)
+
+
+class TransitionTable:
+    """
+    Pattern transitions of k-node subgraphs gaining an edge.
+
+    Maps the structural signature of a subgraph, the pair position of a new
+    edge between two of its nodes and the label of that edge to the pattern
+    id of the resulting subgraph in registry. Transitions are added as they
+    are encountered, so only patterns of the stream enter the registry.
+    """
+    transitions = None
+
+    def __init__(self, k, label_func, registry):
+        self.k = k
+        self.label_func = label_func
+        self.registry = registry
+        self.transitions = {}
+
+
+    def __call__(self, signature, position, label):
+        return self.transition(signature, position, label)
+
+
+    def transition(self, signature, position, label):
+        """Look up the pattern id of a subgraph after adding an edge."""
+        key = (signature, position, label)
+        pattern = self.transitions.get(key)
+
+        if pattern is None:
+            pattern = self._pattern(signature, position, label)
+            self.transitions[key] = pattern
+
+        return pattern
+
+
+    def _pattern(self, signature, position, label):
+        i = self.k + position
+        new_signature = signature[:i] + (label,) + signature[i + 1:]
+        subgraph = signature_subgraph(self.k, new_signature)
+        return self.registry.intern(self.label_func(subgraph))
+
+
+def enumerate_signatures(k, L, Q):
+    """Enumerate signatures of all connected k-node subgraphs."""
+    pairs = list(combinations(range(k), 2))
+
+    for edge_set in product([False, True], repeat=len(pairs)):
+        edges = [pair for pair, present in zip(pairs, edge_set) if present]
+
+        if not _is_connected(k, edges):
+            continue
+
+        for v_labels in product(range(1, L + 1), repeat=k):
+            for q_labels in product(range(1, Q + 1), repeat=len(edges)):
+                e_labels = iter(q_labels)
+                yield v_labels + tuple(next(e_labels) if present else 0 for present in edge_set)
+
+
+def signature_subgraph(k, signature):
+    """Build a subgraph over nodes 0...k-1 from its structural signature."""
+    nodes = tuple(enumerate(signature[:k]))
+    pairs = combinations(range(k), 2)
+    edges = tuple(SubgraphEdge(i, j, q) for (i, j), q in zip(pairs, signature[k:]) if q)
+    return Subgraph(nodes, edges)
+
+
+def canonical_label_func(k, L=None, Q=None, path=None, backend=None):
+    """
+    Select the labeling function for k-node subgraphs.
+
+    A label table is only used when its path is given. The tables are shared
+    by all algorithms of a process, so a table is loaded or built once.
+    """
+    if backend is None:
+        # permutations become impractical beyond 4-node subgraphs
+        backend = 'permutation' if k <= 4 else 'refinement'
+
+    label_func = canonical_label_backend(backend)
+
+    if path and L and Q and k in TABLE_SIZES:
+        key = (k, L, Q, path, backend)
+
+        if key not in _tables:
+            _tables[key] = LabelTable(k, L, Q, path=path, label_func=label_func)
+
+        return _tables[key]
+    else:
+        return label_func
+
+
+def _is_connected(k, edges):
+    reached = set([0])
+    frontier = [0]
+
+    while frontier:
+        i = frontier.pop()
+        for u, v in edges:
+            if u == i and v not in reached:
+                reached.add(v)
+                frontier.append(v)
+            elif v == i and u not in reached:
+                reached.add(u)
+                frontier.append(u)
+
+    return len(reached) == k
@@ -3,6 +3,12 @@ import numpy as np
 from itertools import permutations
 from collections import Counter, defaultdict
 
+from .refinement import canonical_order
+
+# canonical labels are packed into integers with a fixed number of bits
+# per vertex and edge label, the first vertex label in the highest bits
+LABEL_BITS = 8
+
 
 def canonical_label(graphlet):
     nodes, edges = graphlet
@@ -61,7 +67,7 @@ def canonical_label(graphlet):
 
             A_max = None
             V_max = None
-            c_max = ''
+            c_max = -1
 
             for perm in permutations(indices):
                 perm = list(perm)
@@ -94,7 +100,64 @@ def canonical_label(graphlet):
     return _make_canonical_label(vertices, adj, vertex_labels)
 
 
+def refined_canonical_label(graphlet):
+    """Canonical label of a subgraph ordered by partition refinement."""
+    nodes, edges = graphlet
+
+    vertices = canonical_order(graphlet)
+    index = {u: i for i, u in enumerate(vertices)}
+    vertex_labels = dict(nodes)
+
+    adj = np.zeros((len(nodes), len(nodes)), dtype=int)
+
+    for u, v, label in edges:
+        adj[index[u]][index[v]] = label
+        adj[index[v]][index[u]] = label
+
+    return _make_canonical_label(vertices, adj, vertex_labels)
+
+
+# available labeling backends, both produce labels in the same format but
+# not in the same label space: the permutation backend orders the vertex
+# partitions one at a time, which can give isomorphic subgraphs different
+# labels, while refinement labels every isomorphism class once, so pattern
+# counts of the two backends must not be compared with each other
+BACKENDS = {
+    'permutation': canonical_label,
+    'refinement': refined_canonical_label
+}
+
+
+def canonical_label_backend(name):
+    if name in BACKENDS:
+        return BACKENDS[name]
+    else:
+        raise ValueError("no labeling backend available named %s" % (name))
+
+
+def encode_label(fields):
+    """Pack a sequence of vertex and edge labels into an integer."""
+    if max(fields) >> LABEL_BITS:
+        raise ValueError("labels must be smaller than %d" % (1 << LABEL_BITS))
+
+    c_label = 0
+    for x in fields:
+        c_label = (c_label << LABEL_BITS) | x
+
+    return c_label
+
+
+def decode_label(c_label, k):
+    """Unpack an integer canonical label into vertex and edge labels."""
+    n_fields = k + k * (k - 1) // 2
+    mask = (1 << LABEL_BITS) - 1
+
+    fields = [(c_label >> (LABEL_BITS * i)) & mask for i in reversed(range(n_fields))]
+
+    return tuple(fields[:k]), tuple(fields[k:])
+
+
 def _make_canonical_label(vertices, adjacency_matrix, vertex_labels):
     v_labels = [vertex_labels[u] for u in vertices]
-    e_labels = list(adjacency_matrix[np.tril_indices(len(vertices), k=-1)])
-    return ''.join([str(x) for x in (v_labels + e_labels)])
+    e_labels = adjacency_matrix[np.tril_indices(len(vertices), k=-1)].tolist()
+    return encode_label(v_labels + e_labels)
@@ -0,0 +1,180 @@
+"""
+Canonical ordering of labeled subgraphs by partition refinement.
+
+The search follows the individualization-refinement scheme of nauty. The
+vertices are first partitioned by degree and label, and the ordered partition
+is refined until it is equitable, i.e. until all vertices in a cell have the
+same number of neighbors with each edge label in every other cell. Cells that
+remain ambiguous are resolved by individualizing each of their vertices in
+turn, which yields a search tree whose leaves are discrete partitions.
+
+The canonical ordering is the leaf with the largest refinement trace and
+certificate. Subtrees whose trace is already smaller than the best one are
+pruned, and equal certificates reveal automorphisms of the subgraph, which
+are used to skip vertices that lie in the same orbit as an explored one.
+"""
+
+
+def canonical_order(graphlet):
+    """
+    Calculates the canonical vertex ordering of a labeled subgraph.
+
+    :param graphlet: The subgraph as a pair of (vertex, label) nodes and
+                     (u, v, label) edges
+    :returns: the vertices in canonical order
+    :rtype: list
+    """
+    nodes, edges = graphlet
+
+    vertices = [u for u, _ in nodes]
+    labels = [l for _, l in nodes]
+    index = {u: i for i, u in enumerate(vertices)}
+
+    n = len(vertices)
+    adj = [[0] * n for _ in range(n)]
+
+    for u, v, label in edges:
+        i, j = index[u], index[v]
+        adj[i][j] = label
+        adj[j][i] = label
+
+    search = _Search(labels, adj)
+    return [vertices[i] for i in search.run()]
+
+
+class _Search:
+
+    def __init__(self, labels, adj):
+        self.n = len(labels)
+        self.labels = labels
+        self.adj = adj
+        self.nbrs = [[(j, q) for j, q in enumerate(row) if q] for row in adj]
+
+        self.best = None
+        self.best_order = None
+        self.automorphisms = []
+
+
+    def run(self):
+        # initial partition by degree and label in descending order
+        cells = {}
+        for i in range(self.n):
+            cells.setdefault((len(self.nbrs[i]), self.labels[i]), []).append(i)
+
+        partition = [cells[key] for key in sorted(cells, reverse=True)]
+        partition, trace = self.refine(partition)
+
+        self.search(partition, (trace,), [])
+
+        return self.best_order
+
+
+    def refine(self, partition):
+        """Refine an ordered partition until it is equitable."""
+        trace = []
+        changed = True
+
+        while changed:
+            changed = False
+
+            cell_of = {}
+            for c, cell in enumerate(partition):
+                for i in cell:
+                    cell_of[i] = c
+
+            refined = []
+
+            for cell in partition:
+                if len(cell) == 1:
+                    refined.append(cell)
+                    continue
+
+                groups = {}
+                for i in cell:
+                    signature = tuple(sorted((cell_of[j], q) for j, q in self.nbrs[i]))
+                    groups.setdefault(signature, []).append(i)
+
+                if len(groups) > 1:
+                    changed = True
+                    for signature in sorted(groups, reverse=True):
+                        trace.append((len(refined), len(groups[signature]), signature))
+                        refined.append(groups[signature])
+                else:
+                    refined.append(cell)
+
+            partition = refined
+
+        return partition, tuple(trace)
+
+
+    def search(self, partition, trace, prefix):
+        if self.best is not None:
+            best_trace = self.best[0][:len(trace)]
+            if trace < best_trace:
+                # no leaf in this subtree can beat the best leaf
+                return
+
+        target = None
+        for c, cell in enumerate(partition):
+            if len(cell) > 1:
+                target = c
+                break
+
+        if target is None:
+            self.leaf([cell[0] for cell in partition], trace)
+            return
+
+        explored = []
+
+        for i in partition[target]:
+            if explored and self.in_explored_orbit(i, explored, prefix):
+                continue
+
+            explored.append(i)
+
+            rest = [j for j in partition[target] if j != i]
+            individualized = partition[:target] + [[i], rest] + partition[target + 1:]
+            refined, node_trace = self.refine(individualized)
+
+            self.search(refined, trace + (node_trace,), prefix + [i])
+
+
+    def leaf(self, order, trace):
+        certificate = self.certificate(order)
+
+        if self.best is None or (trace, certificate) > self.best:
+            self.best = (trace, certificate)
+            self.best_order = order
+        elif (trace, certificate) == self.best:
+            # both orderings produce the same subgraph, so mapping
+            # one onto the other is an automorphism
+            gamma = [None] * self.n
+            for i, j in zip(self.best_order, order):
+                gamma[i] = j
+            self.automorphisms.append(gamma)
+
+
+    def certificate(self, order):
+        v_labels = tuple(self.labels[i] for i in order)
+        e_labels = tuple(self.adj[order[r]][order[c]] for r in range(self.n) for c in range(r))
+        return v_labels + e_labels
+
+
+    def in_explored_orbit(self, i, explored, prefix):
+        """Check if an automorphism fixing prefix maps i to an explored vertex."""
+        generators = [g for g in self.automorphisms if all(g[p] == p for p in prefix)]
+
+        if not generators:
+            return False
+
+        orbit = set([i])
+        frontier = [i]
+
+        while frontier:
+            j = frontier.pop()
+            for g in generators:
+                if g[j] not in orbit:
+                    orbit.add(g[j])
+                    frontier.append(g[j])
+
+        return not orbit.isdisjoint(explored)
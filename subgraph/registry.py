@@ -0,0 +1,120 @@
+import numpy as np
+
+from collections import Counter
+
+
+class PatternRegistry:
+    """
+    Dense registry of subgraph pattern counts.
+
+    Each canonical label is interned to a dense integer id on first sight,
+    and the count of the pattern is kept at that position of a NumPy array
+    that doubles in size whenever it runs out of room.
+    """
+    ids = None
+    labels = None
+    counts = None
+
+    def __init__(self, capacity=64, dtype=np.int64):
+        self.ids = {}
+        self.labels = []
+        self.counts = np.zeros(capacity, dtype=dtype)
+
+
+    def __len__(self):
+        return len(self.labels)
+
+
+    def __getitem__(self, c_label):
+        pattern = self.ids.get(c_label)
+        return self.counts[pattern] if pattern is not None else 0
+
+
+    def intern(self, c_label):
+        """Get the id of a canonical label, registering it if necessary."""
+        pattern = self.ids.get(c_label)
+
+        if pattern is None:
+            pattern = len(self.labels)
+
+            if pattern == len(self.counts):
+                self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+
+            self.ids[c_label] = pattern
+            self.labels.append(c_label)
+
+        return pattern
+
+
+    def label(self, pattern):
+        """Get the canonical label of a pattern id."""
+        return self.labels[pattern]
+
+
+    def update(self, c_label, delta=1):
+        """Change the count of the pattern with canonical label c_label."""
+        pattern = self.intern(c_label)
+        self.counts[pattern] += delta
+
+
+    def add(self, pattern, delta=1):
+        """Change the count of the pattern with id pattern."""
+        self.counts[pattern] += delta
+
+
+    def add_at(self, patterns, deltas):
+        """Apply a batch of count changes, ids may repeat."""
+        np.add.at(self.counts, np.asarray(patterns, dtype=np.intp), deltas)
+
+
+    def to_counter(self):
+        """Export the non-zero pattern counts as a Counter of canonical labels."""
+        counts = self.counts[:len(self.labels)]
+        nonzero = np.flatnonzero(counts)
+        return Counter({self.labels[i]: counts[i].item() for i in nonzero})
+
+
+class PatternDeltas:
+    """
+    Buffer of pattern count changes to a registry.
+
+    Offers the update methods of PatternRegistry, but only collects the
+    changes, which flush applies to the registry in a single add_at call.
+    Canonical labels are still interned in the registry right away, so the
+    pattern ids are the same as without the buffer.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.patterns = []
+        self.deltas = []
+
+
+    def intern(self, c_label):
+        """Get the id of a canonical label, registering it if necessary."""
+        return self.registry.intern(c_label)
+
+
+    def label(self, pattern):
+        """Get the canonical label of a pattern id."""
+        return self.registry.label(pattern)
+
+
+    def update(self, c_label, delta=1):
+        """Buffer a change to the count of the pattern with canonical label c_label."""
+        self.patterns.append(self.registry.intern(c_label))
+        self.deltas.append(delta)
+
+
+    def add(self, pattern, delta=1):
+        """Buffer a change to the count of the pattern with id pattern."""
+        self.patterns.append(pattern)
+        self.deltas.append(delta)
+
+
+    def flush(self):
+        """Apply the buffered changes to the registry."""
+        if self.patterns:
+            self.registry.add_at(self.patterns, self.deltas)
+            self.patterns = []
+            self.deltas = []
@@ -2,3 +2,7 @@ from collections import namedtuple
 
 SubgraphEdge = namedtuple('SubgraphEdge', ['u', 'v', 'label'])
 Subgraph = namedtuple('Subgraph', ['nodes', 'edges'])
+
+# induced structure of a subgraph: nodes sorted by id, a bitmask of the node
+# pairs joined by an edge and the edge labels in combinations order (0 if none)
+SubgraphStructure = namedtuple('SubgraphStructure', ['nodes', 'mask', 'e_labels'])
@@ -1,4 +1,6 @@
-from .subgraph import Subgraph, SubgraphEdge
+from itertools import combinations
+
+from .subgraph import Subgraph, SubgraphEdge, SubgraphStructure
 
 def make_subgraph(nodes, edges):
     nodes = sorted(nodes)
@@ -7,3 +9,97 @@ def make_subgraph(nodes, edges):
 
 def make_subgraph_edge(edge):
     return SubgraphEdge(edge.u, edge.v, edge.label)
+
+def structural_signature(subgraph):
+    """
+    Id-independent signature of a subgraph.
+
+    The signature is the tuple of vertex labels in node order followed by the
+    labels of all node pairs in the order of itertools.combinations, where 0
+    marks a pair without an edge. Two subgraphs with equal signatures always
+    receive the same canonical label.
+    """
+    nodes, edges = subgraph
+    k = len(nodes)
+
+    index = {u: i for i, (u, _) in enumerate(nodes)}
+    e_labels = [0] * (k * (k - 1) // 2)
+
+    for u, v, label in edges:
+        i, j = index[u], index[v]
+        if j < i: i, j = j, i
+        e_labels[pair_position(k, i, j)] = label
+
+    return tuple([label for _, label in nodes] + e_labels)
+
+def is_connected(subgraph):
+    """Check if the edges of a subgraph connect all of its nodes."""
+    nodes, edges = subgraph
+
+    neighbors = {u: [] for u, _ in nodes}
+    for u, v, _ in edges:
+        neighbors[u].append(v)
+        neighbors[v].append(u)
+
+    start, _ = nodes[0]
+    reached = {start}
+    stack = [start]
+
+    while stack:
+        for w in neighbors[stack.pop()]:
+            if w not in reached:
+                reached.add(w)
+                stack.append(w)
+
+    return len(reached) == len(nodes)
+
+def pair_position(k, i, j):
+    """Position of node pair (i, j), i < j, in combinations(range(k), 2)."""
+    return i * (2 * k - i - 1) // 2 + j - i - 1
+
+def make_structure(nodes, edges):
+    """
+    Structure of the subgraph induced by nodes.
+
+    The edges are given as (u, v, label) triples of nodes and edge labels,
+    and must contain every edge between the nodes.
+    """
+    nodes = tuple(sorted(nodes))
+    k = len(nodes)
+
+    index = {u: i for i, u in enumerate(nodes)}
+    e_labels = [0] * (k * (k - 1) // 2)
+    mask = 0
+
+    for u, v, label in edges:
+        i, j = index[u], index[v]
+        if j < i: i, j = j, i
+        position = pair_position(k, i, j)
+        e_labels[position] = label
+        mask |= 1 << position
+
+    return SubgraphStructure(nodes, mask, tuple(e_labels))
+
+def add_structure_edge(structure, edge):
+    """Structure of a subgraph after edge is added between two of its nodes."""
+    nodes, mask, e_labels = structure
+
+    i = nodes.index(edge.get_u())
+    j = nodes.index(edge.get_v())
+
+    position = pair_position(len(nodes), i, j)
+    e_labels = e_labels[:position] + (edge.label,) + e_labels[position + 1:]
+
+    return SubgraphStructure(nodes, mask | (1 << position), e_labels)
+
+def structure_subgraph(structure):
+    """Build the subgraph described by a structure."""
+    nodes, _, e_labels = structure
+    pairs = combinations(nodes, 2)
+
+    edges = tuple(SubgraphEdge(u.node_id, v.node_id, q) for (u, v), q in zip(pairs, e_labels) if q)
+    return Subgraph(nodes, edges)
+
+def structure_signature(structure):
+    """Structural signature of the subgraph described by a structure."""
+    return tuple(label for _, label in structure.nodes) + structure.e_labels
@@ -0,0 +1,28 @@
+import random
+
+from graph.util import make_edge
+
+
+def random_stream(seed, n=20, m=70, L=2, Q=2, first=0, repeats=False):
+    """
+    Random labeled edge stream over the nodes first, ..., first + n - 1.
+
+    Draws m node pairs, and each node gets one of the vertex labels 1...L
+    and each edge one of the edge labels 1...Q. Without repeats every node
+    pair is kept once and the edges are shuffled, with repeats the pairs
+    may appear again with other edge labels, in the order they were drawn.
+    """
+    rng = random.Random(seed)
+    labels = [rng.randint(1, L) for _ in range(n)]
+    edges = []
+
+    for _ in range(m):
+        a, b = sorted(rng.sample(range(first, first + n), 2))
+        edges.append(make_edge(a, labels[a - first], b, labels[b - first], rng.randint(1, Q)))
+
+    if repeats:
+        return edges
+
+    edges = sorted({(edge.u, edge.v): edge for edge in edges}.values())
+    rng.shuffle(edges)
+    return edges
@@ -0,0 +1,45 @@
+import unittest
+
+from graph.util import make_edge
+
+from algorithms.fsm.base import unique_edges
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+from algorithms.fsm.incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
+from algorithms.fsm.incremental.optimized_reservoir import IncerementalOptimizedReservoirAlgorithm
+from algorithms.fsm.incremental.edge_sample import IncrementalEdgeSampleAlgorithm
+
+from test.streams import random_stream
+
+class BatchIngestionTestCase(unittest.TestCase):
+
+    def test_unique_edges(self):
+        edges = [make_edge(1, 1, 2, 1, 1), make_edge(2, 1, 3, 1, 1), make_edge(2, 1, 1, 1, 2)]
+        self.assertEqual(unique_edges(edges), edges[:2])
+        self.assertEqual(unique_edges([]), [])
+
+    def test_same_as_one_by_one(self):
+        algorithms = [
+            (IncrementalExactCountingAlgorithm, {'k': 3, 'delta_counting': True}),
+            (IncrementalExactCountingAlgorithm, {'k': 4}),
+            (IncrementalNaiveReservoirAlgorithm, {'k': 3, 'M': 60, 'seed': 1}),
+            (IncerementalOptimizedReservoirAlgorithm, {'k': 4, 'M': 60, 'seed': 2}),
+            (IncrementalEdgeSampleAlgorithm, {'k': 3, 'M': 40, 'seed': 3}),
+        ]
+
+        edges = random_stream(0, n=25, m=120, L=3, repeats=True)
+
+        for Algorithm, kwargs in algorithms:
+            single = Algorithm(**kwargs)
+            for edge in edges:
+                single.add_edge(edge)
+
+            batched = Algorithm(**kwargs)
+            added = sum(batched.add_edges(edges[i:i + 16]) for i in range(0, len(edges), 16))
+
+            self.assertEqual(added, len(single.metrics['edge_add_ms']))
+            self.assertEqual(single.patterns, batched.patterns)
+            self.assertEqual(len(batched.metrics['batch_add_ms']), 8)
+            self.assertEqual(sum(batched.metrics['new_subgraph_count']), sum(single.metrics['new_subgraph_count']))
+
+            if hasattr(single, 'reservoir'):
+                self.assertEqual(set(single.reservoir.subgraphs), set(batched.reservoir.subgraphs))
@@ -0,0 +1,58 @@
+import random
+import unittest
+
+from graph.util import make_edge
+from graph.compact_graph import CompactGraph
+from graph.bitset_graph import BitsetGraph, BitSet, to_bits
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet
+
+class BitSetTestCase(unittest.TestCase):
+
+    def test_operators_match_sets(self):
+        rng = random.Random(1)
+
+        for _ in range(50):
+            a = set(rng.sample(range(300), rng.randint(0, 100)))
+            b = set(rng.sample(range(300), rng.randint(0, 100)))
+
+            A, B = BitSet(to_bits(a)), BitSet(to_bits(b))
+
+            self.assertEqual(len(A), len(a))
+            self.assertEqual(A.handles(), sorted(a))
+
+            for x, y in [(A, B), (A, b), (a, B)]:
+                self.assertEqual(set(x & y), a & b)
+                self.assertEqual(set(x | y), a | b)
+                self.assertEqual(set(x ^ y), a ^ b)
+                self.assertEqual(set(x - y), a - b)
+
+
+class BitsetGraphTestCase(unittest.TestCase):
+
+    def test_explorers_match_compact_graph(self):
+        rng = random.Random(2)
+        compact = CompactGraph()
+        bitset = BitsetGraph()
+
+        for _ in range(300):
+            a, b = sorted(rng.sample(range(30), 2))
+            edge = make_edge(a, 1, b, 1, 1)
+
+            if edge in compact:
+                if rng.random() < 0.3:
+                    compact.remove_edge(edge)
+                    bitset.remove_edge(edge)
+                continue
+
+            u, v = compact.endpoints(edge)
+            self.assertEqual(bitset.endpoints(edge), (u, v))
+
+            for k, explorer in [(3, optimized_triplet), (4, optimized_quadruplet)]:
+                self.assertEqual(explorer.get_all_subgraphs(bitset, k, u, v),
+                                 explorer.get_all_subgraphs(compact, k, u, v))
+                self.assertEqual(set(explorer.get_new_subgraph_space(bitset, k, u, v)),
+                                 explorer.get_new_subgraphs(compact, k, u, v))
+
+            compact.add_edge(edge)
+            bitset.add_edge(edge)
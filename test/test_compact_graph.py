@@ -0,0 +1,51 @@
+import unittest
+
+from graph.simple_graph import SimpleGraph
+from graph.compact_graph import CompactGraph
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+
+from test.streams import random_stream
+
+class CompactGraphTestCase(unittest.TestCase):
+
+    def test_same_interface_as_simple_graph(self):
+        simple = SimpleGraph()
+        compact = CompactGraph()
+        edges = random_stream(1, n=25, m=120, first=100)
+
+        for edge in edges:
+            simple.add_edge(edge)
+            compact.add_edge(edge)
+
+        for edge in edges[:30]:
+            simple.remove_edge(edge)
+            compact.remove_edge(edge)
+
+        for edge in edges:
+            self.assertEqual(edge in simple, edge in compact)
+
+            u, v = simple.endpoints(edge)
+            i, j = compact.endpoints(edge)
+
+            self.assertEqual(compact.node(i), u)
+            self.assertEqual(set(compact.to_nodes(compact.neighbors(i))), simple.neighbors(u))
+
+            two_hop = compact.two_hop_neighborhood(i)
+            self.assertEqual({compact.node(x): set(compact.to_nodes(s)) for x, s in two_hop.items()},
+                             simple.two_hop_neighborhood(u))
+
+            nodes = compact.neighbors(i) | set([i, j])
+            self.assertEqual(compact.get_induced_edges(nodes),
+                             simple.get_induced_edges(compact.to_nodes(nodes)))
+
+    def test_exact_counting_matches(self):
+        for k in [3, 4]:
+            simple = IncrementalExactCountingAlgorithm(k=k)
+            compact = IncrementalExactCountingAlgorithm(k=k, compact_graph=True)
+
+            for edge in random_stream(k, n=25, m=120, first=100):
+                simple.add_edge(edge)
+                compact.add_edge(edge)
+
+            self.assertEqual(+simple.patterns, +compact.patterns)
@@ -0,0 +1,99 @@
+import unittest
+import tracemalloc
+
+import numpy as np
+
+from graph.node import Node
+from subgraph.util import make_subgraph
+from subgraph.subgraph import SubgraphEdge
+from sampling.compact_reservoir import CompactSubgraphReservoir
+
+class CompactSubgraphReservoirTestCase(unittest.TestCase):
+
+    wedge = make_subgraph(
+        [Node(1,1), Node(2,1), Node(3,2)],
+        [SubgraphEdge(1,2,1), SubgraphEdge(1,3,2)]
+    )
+
+    triangle = make_subgraph(
+        [Node(1,1), Node(2,1), Node(3,2)],
+        [SubgraphEdge(1,2,1), SubgraphEdge(1,3,2), SubgraphEdge(2,3,1)]
+    )
+
+    path = make_subgraph(
+        [Node(2,1), Node(3,2), Node(4,1)],
+        [SubgraphEdge(2,4,2), SubgraphEdge(3,4,1)]
+    )
+
+    def test_add_and_materialize(self):
+        reservoir = CompactSubgraphReservoir(size=2, k=3)
+
+        self.assertEqual(reservoir.add(self.wedge, pattern=5), (True, None, -1))
+        self.assertEqual(reservoir.add(self.path), (True, None, -1))
+        self.assertTrue(reservoir.is_full())
+
+        self.assertIn(self.wedge, reservoir)
+        self.assertEqual(reservoir.subgraph(0), self.wedge)
+        self.assertEqual(reservoir.subgraph(1), self.path)
+        self.assertEqual(reservoir.get_pattern(self.wedge), 5)
+
+    def test_replace_and_common_subgraphs(self):
+        reservoir = CompactSubgraphReservoir(size=2, k=3)
+
+        reservoir.add(self.wedge)
+        reservoir.add(self.path)
+
+        common = reservoir.get_common_subgraphs(Node(2,1), Node(3,2))
+        self.assertCountEqual(common, [self.wedge, self.path])
+
+        self.assertEqual(reservoir.replace(self.wedge, self.triangle, pattern=7), -1)
+
+        common = reservoir.get_common_subgraphs(Node(1,1), Node(2,1))
+        self.assertEqual(common, [self.triangle])
+        self.assertEqual(reservoir.get_pattern(self.triangle), 7)
+
+    def test_remove(self):
+        reservoir = CompactSubgraphReservoir(size=3, k=3)
+
+        reservoir.add(self.wedge, pattern=5)
+        reservoir.add(self.path, pattern=6)
+
+        self.assertEqual(reservoir.remove(self.wedge), 5)
+        self.assertEqual(len(reservoir), 1)
+        self.assertNotIn(self.wedge, reservoir)
+
+        # the last subgraph moved into the freed slot
+        self.assertEqual(reservoir.subgraph(0), self.path)
+        self.assertEqual(reservoir.get_pattern(self.path), 6)
+        self.assertEqual(reservoir.get_common_subgraphs(Node(1,1), Node(2,1)), [])
+        self.assertEqual(reservoir.get_common_subgraphs(Node(3,2), Node(4,1)), [self.path])
+
+    def test_edge_mask_size(self):
+        self.assertEqual(CompactSubgraphReservoir(size=1, k=4).edge_masks.dtype, np.uint8)
+        self.assertEqual(CompactSubgraphReservoir(size=1, k=9).edge_masks.dtype, np.uint64)
+
+        with self.assertRaises(ValueError):
+            CompactSubgraphReservoir(size=1, k=12)
+
+    def test_bytes_per_slot(self):
+        size, k = 5000, 4
+
+        def fill(reservoir):
+            for i in range(reservoir.max_size):
+                nodes = [Node(k * i + j, 1) for j in range(k)]
+                edges = [SubgraphEdge(k * i + j, k * i + j + 1, 1) for j in range(k - 1)]
+                reservoir.add(make_subgraph(nodes, edges))
+
+        # run the code paths once so that their imports are not traced
+        fill(CompactSubgraphReservoir(size=10, k=k))
+
+        tracemalloc.start()
+        reservoir = CompactSubgraphReservoir(size=size, k=k)
+        fill(reservoir)
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # the arrays take under 200 bytes per slot, and filling
+        # the reservoir keeps no Python objects per slot
+        self.assertLess(reservoir.nbytes() / size, 200)
+        self.assertLess(allocated / size, 256)
@@ -0,0 +1,53 @@
+import unittest
+
+from itertools import combinations
+
+from graph.simple_graph import SimpleGraph
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet, connected_sets
+
+from test.streams import random_stream
+
+class ConnectedSetsTestCase(unittest.TestCase):
+
+    def is_connected(self, graph, nodes):
+        nodes = set(nodes)
+        seen = set([next(iter(nodes))])
+        stack = list(seen)
+
+        while stack:
+            for x in graph.neighbors(stack.pop()) & nodes:
+                if x not in seen:
+                    seen.add(x)
+                    stack.append(x)
+
+        return seen == nodes
+
+    def test_matches_specialised_explorers(self):
+        graph = SimpleGraph()
+
+        for edge in random_stream(1, n=12, m=40, L=1, Q=1):
+            u, v = edge.get_u(), edge.get_v()
+
+            for k, explorer in [(3, optimized_triplet), (4, optimized_quadruplet)]:
+                self.assertEqual(connected_sets.get_all_subgraphs(graph, k, u, v),
+                                 explorer.get_all_subgraphs(graph, k, u, v))
+
+            graph.add_edge(edge)
+
+    def test_enumerates_connected_sets_once(self):
+        graph = SimpleGraph()
+
+        for edge in random_stream(2, n=12, m=40, L=1, Q=1):
+            graph.add_edge(edge)
+            u, v = edge.get_u(), edge.get_v()
+
+            nodes = set(graph.adjacency_matrix) - set([u, v])
+
+            for k in [5, 6]:
+                sets = list(connected_sets.connected_sets(graph, k, u, v))
+                expected = set(frozenset((u, v) + c) for c in combinations(nodes, k - 2)
+                               if self.is_connected(graph, (u, v) + c))
+
+                self.assertEqual(len(sets), len(set(sets)))
+                self.assertEqual(set(sets), expected)
@@ -0,0 +1,43 @@
+import unittest
+
+from graph.simple_graph import SimpleGraph
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+
+from test.streams import random_stream
+
+class DeltaCountingTestCase(unittest.TestCase):
+
+    def test_label_histograms(self):
+        graph = SimpleGraph(label_histograms=True)
+        edges = random_stream(1, n=30, m=200, L=3)
+
+        for edge in edges:
+            graph.add_edge(edge)
+
+        for edge in edges[:50]:
+            graph.remove_edge(edge)
+
+        for u in graph.adjacency_matrix:
+            expected = {}
+            for w in graph.neighbors(u):
+                key = (w.label, graph.edge_label(u, w))
+                expected[key] = expected.get(key, 0) + 1
+
+            self.assertEqual(dict(graph.label_histogram(u)), expected)
+
+    def test_matches_exact_counting(self):
+        for seed in range(3):
+            exact = IncrementalExactCountingAlgorithm(k=3)
+            delta = IncrementalExactCountingAlgorithm(k=3, delta_counting=True)
+
+            for edge in random_stream(seed, n=30, m=200, L=3):
+                exact.add_edge(edge)
+                delta.add_edge(edge)
+
+            self.assertEqual(+exact.patterns, +delta.patterns)
+            self.assertEqual(exact.metrics['new_subgraph_count'], delta.metrics['new_subgraph_count'])
+
+    def test_requires_triplets(self):
+        with self.assertRaises(ValueError):
+            IncrementalExactCountingAlgorithm(k=4, delta_counting=True)
@@ -0,0 +1,69 @@
+import unittest
+
+from graph.util import make_edge
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+from algorithms.fsm.dynamic.exact_counting import DynamicExactCountingAlgorithm
+from algorithms.fsm.dynamic.naive_reservoir import DynamicNaiveReservoirAlgorithm
+
+from test.streams import random_stream
+
+class DynamicStreamTestCase(unittest.TestCase):
+
+    def random_stream(self, seed, n=20, m=80):
+        edges = random_stream(seed, n=n, m=m, L=3)
+
+        # remove every third edge some time after it was added
+        removed = edges[::3]
+        return edges, removed
+
+    def run_stream(self, algorithm, edges, removed):
+        for i, edge in enumerate(edges):
+            algorithm.add_edge(edge)
+            if i % 4 == 3:
+                algorithm.remove_edge(removed[i // 4])
+
+        for edge in removed[len(edges) // 4:]:
+            algorithm.remove_edge(edge)
+
+    def expected_patterns(self, k, edges, removed):
+        exact = IncrementalExactCountingAlgorithm(k=k)
+        for edge in edges:
+            if edge not in removed:
+                exact.add_edge(edge)
+        return +exact.patterns
+
+    def test_exact_counting(self):
+        for k, kwargs in [(3, {}), (3, {'delta_counting': True}), (4, {}), (5, {})]:
+            edges, removed = self.random_stream(k)
+
+            dynamic = DynamicExactCountingAlgorithm(k=k, **kwargs)
+            self.run_stream(dynamic, edges, removed)
+
+            self.assertEqual(+dynamic.patterns, self.expected_patterns(k, edges, removed))
+
+    def test_remove_missing_edge(self):
+        dynamic = DynamicExactCountingAlgorithm(k=3)
+        self.assertFalse(dynamic.remove_edge(make_edge(1, 1, 2, 1, 1)))
+
+    def test_reservoir_keeps_all_subgraphs(self):
+        # a reservoir that holds every subgraph matches exact counting
+        for k, kwargs in [(3, {}), (4, {'compact_reservoir': True})]:
+            edges, removed = self.random_stream(k)
+
+            dynamic = DynamicNaiveReservoirAlgorithm(k=k, M=10 ** 5, seed=k, **kwargs)
+            self.run_stream(dynamic, edges, removed)
+
+            self.assertEqual(+dynamic.patterns, self.expected_patterns(k, edges, removed))
+            self.assertEqual(dynamic.N, len(dynamic.reservoir))
+            self.assertEqual(dynamic.c2, 0)
+
+    def test_reservoir_size(self):
+        edges, removed = self.random_stream(0, n=30, m=150)
+
+        dynamic = DynamicNaiveReservoirAlgorithm(k=3, M=50, seed=1)
+        self.run_stream(dynamic, edges, removed)
+
+        self.assertLessEqual(len(dynamic.reservoir), 50)
+        self.assertEqual(sum(dynamic.patterns.values()), len(dynamic.reservoir))
+        self.assertEqual(len(dynamic.reservoir), min(50, dynamic.N) - dynamic.c1)
@@ -0,0 +1,53 @@
+import io
+import unittest
+
+import numpy as np
+
+from graph.util import make_edge
+from graph.edge_array import read_edge_file, to_edges, iter_edges, SharedEdgeArray
+
+class EdgeArrayTestCase(unittest.TestCase):
+
+    def test_read_edge_file(self):
+        edges = read_edge_file(io.StringIO("1 1 2 2 1\n5 2 3 1 2\n\n4 1 6 1 1\n"))
+
+        self.assertEqual(to_edges(edges), [
+            make_edge(1, 1, 2, 2, 1),
+            make_edge(5, 2, 3, 1, 2),
+            make_edge(4, 1, 6, 1, 1)])
+        self.assertNotIn('timestamp', edges.dtype.names)
+
+    def test_read_empty_and_single_row(self):
+        self.assertEqual(len(read_edge_file(io.StringIO("\n"))), 0)
+
+        edges = read_edge_file(io.StringIO("\n2 1 1 2 1\n"))
+        self.assertEqual(to_edges(edges), [make_edge(2, 1, 1, 2, 1)])
+
+    def test_read_timestamps(self):
+        edges = read_edge_file(io.StringIO("1 1 2 2 1 3.5\n5 2 3 1 2 1.0\n4 1 6 1 1 2.0\n"))
+
+        self.assertEqual(edges['timestamp'].tolist(), [1.0, 2.0, 3.5])
+        self.assertEqual(to_edges(edges)[0], make_edge(3, 1, 5, 2, 2))
+
+    def test_iter_edges(self):
+        edges = read_edge_file(io.StringIO("1 1 2 2 1\n2 2 3 1 2\n3 1 4 1 1\n"))
+        order = np.array([2, 0, 1])
+
+        self.assertEqual([edge for edge, _ in iter_edges(edges, order)],
+            [to_edges(edges)[i] for i in order])
+
+    def test_shared_edge_array(self):
+        edges = read_edge_file(io.StringIO("1 1 2 2 1 0.5\n2 2 3 1 2 1.5\n"))
+
+        shared = SharedEdgeArray.create(edges)
+        attached = SharedEdgeArray.attach(*shared.handle())
+
+        try:
+            self.assertEqual(attached.array.tolist(), edges.tolist())
+
+            # both views share the same memory
+            shared.array['label'][0] = 7
+            self.assertEqual(attached.array['label'][0], 7)
+        finally:
+            attached.close()
+            shared.close()
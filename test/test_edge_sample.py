@@ -0,0 +1,79 @@
+import unittest
+
+from collections import Counter
+
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+from algorithms.fsm.incremental.edge_sample import IncrementalEdgeSampleAlgorithm
+
+from test.streams import random_stream
+
+class EdgeSampleTestCase(unittest.TestCase):
+
+    def exact_patterns(self, k, edges):
+        exact = IncrementalExactCountingAlgorithm(k=k)
+        for edge in edges:
+            exact.add_edge(edge)
+        return +exact.patterns
+
+    def test_exact_without_sampling(self):
+        for k in [3, 4]:
+            edges = random_stream(k)
+
+            algorithm = IncrementalEdgeSampleAlgorithm(k=k, M=len(edges))
+            for edge in edges:
+                algorithm.add_edge(edge)
+
+            expected = self.exact_patterns(k, edges)
+            self.assertEqual(set(+algorithm.patterns), set(expected))
+
+            for c_label, count in expected.items():
+                self.assertAlmostEqual(algorithm.patterns[c_label], count)
+
+    def test_bounded_sample(self):
+        edges = random_stream(0)
+
+        algorithm = IncrementalEdgeSampleAlgorithm(k=3, M=20, seed=0, compact_graph=True)
+        for edge in edges:
+            algorithm.add_edge(edge)
+
+        self.assertEqual(len(algorithm.edges), 20)
+        self.assertEqual(len(algorithm.graph.edge_labels), 20)
+        self.assertLessEqual(len(algorithm.graph), 40)
+
+    def test_repeated_edges(self):
+        edges = random_stream(2)
+        repeated = edges + edges[::3]
+
+        algorithm = IncrementalEdgeSampleAlgorithm(k=3, M=20, seed=0)
+        with_repeats = IncrementalEdgeSampleAlgorithm(k=3, M=20, seed=0)
+
+        for edge in edges:
+            algorithm.add_edge(edge)
+
+        # edges that were dropped from the sample are still known
+        added = [with_repeats.add_edge(edge) for edge in repeated]
+
+        self.assertEqual(added, [True] * len(edges) + [False] * len(edges[::3]))
+        self.assertEqual(with_repeats.t, len(edges))
+        self.assertEqual(with_repeats.patterns, algorithm.patterns)
+
+    def test_unbiased_estimates(self):
+        edges = random_stream(1)
+        expected = self.exact_patterns(3, edges)
+
+        runs = 200
+        totals = Counter()
+
+        for seed in range(runs):
+            algorithm = IncrementalEdgeSampleAlgorithm(k=3, M=35, seed=seed,
+                distinct_stream=True, instrumentation='off')
+            for edge in edges:
+                algorithm.add_edge(edge)
+            totals.update(algorithm.patterns)
+
+        self.assertEqual(set(+totals), set(expected))
+
+        # the mean estimate of each pattern is close to its exact count
+        for c_label, count in expected.items():
+            self.assertAlmostEqual(totals[c_label] / runs, count, delta=0.2 * count + 0.2)
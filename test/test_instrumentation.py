@@ -0,0 +1,84 @@
+import unittest
+
+from util.instrumentation import Instrumentation, Metrics
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+from algorithms.fsm.incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
+from algorithms.fsm.dynamic.exact_counting import DynamicExactCountingAlgorithm
+
+from test.streams import random_stream
+
+class InstrumentationTestCase(unittest.TestCase):
+
+    def test_metrics_buffers(self):
+        metrics = Metrics(capacity=2)
+
+        for i in range(5):
+            metrics.record('count', i)
+
+        self.assertEqual(metrics['count'], [0, 1, 2, 3, 4])
+        self.assertEqual(metrics.array('count').sum(), 10)
+        self.assertEqual(list(metrics), ['count'])
+
+    def test_levels(self):
+        edges = random_stream(0, m=60, Q=1)
+
+        full = IncrementalNaiveReservoirAlgorithm(k=3, M=50, seed=1)
+        sampled = IncrementalNaiveReservoirAlgorithm(k=3, M=50, seed=1, instrumentation='sampled', sample_every=7)
+        off = IncrementalNaiveReservoirAlgorithm(k=3, M=50, seed=1, instrumentation='off')
+
+        for edge in edges:
+            full.add_edge(edge)
+            sampled.add_edge(edge)
+            off.add_edge(edge)
+
+        self.assertEqual(full.patterns, sampled.patterns)
+        self.assertEqual(full.patterns, off.patterns)
+
+        for name in ['edge_add_ms', 'subgraph_add_ms', 'subgraph_replace_ms',
+                     'new_subgraph_count', 'reservoir_full_bool', 'label_cache_hit_count']:
+            self.assertEqual(len(full.metrics[name]), len(edges))
+            self.assertEqual(len(sampled.metrics[name]), (len(edges) + 6) // 7)
+
+        self.assertEqual(sampled.metrics['new_subgraph_count'], full.metrics['new_subgraph_count'][::7])
+
+        # the public methods are shared, only the work methods are timed
+        self.assertNotIn('add_edge', vars(full))
+        self.assertIn('insert_edge', vars(full))
+
+        # without instrumentation the algorithm keeps its untimed methods
+        self.assertEqual(len(off.metrics), 0)
+        self.assertNotIn('add_edge', vars(off))
+        self.assertNotIn('sample_subgraphs', vars(off))
+
+    def test_batches_and_removals(self):
+        edges = random_stream(1, m=60, Q=1)
+
+        algorithm = DynamicExactCountingAlgorithm(k=3)
+        algorithm.add_edges(edges[:30])
+        algorithm.add_edges(edges[30:])
+
+        for edge in edges[:10]:
+            algorithm.remove_edge(edge)
+
+        self.assertEqual(algorithm.metrics['batch_edge_count'], [30, len(edges) - 30])
+        self.assertNotIn('edge_add_ms', algorithm.metrics)
+        self.assertEqual(len(algorithm.metrics['edge_remove_ms']), 10)
+        self.assertEqual(len(algorithm.metrics['removed_subgraph_count']), 10)
+
+    def test_repeated_edges(self):
+        edges = random_stream(2, m=60, Q=1)
+
+        algorithm = IncrementalExactCountingAlgorithm(k=3)
+
+        for edge in edges + edges[:10]:
+            algorithm.add_edge(edge)
+
+        self.assertEqual(len(algorithm.metrics['edge_add_ms']), len(edges))
+
+    def test_unknown_level(self):
+        with self.assertRaises(ValueError):
+            Instrumentation('verbose')
+
+        with self.assertRaises(ValueError):
+            IncrementalExactCountingAlgorithm(k=3, instrumentation='verbose')
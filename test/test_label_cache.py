@@ -0,0 +1,42 @@
+import unittest
+
+from subgraph.subgraph import Subgraph
+from subgraph.cache import LabelCache
+from subgraph.pattern import canonical_label
+
+class LabelCacheTestCase(unittest.TestCase):
+
+    wedge = Subgraph(
+        nodes=[(1,1), (2,1), (3,2)],
+        edges=[(1,2,1), (1,3,2)]
+    )
+
+    shifted_wedge = Subgraph(
+        nodes=[(11,1), (12,1), (13,2)],
+        edges=[(11,12,1), (11,13,2)]
+    )
+
+    triangle = Subgraph(
+        nodes=[(1,1), (2,1), (3,2)],
+        edges=[(1,2,1), (1,3,2), (2,3,1)]
+    )
+
+    def test_hits_are_id_independent(self):
+        cache = LabelCache(canonical_label)
+
+        cl1 = cache(self.wedge)
+        cl2 = cache(self.shifted_wedge)
+
+        self.assertEqual(cl1, canonical_label(self.wedge))
+        self.assertEqual(cl1, cl2)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LabelCache(canonical_label, max_size=1)
+
+        cache(self.wedge)
+        cache(self.triangle)
+        cache(self.shifted_wedge)
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
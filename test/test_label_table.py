@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+from subgraph.subgraph import Subgraph
+from subgraph.pattern import canonical_label
+from subgraph.registry import PatternRegistry
+from subgraph.lookup import LabelTable, TransitionTable, signature_subgraph, canonical_label_func
+from subgraph.util import structural_signature
+
+class LabelTableTestCase(unittest.TestCase):
+
+    def test_table_matches_canonical_label(self):
+        for k in [3, 4]:
+            table = LabelTable(k, 2, 2)
+
+            for signature, c_label in table.build().items():
+                subgraph = signature_subgraph(k, signature)
+                self.assertEqual(c_label, canonical_label(subgraph))
+
+    def test_lookup_is_id_independent(self):
+        table = LabelTable(4, 2, 2)
+        table.build()
+
+        kite = Subgraph(
+            nodes=[(3,1), (7,2), (12,2), (40,1)],
+            edges=[(3,7,1), (3,12,2), (7,12,1), (12,40,2)]
+        )
+
+        self.assertEqual(table(kite), canonical_label(kite))
+        self.assertEqual(len(table), 9984)
+
+    def test_lookup_outside_of_table(self):
+        table = LabelTable(3, 2, 2)
+
+        wedge = Subgraph(
+            nodes=[(1,3), (2,1), (3,2)],
+            edges=[(1,2,1), (1,3,3)]
+        )
+
+        self.assertEqual(table(wedge), canonical_label(wedge))
+        self.assertIn(structural_signature(wedge), table.table)
+
+    def test_lazy_table(self):
+        table = LabelTable(3, 2, 2, max_inserts=1)
+
+        wedge = Subgraph(
+            nodes=[(1,1), (2,1), (3,2)],
+            edges=[(1,2,1), (1,3,1)]
+        )
+        triangle = Subgraph(
+            nodes=[(1,1), (2,1), (3,2)],
+            edges=[(1,2,1), (1,3,1), (2,3,2)]
+        )
+
+        # without build the table only holds the labeled signatures
+        self.assertEqual(table(wedge), canonical_label(wedge))
+        self.assertEqual(len(table), 1)
+
+        # and stops growing at max_inserts
+        self.assertEqual(table(triangle), canonical_label(triangle))
+        self.assertEqual(len(table), 1)
+
+    def test_table_is_opt_in(self):
+        self.assertNotIsInstance(canonical_label_func(3, 2, 2), LabelTable)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'table.pickle')
+
+            table = canonical_label_func(3, 2, 2, path=path)
+            table.build()
+
+            # the algorithms of a process share the table
+            self.assertIs(canonical_label_func(3, 2, 2, path=path), table)
+            self.assertTrue(os.path.exists(path))
+
+    def test_transitions_fill_on_miss(self):
+        table = LabelTable(3, 2, 2)
+        table.build()
+
+        registry = PatternRegistry()
+        transitions = TransitionTable(3, table, registry)
+
+        # the wedge 1-2, 1-3 gains the edge 2-3 with label 2
+        wedge = (1, 1, 2, 1, 1, 0)
+        triangle = signature_subgraph(3, (1, 1, 2, 1, 1, 2))
+
+        pattern = transitions(wedge, 2, 2)
+
+        self.assertEqual(registry.label(pattern), canonical_label(triangle))
+        self.assertEqual(len(transitions.transitions), 1)
+        self.assertEqual(len(registry), 1)
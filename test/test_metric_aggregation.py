@@ -0,0 +1,68 @@
+import random
+import unittest
+
+import numpy as np
+
+from graph.util import make_edge
+
+from util.instrumentation import LogHistogram, MetricSummary, AggregatedMetrics
+
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+
+class MetricAggregationTestCase(unittest.TestCase):
+
+    def test_log_histogram(self):
+        histogram = LogHistogram(growth=1.01)
+        values = np.random.default_rng(0).lognormal(size=10000)
+
+        for value in values:
+            histogram.add(value)
+
+        for q in [0.5, 0.99, 0.999]:
+            self.assertAlmostEqual(histogram.quantile(q) / np.quantile(values, q), 1.0, delta=0.02)
+
+        zeros = LogHistogram()
+        zeros.add(0)
+        self.assertEqual(zeros.quantile(0.5), 0.0)
+
+    def test_summary(self):
+        summary = MetricSummary(bucket_size=4, window=3)
+
+        for value in range(1, 11):
+            summary.add(value)
+
+        self.assertEqual(summary.means(), [2.5, 6.5, 9.5])
+        self.assertEqual(summary.rolling_mean(), 9.0)
+
+        stats = summary.summary()
+        self.assertEqual((stats['count'], stats['mean'], stats['min'], stats['max']), (10, 5.5, 1, 10))
+        self.assertAlmostEqual(stats['p50'], 5, delta=0.1)
+
+    def test_fixed_size_state(self):
+        metrics = AggregatedMetrics(bucket_size=100, window=10)
+
+        for i in range(1000):
+            metrics.record('edge_add_ms', i % 7)
+
+        self.assertEqual(len(metrics['edge_add_ms']), 10)
+        self.assertEqual(len(metrics.summaries['edge_add_ms'].window), 10)
+
+    def test_algorithm_aggregation(self):
+        rng = random.Random(0)
+        edges = {}
+        for _ in range(100):
+            a, b = sorted(rng.sample(range(30), 2))
+            edges[(a, b)] = make_edge(a, 1, b, 1, 1)
+
+        full = IncrementalExactCountingAlgorithm(k=3)
+        aggregated = IncrementalExactCountingAlgorithm(k=3, aggregate_every=10)
+
+        for edge in edges.values():
+            full.add_edge(edge)
+            aggregated.add_edge(edge)
+
+        counts = np.array(full.metrics['new_subgraph_count'])
+        means = [counts[i:i + 10].mean() for i in range(0, len(counts), 10)]
+
+        self.assertTrue(np.allclose(aggregated.metrics['new_subgraph_count'], means))
+        self.assertEqual(aggregated.metrics.summary('new_subgraph_count')['count'], len(counts))
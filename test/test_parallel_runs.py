@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from graph.edge_array import edge_dtype, to_edges, SharedEdgeArray
+
+from simulate import init_worker, run_worker
+from algorithms.fsm.incremental.naive_reservoir import IncrementalNaiveReservoirAlgorithm
+
+from test.streams import random_stream
+
+class ParallelRunsTestCase(unittest.TestCase):
+
+    def config(self):
+        return {
+            'Algorithm': IncrementalNaiveReservoirAlgorithm,
+            'algorithm_args': {'k': 3, 'M': 30},
+            'window_size': None,
+            'window_duration': None,
+            'delete_every': None,
+            'batch_size': None,
+            'aggregate_every': None
+        }
+
+    def edges(self):
+        return np.array(random_stream(0, n=25, m=80, Q=1), dtype=edge_dtype())
+
+    def test_workers_match_sequential_runs(self):
+        edges = self.edges()
+        seeds = np.random.SeedSequence(3).spawn(3)
+
+        init_worker(edges)
+        sequential = [run_worker(self.config(), seed) for seed in seeds]
+
+        shared = SharedEdgeArray.create(edges)
+
+        try:
+            with ProcessPoolExecutor(max_workers=2, initializer=init_worker, initargs=(shared.handle(),)) as executor:
+                parallel = list(executor.map(run_worker, [self.config()] * 3, seeds))
+        finally:
+            shared.close()
+
+        for (_, s_metrics, s_patterns, _), (_, p_metrics, p_patterns, _) in zip(sequential, parallel):
+            self.assertEqual(s_patterns, p_patterns)
+            self.assertEqual(s_metrics['new_subgraph_count'].tolist(), p_metrics['new_subgraph_count'].tolist())
+
+        # the runs differ from each other, and leave the edge array as it is
+        self.assertNotEqual(sequential[0][1]['new_subgraph_count'].tolist(), sequential[1][1]['new_subgraph_count'].tolist())
+        self.assertEqual(to_edges(edges), to_edges(self.edges()))
@@ -0,0 +1,37 @@
+import unittest
+
+from collections import Counter
+
+from subgraph.registry import PatternRegistry
+
+class PatternRegistryTestCase(unittest.TestCase):
+
+    def test_ids_are_dense(self):
+        registry = PatternRegistry(capacity=2)
+
+        ids = [registry.intern(c_label) for c_label in [30, 10, 30, 20, 40]]
+
+        self.assertEqual(ids, [0, 1, 0, 2, 3])
+        self.assertEqual(registry.label(2), 20)
+        self.assertGreaterEqual(len(registry.counts), len(registry))
+
+    def test_counts_grow(self):
+        registry = PatternRegistry(capacity=2)
+
+        for c_label in range(5):
+            registry.update(c_label, c_label)
+
+        self.assertEqual(registry.to_counter(), Counter({1: 1, 2: 2, 3: 3, 4: 4}))
+
+    def test_batched_updates(self):
+        registry = PatternRegistry()
+
+        a = registry.intern(10)
+        b = registry.intern(20)
+
+        registry.add_at([a, b, a, a], [1, 1, 1, -1])
+        registry.update(20, -1)
+        registry.update(30, 2)
+
+        self.assertEqual(registry[10], 1)
+        self.assertEqual(registry.to_counter(), Counter({10: 1, 30: 2}))
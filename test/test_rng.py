@@ -0,0 +1,38 @@
+import unittest
+
+from sampling.rng import BufferedRNG
+from sampling.skip_rs import SkipRS
+
+class BufferedRNGTestCase(unittest.TestCase):
+
+    def test_seeded_streams_repeat(self):
+        a = BufferedRNG(seed=7, block_size=16)
+        b = BufferedRNG(seed=7, block_size=16)
+
+        draws_a = [(a.random(), a.randrange(1000)) for _ in range(100)]
+        draws_b = [(b.random(), b.randrange(1000)) for _ in range(100)]
+
+        self.assertEqual(draws_a, draws_b)
+
+    def test_draws_are_in_range(self):
+        rng = BufferedRNG(seed=1, block_size=32)
+
+        for n in [1, 2, 7, 10**12]:
+            for _ in range(100):
+                self.assertTrue(0 <= rng.randrange(n) < n)
+                self.assertTrue(0.0 <= rng.random() < 1.0)
+
+    def test_sample_is_unique(self):
+        rng = BufferedRNG(seed=3)
+
+        sample = rng.sample(range(50), 20)
+
+        self.assertEqual(len(set(sample)), 20)
+        self.assertTrue(all(0 <= x < 50 for x in sample))
+        self.assertRaises(ValueError, rng.sample, range(5), 6)
+
+    def test_skips_follow_the_stream(self):
+        a = SkipRS(100, rng=BufferedRNG(seed=11))
+        b = SkipRS(100, rng=BufferedRNG(seed=11))
+
+        self.assertEqual(a.inclusions(100, 0, 5000), b.inclusions(100, 0, 5000))
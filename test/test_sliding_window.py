@@ -0,0 +1,79 @@
+import unittest
+
+from graph.util import make_edge
+
+from algorithms.fsm.window import SlidingWindow
+from algorithms.fsm.incremental.exact_counting import IncrementalExactCountingAlgorithm
+from algorithms.fsm.dynamic.exact_counting import DynamicExactCountingAlgorithm
+from algorithms.fsm.dynamic.naive_reservoir import DynamicNaiveReservoirAlgorithm
+
+from test.streams import random_stream
+
+class SlidingWindowTestCase(unittest.TestCase):
+
+    def expected_patterns(self, k, edges):
+        exact = IncrementalExactCountingAlgorithm(k=k)
+        for edge in edges:
+            exact.add_edge(edge)
+        return +exact.patterns
+
+    def test_window_size(self):
+        edges = random_stream(0, n=25, m=150, L=3)
+
+        for kwargs in [{}, {'compact_graph': True}, {'bitset_adjacency': True}]:
+            window = SlidingWindow(DynamicExactCountingAlgorithm(k=4, **kwargs), size=30)
+
+            for i, edge in enumerate(edges):
+                window.add_edge(edge)
+
+                if i >= 29 and i % 25 == 4:
+                    self.assertEqual(+window.patterns, self.expected_patterns(4, edges[i - 29:i + 1]))
+
+            self.assertEqual(len(window), 30)
+
+    def test_window_duration(self):
+        edges = random_stream(1, n=25, m=150, L=3)
+        timestamps = [i // 3 for i in range(len(edges))]
+
+        window = SlidingWindow(DynamicExactCountingAlgorithm(k=3), duration=10)
+
+        for edge, t in zip(edges, timestamps):
+            window.add_edge(edge, t)
+
+        # the edges of the last 10 time units are in the window
+        last = [edge for edge, t in zip(edges, timestamps) if t > timestamps[-1] - 10]
+        self.assertEqual(+window.patterns, self.expected_patterns(3, last))
+
+        with self.assertRaises(ValueError):
+            window.add_edge(edges[0])
+
+    def test_reservoir(self):
+        edges = random_stream(2, n=25, m=150, L=3)
+
+        window = SlidingWindow(DynamicNaiveReservoirAlgorithm(k=3, M=10 ** 5, seed=1), size=40)
+
+        for edge in edges:
+            window.add_edge(edge)
+
+        self.assertEqual(+window.patterns, self.expected_patterns(3, edges[-40:]))
+
+    def test_memory_stays_flat(self):
+        # the nodes of expired edges are forgotten by the graph
+        edges = [make_edge(i, 1, i + j, 1, 1) for i in range(0, 400, 4) for j in range(1, 4)]
+
+        for kwargs in [{}, {'compact_graph': True}]:
+            algorithm = DynamicExactCountingAlgorithm(k=3, delta_counting=True, **kwargs)
+            window = SlidingWindow(algorithm, size=9)
+
+            for edge in edges:
+                window.add_edge(edge)
+
+            graph = algorithm.graph
+
+            if kwargs:
+                self.assertEqual(len(graph), 12)
+                self.assertLessEqual(len(graph.node_ids), 16)
+            else:
+                self.assertEqual(len(graph.adjacency_matrix), 12)
+
+            self.assertEqual(len(graph.label_histograms), 12)
@@ -0,0 +1,57 @@
+import random
+import unittest
+
+from sampling.slot_index import SlotTable, PairIndex
+
+class SlotTableTestCase(unittest.TestCase):
+
+    def test_against_dict(self):
+        rng = random.Random(42)
+        keys = [None] * 64
+        table = SlotTable(64, lambda slot: keys[slot])
+        expected = {}
+
+        for _ in range(2000):
+            key = rng.randrange(100)
+
+            if key in expected:
+                slot = expected.pop(key)
+                table.delete(key)
+                keys[slot] = None
+            elif len(expected) < 64:
+                slot = keys.index(None)
+                keys[slot] = key
+                table.set(key, slot)
+                expected[key] = slot
+
+            for key in range(100):
+                self.assertEqual(table.get(key), expected.get(key, -1))
+
+    def test_delete_missing(self):
+        with self.assertRaises(KeyError):
+            SlotTable(4, lambda slot: slot).delete(1)
+
+
+class PairIndexTestCase(unittest.TestCase):
+
+    def test_add_and_remove(self):
+        nodes = [(1, 2, 3), (2, 3, 4), (1, 3, 5)]
+        pairs = [(0, 1), (0, 2), (1, 2)]
+        index = PairIndex(3, 3, lambda slot, p: tuple(nodes[slot][i] for i in pairs[p]))
+
+        for slot in range(3):
+            index.add(slot)
+
+        self.assertCountEqual(index.slots((2, 3)), [0, 1])
+        self.assertCountEqual(index.slots((1, 3)), [0, 2])
+        self.assertEqual(index.slots((4, 5)), [])
+
+        index.remove(0)
+        self.assertEqual(index.slots((2, 3)), [1])
+        self.assertEqual(index.slots((1, 3)), [2])
+        self.assertEqual(index.slots((1, 2)), [])
+
+        nodes[0] = (2, 3, 5)
+        index.add(0)
+        self.assertCountEqual(index.slots((2, 3)), [0, 1])
+        self.assertEqual(index.slots((1, 3)), [2])
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+import numpy as np
+
+from graph.util import make_edge
+from graph.compact_graph import CompactGraph
+from graph.sorted_graph import SortedGraph
+from graph.neighbor_set import NeighborSet
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet
+
+class NeighborSetTestCase(unittest.TestCase):
+
+    def test_operators_match_sets(self):
+        rng = random.Random(1)
+
+        for _ in range(50):
+            a = set(rng.sample(range(500), rng.randint(0, 200)))
+            b = set(rng.sample(range(500), rng.randint(0, 200)))
+
+            A = NeighborSet(np.array(sorted(a), dtype=np.int64))
+            B = NeighborSet(np.array(sorted(b), dtype=np.int64))
+
+            for x, y in [(A, B), (A, b), (a, B)]:
+                self.assertEqual(set(x & y), a & b)
+                self.assertEqual(set(x | y), a | b)
+                self.assertEqual(set(x ^ y), a ^ b)
+                self.assertEqual(set(x - y), a - b)
+
+            for x in range(500):
+                self.assertEqual(x in A, x in a)
+
+
+class SortedGraphTestCase(unittest.TestCase):
+
+    def test_explorers_match_compact_graph(self):
+        rng = random.Random(2)
+        compact = CompactGraph()
+        ordered = SortedGraph(threshold=4)
+
+        edges = []
+        for _ in range(300):
+            a, b = sorted(rng.sample(range(40), 2))
+            edge = make_edge(a, 1, b, 1, 1)
+
+            if edge in compact:
+                if rng.random() < 0.3:
+                    compact.remove_edge(edge)
+                    ordered.remove_edge(edge)
+                continue
+
+            u, v = compact.endpoints(edge)
+            self.assertEqual(ordered.endpoints(edge), (u, v))
+
+            for k, explorer in [(3, optimized_triplet), (4, optimized_quadruplet)]:
+                self.assertEqual(explorer.get_all_subgraphs(ordered, k, u, v),
+                                 explorer.get_all_subgraphs(compact, k, u, v))
+                self.assertEqual(set(explorer.get_new_subgraph_space(ordered, k, u, v)),
+                                 explorer.get_new_subgraphs(compact, k, u, v))
+
+            compact.add_edge(edge)
+            ordered.add_edge(edge)
@@ -1,7 +1,11 @@
 import unittest
 
 from subgraph.subgraph import Subgraph
-from subgraph.pattern import canonical_label
+from subgraph.pattern import (
+    canonical_label,
+    refined_canonical_label,
+    encode_label,
+    decode_label)
 
 class SubgraphPatternTestCase(unittest.TestCase):
 
@@ -69,3 +73,104 @@ class SubgraphPatternTestCase(unittest.TestCase):
 
         self.assertNotEqual(cl1, cl2, "matching canonical labels of non-isomorphic triangles")
 
+
+    def test_multi_digit_labels(self):
+        wedge = Subgraph(
+            nodes=[(1,1), (2,12), (3,2)],
+            edges=[(1,2,1), (1,3,2)]
+        )
+
+        other_wedge = Subgraph(
+            nodes=[(1,11), (2,2), (3,2)],
+            edges=[(1,2,1), (1,3,2)]
+        )
+
+        cl1 = canonical_label(wedge)
+        cl2 = canonical_label(other_wedge)
+
+        self.assertNotEqual(cl1, cl2, "matching canonical labels of wedges with multi-digit labels")
+
+    def test_decode_label(self):
+        triangle = Subgraph(
+            nodes=[(1,1), (2,1), (3,2)],
+            edges=[(1,2,1), (1,3,2), (2,3,1)]
+        )
+
+        fields = decode_label(canonical_label(triangle), 3)
+
+        self.assertEqual(fields, ((1, 1, 2), (1, 2, 1)))
+        self.assertEqual(encode_label(fields[0] + fields[1]), canonical_label(triangle))
+
+
+class RefinedSubgraphPatternTestCase(unittest.TestCase):
+
+    def test_isomorphic_kites(self):
+        kite = Subgraph(
+            nodes=[(1,1), (2,1), (3,2), (4,2)],
+            edges=[(1,2,1), (1,3,2), (2,3,2), (3,4,1)]
+        )
+
+        isomorphic_kite = Subgraph(
+            nodes=[(5,2), (8,1), (15,2), (16,1)],
+            edges=[(5,8,2), (5,15,1), (5,16,2), (8,16,1)]
+        )
+
+        cl1 = refined_canonical_label(kite)
+        cl2 = refined_canonical_label(isomorphic_kite)
+
+        self.assertEqual(cl1, cl2, "non-matching canonical labels of isomorphic kites")
+
+    def test_non_isomorphic_kites(self):
+        kite = Subgraph(
+            nodes=[(1,1), (2,1), (3,2), (4,2)],
+            edges=[(1,2,1), (1,3,2), (2,3,2), (3,4,1)]
+        )
+
+        non_isomorphic_kite = Subgraph(
+            nodes=[(5,2), (8,1), (15,2), (16,1)],
+            edges=[(5,8,2), (5,15,1), (5,16,1), (8,16,2)]
+        )
+
+        cl1 = refined_canonical_label(kite)
+        cl2 = refined_canonical_label(non_isomorphic_kite)
+
+        self.assertNotEqual(cl1, cl2, "matching canonical labels of non-isomorphic kites")
+
+    def test_isomorphic_stars(self):
+        star = Subgraph(
+            nodes=[(1,2), (2,1), (3,1), (4,1), (5,1), (6,1)],
+            edges=[(1,2,1), (1,3,1), (1,4,2), (1,5,1), (1,6,2)]
+        )
+
+        isomorphic_star = Subgraph(
+            nodes=[(1,1), (2,1), (3,1), (4,1), (5,1), (6,2)],
+            edges=[(1,6,2), (2,6,1), (3,6,1), (4,6,2), (5,6,1)]
+        )
+
+        cl1 = refined_canonical_label(star)
+        cl2 = refined_canonical_label(isomorphic_star)
+
+        self.assertEqual(cl1, cl2, "non-matching canonical labels of isomorphic stars")
+
+    def test_isomorphic_cycles(self):
+        cycle = Subgraph(
+            nodes=[(1,1), (2,1), (3,1), (4,1), (5,1), (6,1)],
+            edges=[(1,2,1), (2,3,1), (3,4,1), (4,5,1), (5,6,1), (1,6,1)]
+        )
+
+        isomorphic_cycle = Subgraph(
+            nodes=[(1,1), (2,1), (3,1), (4,1), (5,1), (6,1)],
+            edges=[(1,3,1), (3,5,1), (2,5,1), (2,4,1), (4,6,1), (1,6,1)]
+        )
+
+        two_triangles = Subgraph(
+            nodes=[(1,1), (2,1), (3,1), (4,1), (5,1), (6,1)],
+            edges=[(1,2,1), (2,3,1), (1,3,1), (4,5,1), (5,6,1), (4,6,1)]
+        )
+
+        cl1 = refined_canonical_label(cycle)
+        cl2 = refined_canonical_label(isomorphic_cycle)
+        cl3 = refined_canonical_label(two_triangles)
+
+        self.assertEqual(cl1, cl2, "non-matching canonical labels of isomorphic cycles")
+        self.assertNotEqual(cl1, cl3, "matching canonical labels of a cycle and two triangles")
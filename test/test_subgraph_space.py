@@ -0,0 +1,40 @@
+import unittest
+
+from graph.simple_graph import SimpleGraph
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet
+from algorithms.exploration.space import ProductBlock
+
+from test.streams import random_stream
+
+class SubgraphSpaceTestCase(unittest.TestCase):
+
+    def check_space(self, explorer, k):
+        graph = SimpleGraph()
+
+        for edge in random_stream(k, n=20, m=120, L=1, Q=1):
+            u, v = edge.get_u(), edge.get_v()
+            expected = explorer.get_new_subgraphs(graph, k, u, v)
+            space = explorer.get_new_subgraph_space(graph, k, u, v)
+            subgraphs = [space[i] for i in range(len(space))]
+
+            self.assertEqual(len(space), len(expected))
+            self.assertEqual(len(set(subgraphs)), len(subgraphs))
+            self.assertEqual(set(subgraphs), expected)
+
+            graph.add_edge(edge)
+
+    def test_triplet_space(self):
+        self.check_space(optimized_triplet, 3)
+
+    def test_quadruplet_space(self):
+        self.check_space(optimized_quadruplet, 4)
+
+    def test_product_block_exclusions(self):
+        left, right = [1, 2, 3], [4, 5, 6, 7]
+        excluded = [0, 1, 5, 6, 11]
+
+        block = ProductBlock((0,), left, right, excluded)
+        expected = [frozenset((0, left[g // 4], right[g % 4])) for g in range(12) if g not in excluded]
+
+        self.assertEqual([block[i] for i in range(len(block))], expected)
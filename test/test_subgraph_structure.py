@@ -0,0 +1,40 @@
+import unittest
+
+from graph.simple_graph import SimpleGraph
+
+from subgraph.util import make_subgraph, add_structure_edge, structure_subgraph
+
+from algorithms.exploration import optimized_triplet, optimized_quadruplet
+
+from test.streams import random_stream
+
+class SubgraphStructureTestCase(unittest.TestCase):
+
+    def check_structures(self, explorer, k):
+        graph = SimpleGraph()
+
+        for edge in random_stream(k, n=15, m=80, Q=3):
+            u, v = edge.get_u(), edge.get_v()
+
+            structures = explorer.get_all_subgraphs(graph, k, u, v, structures=True)
+            node_sets = explorer.get_all_subgraphs(graph, k, u, v)
+
+            for found, expected in zip(structures, node_sets):
+                self.assertEqual(len(found), len(expected))
+                self.assertEqual(set(frozenset(s.nodes) for s in found), expected)
+
+                for structure in found:
+                    edges = graph.get_induced_edges(structure.nodes)
+
+                    self.assertEqual(structure_subgraph(structure),
+                                     make_subgraph(structure.nodes, edges))
+                    self.assertEqual(structure_subgraph(add_structure_edge(structure, edge)),
+                                     make_subgraph(structure.nodes, edges + [edge]))
+
+            graph.add_edge(edge)
+
+    def test_triplet_structures(self):
+        self.check_structures(optimized_triplet, 3)
+
+    def test_quadruplet_structures(self):
+        self.check_structures(optimized_quadruplet, 4)
@@ -0,0 +1,412 @@
+import numpy as np
+
+from math import log
+from time import perf_counter_ns
+from collections.abc import Mapping
+
+# instrumentation levels, from no metrics at all to metrics of every edge
+LEVELS = ('off', 'sampled', 'full')
+
+
+class MetricBuffer:
+    """Preallocated NumPy buffer of metric values that doubles when full."""
+    __slots__ = ('values', 'size')
+
+    def __init__(self, capacity=4096):
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+
+
+    def __len__(self):
+        return self.size
+
+
+    def append(self, value):
+        if self.size == len(self.values):
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)])
+
+        self.values[self.size] = value
+        self.size += 1
+
+
+    def array(self):
+        """View of the recorded values."""
+        return self.values[:self.size]
+
+
+class Metrics(Mapping):
+    """
+    Metric values by name, kept in MetricBuffers.
+
+    Reading a metric by name returns its values as a list, array() returns
+    a view of the buffer instead.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.buffers = {}
+
+
+    def __getitem__(self, name):
+        return self.buffers[name].array().tolist()
+
+
+    def __iter__(self):
+        return iter(self.buffers)
+
+
+    def __len__(self):
+        return len(self.buffers)
+
+
+    def array(self, name):
+        """View of the values of a metric."""
+        return self.buffers[name].array()
+
+
+    def record(self, name, value):
+        """Append a value to a metric."""
+        buffer = self.buffers.get(name)
+
+        if buffer is None:
+            buffer = self.buffers[name] = MetricBuffer(self.capacity)
+
+        buffer.append(value)
+
+
+class LogHistogram:
+    """
+    Histogram of positive values in logarithmic buckets.
+
+    Bucket i holds the values in [low * growth^i, low * growth^(i+1)), so
+    every quantile is known up to a relative error of growth - 1 with a
+    fixed number of buckets. Values up to low fall into the first bucket,
+    which stands for zero, and values above high into the last one.
+    """
+    __slots__ = ('low', 'growth', 'log_low', 'log_growth', 'counts')
+
+    def __init__(self, low=1e-6, high=1e7, growth=1.02):
+        self.low = low
+        self.growth = growth
+        self.log_low = log(low)
+        self.log_growth = log(growth)
+
+        n_buckets = int((log(high) - self.log_low) / self.log_growth) + 1
+        self.counts = np.zeros(n_buckets, dtype=np.int64)
+
+
+    def add(self, value):
+        if value <= self.low:
+            i = 0
+        else:
+            i = min(int((log(value) - self.log_low) / self.log_growth), len(self.counts) - 1)
+
+        self.counts[i] += 1
+
+
+    def quantile(self, q):
+        """Value at quantile q, the geometric middle of its bucket or zero."""
+        total = self.counts.sum()
+
+        if total == 0:
+            return float('nan')
+
+        i = int(np.searchsorted(np.cumsum(self.counts), q * total))
+        i = min(i, len(self.counts) - 1)
+
+        return self.low * self.growth ** (i + 0.5) if i else 0.0
+
+
+class MetricSummary:
+    """
+    Fixed-size summary of the values of a metric.
+
+    Keeps the count, sum, minimum and maximum of all values, the last window
+    values in a ring buffer, a LogHistogram of all values and the mean of
+    each bucket of bucket_size consecutive values.
+    """
+
+    def __init__(self, bucket_size, window=1000):
+        self.bucket_size = bucket_size
+
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+        self.window = np.zeros(window, dtype=np.float64)
+        self.histogram = LogHistogram()
+
+        self.bucket_total = 0.0
+        self.bucket_count = 0
+        self.bucket_means = []
+
+
+    def add(self, value):
+        self.window[self.count % len(self.window)] = value
+
+        self.count += 1
+        self.total += value
+        if value < self.min: self.min = value
+        if value > self.max: self.max = value
+
+        self.histogram.add(value)
+
+        self.bucket_total += value
+        self.bucket_count += 1
+
+        if self.bucket_count == self.bucket_size:
+            self.bucket_means.append(self.bucket_total / self.bucket_count)
+            self.bucket_total = 0.0
+            self.bucket_count = 0
+
+
+    def means(self):
+        """Means of the buckets, including the last incomplete one."""
+        if self.bucket_count:
+            return self.bucket_means + [self.bucket_total / self.bucket_count]
+
+        return list(self.bucket_means)
+
+
+    def rolling_mean(self):
+        """Mean of the last values that fit the window."""
+        n = min(self.count, len(self.window))
+        return self.window[:n].mean() if n else float('nan')
+
+
+    def summary(self):
+        """Count, mean, extremes and quantiles p50, p99 and p999 of all values."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else float('nan'),
+            'min': self.min,
+            'max': self.max,
+            'p50': self.histogram.quantile(0.5),
+            'p99': self.histogram.quantile(0.99),
+            'p999': self.histogram.quantile(0.999),
+            'rolling_mean': self.rolling_mean()
+        }
+
+
+class AggregatedMetrics(Mapping):
+    """
+    Metric values by name, kept in MetricSummaries of fixed size.
+
+    Reading a metric by name returns the means of its buckets of
+    bucket_size values, summary() the statistics of all of its values.
+    """
+
+    def __init__(self, bucket_size, window=1000):
+        self.bucket_size = bucket_size
+        self.window = window
+        self.summaries = {}
+
+
+    def __getitem__(self, name):
+        return self.summaries[name].means()
+
+
+    def __iter__(self):
+        return iter(self.summaries)
+
+
+    def __len__(self):
+        return len(self.summaries)
+
+
+    def array(self, name):
+        """Means of the buckets of a metric."""
+        return np.array(self.summaries[name].means())
+
+
+    def summary(self, name):
+        """Statistics of all values of a metric."""
+        return self.summaries[name].summary()
+
+
+    def record(self, name, value):
+        """Add a value to the summary of a metric."""
+        summary = self.summaries.get(name)
+
+        if summary is None:
+            summary = self.summaries[name] = MetricSummary(self.bucket_size, self.window)
+
+        summary.add(value)
+
+
+class Instrumentation:
+    """
+    Metrics of the edge operations of an algorithm.
+
+    attach() wraps the work methods insert_edge, ingest and delete_edge of
+    an algorithm instance, and the named phases of its edge insertions,
+    with timed versions that record the metrics: the duration of the work
+    method from perf_counter_ns in milliseconds, the counts it returns, the
+    label cache hits and misses, the durations of the phases and the state
+    metrics of the algorithm after the operation. The public add_edge,
+    add_edges and remove_edge of the algorithm stay as they are, so timed
+    and untimed runs go through the same checks.
+
+    With level 'full' every operation is recorded, with 'sampled' every
+    every-th operation of each kind, and with 'off' the algorithm is left
+    as it is, so it runs without any timing code. If aggregate_every is
+    set, the values are aggregated into AggregatedMetrics as they are
+    recorded, instead of being kept one by one.
+    """
+
+    def __init__(self, level='full', every=100, capacity=4096, aggregate_every=None, window=1000):
+        """
+        Initialize a new instrumentation.
+
+        :param level: One of 'off', 'sampled' or 'full'.
+        :param every: Record every every-th operation with level 'sampled'.
+        :param capacity: Initial number of values of each metric buffer.
+        :param aggregate_every: Number of recorded values per aggregated mean.
+        :param window: Number of last values in the rolling window of each metric.
+        :type level: str
+        :type every: int
+        :type capacity: int
+        :type aggregate_every: int
+        :type window: int
+        """
+        if level not in LEVELS:
+            raise ValueError("instrumentation level must be one of %s" % (', '.join(LEVELS)))
+
+        self.level = level
+        self.every = every if level == 'sampled' else 1
+
+        if aggregate_every:
+            self.metrics = AggregatedMetrics(aggregate_every, window=window)
+        else:
+            self.metrics = Metrics(capacity)
+
+        # number of calls of each operation, to pick the sampled ones
+        self.calls = {'insert_edge': 0, 'ingest': 0, 'delete_edge': 0}
+
+        # durations of the phases of the recorded operation
+        self.phases = None
+
+        # the insertions of a batch are recorded as one operation
+        self.batch = False
+
+
+    def attach(self, algorithm):
+        """Wrap the edge operations of algorithm, unless the level is 'off'."""
+        if self.level == 'off':
+            return
+
+        for name, wrapper in [('insert_edge', self._insert_edge),
+                              ('ingest', self._ingest),
+                              ('delete_edge', self._delete_edge)]:
+            setattr(algorithm, name, wrapper(algorithm, getattr(algorithm, name)))
+
+        for metric, method in algorithm.timed_phases.items():
+            setattr(algorithm, method, self._phase(metric, getattr(algorithm, method)))
+
+
+    def _sampled(self, operation):
+        calls = self.calls[operation]
+        self.calls[operation] = calls + 1
+        return calls % self.every == 0
+
+
+    def _insert_edge(self, algorithm, insert_edge):
+        def timed_insert_edge(edge):
+            if self.batch or not self._sampled('insert_edge'):
+                return insert_edge(edge)
+
+            cache = algorithm.canonical_label
+            label_hits, label_misses = cache.hits, cache.misses
+
+            self.phases = dict.fromkeys(algorithm.timed_phases, 0)
+
+            start = perf_counter_ns()
+            counts = insert_edge(edge)
+            end = perf_counter_ns()
+
+            record = self.metrics.record
+            record('edge_add_ms', (end - start) / 1e6)
+
+            for name, ns in self.phases.items():
+                record(name, ns / 1e6)
+
+            self.phases = None
+            self._record_counts(algorithm, counts, label_hits, label_misses)
+
+            return counts
+
+        return timed_insert_edge
+
+
+    def _ingest(self, algorithm, ingest):
+        def timed_ingest(batch):
+            self.batch = True
+
+            try:
+                if not self._sampled('ingest'):
+                    return ingest(batch)
+
+                cache = algorithm.canonical_label
+                label_hits, label_misses = cache.hits, cache.misses
+
+                start = perf_counter_ns()
+                added, counts = ingest(batch)
+                end = perf_counter_ns()
+            finally:
+                self.batch = False
+
+            self.metrics.record('batch_add_ms', (end - start) / 1e6)
+            self.metrics.record('batch_edge_count', added)
+            self._record_counts(algorithm, counts, label_hits, label_misses)
+
+            return added, counts
+
+        return timed_ingest
+
+
+    def _delete_edge(self, algorithm, delete_edge):
+        def timed_delete_edge(edge):
+            if not self._sampled('delete_edge'):
+                return delete_edge(edge)
+
+            start = perf_counter_ns()
+            counts = delete_edge(edge)
+            end = perf_counter_ns()
+
+            self.metrics.record('edge_remove_ms', (end - start) / 1e6)
+
+            for name, value in counts.items():
+                self.metrics.record(name, value)
+
+            return counts
+
+        return timed_delete_edge
+
+
+    def _phase(self, metric, method):
+        def timed_phase(*args, **kwargs):
+            if self.phases is None:
+                return method(*args, **kwargs)
+
+            start = perf_counter_ns()
+            result = method(*args, **kwargs)
+            self.phases[metric] += perf_counter_ns() - start
+
+            return result
+
+        return timed_phase
+
+
+    def _record_counts(self, algorithm, counts, label_hits, label_misses):
+        record = self.metrics.record
+
+        for name, value in counts.items():
+            record(name, value)
+
+        for name, value in algorithm.state_metrics().items():
+            record(name, value)
+
+        cache = algorithm.canonical_label
+        record('label_cache_hit_count', cache.hits - label_hits)
+        record('label_cache_miss_count', cache.misses - label_misses)